@@ -0,0 +1,156 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from dataclasses import dataclass, field
+from typing import Set, Tuple
+
+from andromede.expression.expression import (
+    AdditionNode,
+    AllTimeSumNode,
+    ComparisonNode,
+    ComponentParameterNode,
+    ComponentVariableNode,
+    DivisionNode,
+    ExpressionNode,
+    LiteralNode,
+    MultiplicationNode,
+    NegationNode,
+    ParameterNode,
+    PortFieldAggregatorNode,
+    PortFieldNode,
+    ProblemParameterNode,
+    ProblemVariableNode,
+    ScenarioOperatorNode,
+    TimeEvalNode,
+    TimeShiftNode,
+    TimeSumNode,
+    VariableNode,
+)
+from andromede.expression.visitor import ExpressionVisitor, visit
+
+ComponentParameterKey = Tuple[str, str]
+
+
+@dataclass
+class ParameterDependencies:
+    """
+    Component parameters used by an expression, by component ID and name.
+
+    Parameters used in the bounds of time operators define which terms
+    the expression is made of, other parameters only define its coefficients.
+    """
+
+    values: Set[ComponentParameterKey] = field(default_factory=set)
+    time_bounds: Set[ComponentParameterKey] = field(default_factory=set)
+
+    @property
+    def all(self) -> Set[ComponentParameterKey]:
+        return self.values | self.time_bounds
+
+
+class ParameterDependenciesVisitor(ExpressionVisitor[None]):
+    """
+    Collects the component parameters of an expression.
+    """
+
+    def __init__(self) -> None:
+        self.dependencies = ParameterDependencies()
+        self._in_time_bounds = False
+
+    def _visit_time_bounds(self, *expressions: ExpressionNode) -> None:
+        in_time_bounds = self._in_time_bounds
+        self._in_time_bounds = True
+        for expression in expressions:
+            visit(expression, self)
+        self._in_time_bounds = in_time_bounds
+
+    def _add(self, component_id: str, name: str) -> None:
+        if self._in_time_bounds:
+            self.dependencies.time_bounds.add((component_id, name))
+        else:
+            self.dependencies.values.add((component_id, name))
+
+    def literal(self, node: LiteralNode) -> None:
+        pass
+
+    def negation(self, node: NegationNode) -> None:
+        visit(node.operand, self)
+
+    def addition(self, node: AdditionNode) -> None:
+        for operand in node.operands:
+            visit(operand, self)
+
+    def multiplication(self, node: MultiplicationNode) -> None:
+        visit(node.left, self)
+        visit(node.right, self)
+
+    def division(self, node: DivisionNode) -> None:
+        visit(node.left, self)
+        visit(node.right, self)
+
+    def comparison(self, node: ComparisonNode) -> None:
+        visit(node.left, self)
+        visit(node.right, self)
+
+    def variable(self, node: VariableNode) -> None:
+        pass
+
+    def parameter(self, node: ParameterNode) -> None:
+        raise ValueError(
+            "Parameter must be associated to its component before resolution."
+        )
+
+    def comp_parameter(self, node: ComponentParameterNode) -> None:
+        self._add(node.component_id, node.name)
+
+    def comp_variable(self, node: ComponentVariableNode) -> None:
+        pass
+
+    def pb_parameter(self, node: ProblemParameterNode) -> None:
+        self._add(node.component_id, node.name)
+
+    def pb_variable(self, node: ProblemVariableNode) -> None:
+        pass
+
+    def time_shift(self, node: TimeShiftNode) -> None:
+        visit(node.operand, self)
+        self._visit_time_bounds(node.time_shift)
+
+    def time_eval(self, node: TimeEvalNode) -> None:
+        visit(node.operand, self)
+        self._visit_time_bounds(node.eval_time)
+
+    def time_sum(self, node: TimeSumNode) -> None:
+        visit(node.operand, self)
+        self._visit_time_bounds(node.from_time, node.to_time)
+
+    def all_time_sum(self, node: AllTimeSumNode) -> None:
+        visit(node.operand, self)
+
+    def scenario_operator(self, node: ScenarioOperatorNode) -> None:
+        visit(node.operand, self)
+
+    def port_field(self, node: PortFieldNode) -> None:
+        raise ValueError("Port fields must be resolved before collecting parameters.")
+
+    def port_field_aggregator(self, node: PortFieldAggregatorNode) -> None:
+        visit(node.operand, self)
+
+
+def parameter_dependencies(*expressions: ExpressionNode) -> ParameterDependencies:
+    """
+    Component parameters used by the expressions.
+    """
+    visitor = ParameterDependenciesVisitor()
+    for expression in expressions:
+        visit(expression, visitor)
+    return visitor.dependencies
@@ -1,8 +1,14 @@
 import dataclasses
 from dataclasses import dataclass
-from typing import Callable, TypeVar, Union
-
-from andromede.expression import CopyVisitor, ExpressionNode, sum_expressions, visit
+from typing import Callable, Optional, Sequence, TypeVar, Union
+
+from andromede.expression import (
+    CopyVisitor,
+    ExpressionNode,
+    literal,
+    sum_expressions,
+    visit,
+)
 from andromede.expression.expression import (
     AllTimeSumNode,
     ComponentParameterNode,
@@ -30,11 +36,14 @@ ExpressionEvaluator = Callable[[ExpressionNode], int]
 @dataclass(frozen=True)
 class ProblemDimensions:
     """
-    Dimensions for the simulation window
+    Dimensions for the simulation window.
+
+    Scenarios have the given probabilities in expectations, uniform by default.
     """
 
     timesteps_count: int
     scenarios_count: int
+    scenario_weights: Optional[Sequence[float]] = None
 
 
 @dataclass(frozen=True)
@@ -64,6 +73,7 @@ class OperatorsExpansion(CopyVisitor):
     scenarios_count: int
     evaluator: ExpressionEvaluator
     structure_provider: IndexingStructureProvider
+    scenario_weights: Optional[Sequence[float]] = None
 
     def comp_variable(self, node: ComponentVariableNode) -> ExpressionNode:
         structure = self.structure_provider.get_component_variable_structure(
@@ -117,9 +127,13 @@ class OperatorsExpansion(CopyVisitor):
             raise ValueError(f"Scenario operator not supported: {node.name}")
         nodes = []
         operand = visit(node.operand, self)
-        for t in range(self.scenarios_count):
-            nodes.append(apply_scenario(operand, t))
-        return sum_expressions(nodes) / self.scenarios_count
+        if self.scenario_weights is None:
+            for t in range(self.scenarios_count):
+                nodes.append(apply_scenario(operand, t))
+            return sum_expressions(nodes) / self.scenarios_count
+        for t, weight in enumerate(self.scenario_weights):
+            nodes.append(literal(weight) * apply_scenario(operand, t))
+        return sum_expressions(nodes)
 
     def pb_parameter(self, node: ProblemParameterNode) -> ExpressionNode:
         raise ValueError("Should not reach")
@@ -141,6 +155,7 @@ def expand_operators(
             dimensions.scenarios_count,
             evaluator,
             structure_provider,
+            dimensions.scenario_weights,
         ),
     )
 
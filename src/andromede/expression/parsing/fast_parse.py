@@ -0,0 +1,349 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Hand-written parser for the grammar defined in grammar/Expr.g4.
+
+It is much faster than the parser generated by ANTLR, and builds the same
+AST as ExpressionNodeBuilderVisitor. It only handles valid expressions:
+on any syntax error, or any construct it does not support, it gives up
+and the caller is expected to fall back to the ANTLR parser, which
+is responsible for error reporting.
+"""
+import re
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from andromede.expression.equality import expressions_equal
+from andromede.expression.expression import (
+    Comparator,
+    ComparisonNode,
+    ExpressionNode,
+    PortFieldAggregatorNode,
+    PortFieldNode,
+    literal,
+    param,
+    var,
+)
+
+if TYPE_CHECKING:
+    from andromede.expression.parsing.parse_expression import ModelIdentifiers
+
+
+class _Unsupported(Exception):
+    """
+    Raised when the expression cannot be handled by this parser.
+    """
+
+
+# Token kinds
+_NUMBER = "NUMBER"
+_IDENTIFIER = "IDENTIFIER"
+_TIME = "TIME"
+_SUM = "SUM"
+_SUM_CONNECTIONS = "SUM_CONNECTIONS"
+_COMPARISON = "COMPARISON"
+_PUNCTUATION = "PUNCTUATION"
+_EOF = "EOF"
+
+# Same lexical rules as the grammar: the longest match wins,
+# and keywords are only recognized when they match a whole word.
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>[ \t\r\n]+)
+    | (?P<number>[0-9]+(?:\.[0-9]+)?)
+    | (?P<word>[a-zA-Z_][a-zA-Z_0-9]*)
+    | (?P<comparison>>=|<=|=)
+    | (?P<punctuation>\.\.|[.\-()/*+,\[\]])
+    """,
+    re.VERBOSE,
+)
+
+_KEYWORDS = {"t": _TIME, "sum": _SUM, "sum_connections": _SUM_CONNECTIONS}
+
+_COMPARATORS = {
+    "=": Comparator.EQUAL,
+    "<=": Comparator.LESS_THAN,
+    ">=": Comparator.GREATER_THAN,
+}
+
+_FUNCTIONS: Dict[str, Callable[[ExpressionNode], ExpressionNode]] = {
+    "expec": ExpressionNode.expec,
+}
+
+# Precedences of binary operators, as generated by ANTLR
+# for the left-recursive "expr" rule.
+_NEGATION_PRECEDENCE = 13
+_MULDIV_PRECEDENCE = 11
+_ADDSUB_PRECEDENCE = 10
+_COMPARISON_PRECEDENCE = 9
+
+Token = Tuple[str, str]
+
+
+def _tokenize(expression: str) -> List[Token]:
+    tokens: List[Token] = []
+    position = 0
+    length = len(expression)
+    while position < length:
+        match = _TOKEN_PATTERN.match(expression, position)
+        if match is None:
+            raise _Unsupported()
+        position = match.end()
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "ws":
+            continue
+        if kind == "number":
+            tokens.append((_NUMBER, text))
+        elif kind == "word":
+            tokens.append((_KEYWORDS.get(text, _IDENTIFIER), text))
+        elif kind == "comparison":
+            tokens.append((_COMPARISON, text))
+        else:
+            tokens.append((_PUNCTUATION, text))
+    tokens.append((_EOF, ""))
+    return tokens
+
+
+def _binary_operation(
+    left: ExpressionNode, op: str, right: ExpressionNode
+) -> ExpressionNode:
+    if op == "*":
+        return left * right
+    elif op == "/":
+        return left / right
+    elif op == "+":
+        return left + right
+    elif op == "-":
+        return left - right
+    raise _Unsupported()
+
+
+class _Parser:
+    """
+    Pratt parser for "expr", recursive descent for the other rules.
+    """
+
+    def __init__(self, tokens: List[Token], identifiers: "ModelIdentifiers") -> None:
+        self._tokens = tokens
+        self._position = 0
+        self._identifiers = identifiers
+
+    def _peek(self, offset: int = 0) -> Token:
+        index = min(self._position + offset, len(self._tokens) - 1)
+        return self._tokens[index]
+
+    def _next(self) -> Token:
+        token = self._tokens[self._position]
+        if token[0] != _EOF:
+            self._position += 1
+        return token
+
+    def _is_punctuation(self, text: str, offset: int = 0) -> bool:
+        return self._peek(offset) == (_PUNCTUATION, text)
+
+    def _expect(self, text: str) -> None:
+        if self._next() != (_PUNCTUATION, text):
+            raise _Unsupported()
+
+    def _expect_kind(self, kind: str) -> str:
+        token_kind, text = self._next()
+        if token_kind != kind:
+            raise _Unsupported()
+        return text
+
+    def full_expression(self) -> ExpressionNode:
+        expression = self.expression(0)
+        if self._peek()[0] != _EOF:
+            raise _Unsupported()
+        return expression
+
+    def expression(self, precedence: int) -> ExpressionNode:
+        left = self._primary()
+        while True:
+            kind, text = self._peek()
+            if kind == _PUNCTUATION and text in ("*", "/"):
+                if _MULDIV_PRECEDENCE < precedence:
+                    break
+                self._next()
+                right = self.expression(_MULDIV_PRECEDENCE + 1)
+                left = _binary_operation(left, text, right)
+            elif kind == _PUNCTUATION and text in ("+", "-"):
+                if _ADDSUB_PRECEDENCE < precedence:
+                    break
+                self._next()
+                right = self.expression(_ADDSUB_PRECEDENCE + 1)
+                left = _binary_operation(left, text, right)
+            elif kind == _COMPARISON:
+                if _COMPARISON_PRECEDENCE < precedence:
+                    break
+                self._next()
+                right = self.expression(_COMPARISON_PRECEDENCE + 1)
+                left = ComparisonNode(left, right, _COMPARATORS[text])
+            else:
+                break
+        return left
+
+    def _primary(self) -> ExpressionNode:
+        kind, text = self._next()
+        if kind == _NUMBER:
+            return literal(float(text))
+        if kind == _IDENTIFIER:
+            return self._identifier_expression(text)
+        if kind == _SUM:
+            return self._sum()
+        if kind == _SUM_CONNECTIONS:
+            self._expect("(")
+            port_field = self._port_field()
+            self._expect(")")
+            return PortFieldAggregatorNode(port_field, "PortSum")
+        if (kind, text) == (_PUNCTUATION, "-"):
+            return -self.expression(_NEGATION_PRECEDENCE)
+        if (kind, text) == (_PUNCTUATION, "("):
+            expression = self.expression(0)
+            self._expect(")")
+            if self._is_punctuation("["):
+                # Time operators on parenthesized expressions: not supported
+                raise _Unsupported()
+            return expression
+        raise _Unsupported()
+
+    def _identifier_expression(self, identifier: str) -> ExpressionNode:
+        if self._is_punctuation("."):
+            self._next()
+            field_name = self._expect_kind(_IDENTIFIER)
+            return PortFieldNode(port_name=identifier, field_name=field_name)
+        if self._is_punctuation("("):
+            self._next()
+            operand = self.expression(0)
+            self._expect(")")
+            function = _FUNCTIONS.get(identifier)
+            if function is None:
+                raise _Unsupported()
+            return function(operand)
+        if self._is_punctuation("["):
+            self._next()
+            if self._peek()[0] == _TIME:
+                shift = self._shift()
+                self._expect("]")
+                shifted = self._convert_identifier(identifier)
+                if expressions_equal(shift, literal(0)):
+                    return shifted
+                return shifted.shift(shift)
+            eval_time = self.expression(0)
+            self._expect("]")
+            return self._convert_identifier(identifier).eval(eval_time)
+        return self._convert_identifier(identifier)
+
+    def _sum(self) -> ExpressionNode:
+        self._expect("(")
+        if self._peek()[0] == _TIME:
+            from_shift = self._shift()
+            self._expect("..")
+            to_shift = self._shift()
+            self._expect(",")
+            operand = self.expression(0)
+            self._expect(")")
+            return operand.time_sum(from_shift, to_shift)
+        operand = self.expression(0)
+        self._expect(")")
+        return operand.time_sum()
+
+    def _port_field(self) -> ExpressionNode:
+        port_name = self._expect_kind(_IDENTIFIER)
+        self._expect(".")
+        field_name = self._expect_kind(_IDENTIFIER)
+        return PortFieldNode(port_name=port_name, field_name=field_name)
+
+    def _atom(self) -> ExpressionNode:
+        kind, text = self._next()
+        if kind == _NUMBER:
+            return literal(float(text))
+        if kind == _IDENTIFIER:
+            return self._convert_identifier(text)
+        raise _Unsupported()
+
+    def _shift(self) -> ExpressionNode:
+        """
+        shift: TIME shift_expr?
+        """
+        self._expect_kind(_TIME)
+        if self._is_punctuation("+") or self._is_punctuation("-"):
+            return self._shift_expression()
+        return literal(0)
+
+    def _shift_expression(self) -> ExpressionNode:
+        """
+        A signed atom or parenthesized expression, extended to the right
+        by operators applied to "right_expr" operands.
+        """
+        _, sign = self._next()
+        if self._is_punctuation("("):
+            self._next()
+            left = self.expression(0)
+            self._expect(")")
+        else:
+            left = self._atom()
+        if sign == "-":
+            left = -left
+
+        while True:
+            kind, text = self._peek()
+            if kind == _PUNCTUATION and text in ("*", "/", "+", "-"):
+                self._next()
+                left = _binary_operation(left, text, self._right_expression())
+            else:
+                break
+        return left
+
+    def _right_expression(self) -> ExpressionNode:
+        """
+        right_expr: products of atoms or parenthesized expressions.
+        """
+        left = self._right_primary()
+        while True:
+            kind, text = self._peek()
+            if kind == _PUNCTUATION and text in ("*", "/"):
+                self._next()
+                left = _binary_operation(left, text, self._right_primary())
+            else:
+                break
+        return left
+
+    def _right_primary(self) -> ExpressionNode:
+        if self._is_punctuation("("):
+            self._next()
+            expression = self.expression(0)
+            self._expect(")")
+            return expression
+        return self._atom()
+
+    def _convert_identifier(self, identifier: str) -> ExpressionNode:
+        if self._identifiers.is_variable(identifier):
+            return var(identifier)
+        elif self._identifiers.is_parameter(identifier):
+            return param(identifier)
+        raise _Unsupported()
+
+
+def fast_parse_expression(
+    expression: str, identifiers: "ModelIdentifiers"
+) -> Optional[ExpressionNode]:
+    """
+    Parses the expression, or returns None if it cannot be handled
+    by this parser (including invalid expressions).
+    """
+    try:
+        tokens = _tokenize(expression)
+        return _Parser(tokens, identifiers).full_expression()
+    except (_Unsupported, ValueError, RecursionError):
+        return None
@@ -10,8 +10,8 @@
 #
 # This file is part of the Antares project.
 
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 from andromede.expression import CopyVisitor, sum_expressions, visit
 from andromede.expression.expression import (
@@ -37,10 +37,14 @@ class PortResolver(CopyVisitor):
     """
     Duplicates the AST with replacement of port field nodes by
     their corresponding expression.
+
+    Sums of port fields are memoized in ports_sums, which may be shared
+    between resolutions in order to build each sum only once.
     """
 
     component_id: str
     ports_expressions: Dict[PortFieldKey, List[ExpressionNode]]
+    ports_sums: Dict[PortFieldKey, ExpressionNode] = field(default_factory=dict)
 
     def port_field(self, node: PortFieldNode) -> ExpressionNode:
         expressions = self.ports_expressions[
@@ -62,19 +66,28 @@ class PortResolver(CopyVisitor):
         if not isinstance(port_field_node, PortFieldNode):
             raise ValueError(f"Should be a portFieldNode : {port_field_node}")
 
-        expressions = self.ports_expressions.get(
-            PortFieldKey(
-                self.component_id,
-                PortFieldId(port_field_node.port_name, port_field_node.field_name),
-            ),
-            [],
+        key = PortFieldKey(
+            self.component_id,
+            PortFieldId(port_field_node.port_name, port_field_node.field_name),
         )
-        return sum_expressions(expressions)
+        ports_sum = self.ports_sums.get(key)
+        if ports_sum is None:
+            ports_sum = sum_expressions(self.ports_expressions.get(key, []))
+            self.ports_sums[key] = ports_sum
+        return ports_sum
 
 
 def resolve_port(
     expression: ExpressionNode,
     component_id: str,
     ports_expressions: Dict[PortFieldKey, List[ExpressionNode]],
+    ports_sums: Optional[Dict[PortFieldKey, ExpressionNode]] = None,
 ) -> ExpressionNode:
-    return visit(expression, PortResolver(component_id, ports_expressions))
+    return visit(
+        expression,
+        PortResolver(
+            component_id,
+            ports_expressions,
+            ports_sums if ports_sums is not None else {},
+        ),
+    )
@@ -15,15 +15,20 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from andromede.model.library import Library
-from andromede.model.parsing import parse_yaml_library
-from andromede.model.resolve_library import resolve_library
-from andromede.simulation import TimeBlock, build_problem
-from andromede.study import DataBase
-from andromede.study.parsing import parse_cli, parse_yaml_components
+from andromede.model.library_cache import LibraryCache, library_cache_key
+from andromede.simulation import LpAlgorithm, SolverConfig, TimeBlock, build_problem
+from andromede.study import DataBase, Network
+from andromede.study.parsing import (
+    ParsedArguments,
+    parse_cli,
+    parse_yaml_components,
+    parse_yaml_sweep,
+)
 from andromede.study.resolve_components import (
     System,
     build_data_base,
     build_network,
+    build_sweep_variants,
     consistency_check,
     resolve_system,
 )
@@ -33,7 +38,27 @@ class AntaresTimeSeriesImportError(Exception):
     pass
 
 
-def input_libs(yaml_lib_paths: List[Path]) -> dict[str, Library]:
+def input_libs(
+    yaml_lib_paths: List[Path], cache_dir: Optional[Path] = None
+) -> dict[str, Library]:
+    """
+    Parses and resolves the libraries defined in the given files.
+
+    If a cache directory is given, resolved libraries are loaded from it
+    when the same files were already resolved, and stored into it otherwise.
+    """
+    cache = LibraryCache(cache_dir) if cache_dir is not None else None
+    if cache is not None:
+        cache_key = library_cache_key(yaml_lib_paths)
+        cached_libraries = cache.load(cache_key)
+        if cached_libraries is not None:
+            return cached_libraries
+
+    # Library parsing and resolution are only imported on a cache miss:
+    # the pydantic models of the library format are costly to import.
+    from andromede.model.parsing import parse_yaml_library
+    from andromede.model.resolve_library import resolve_library
+
     yaml_libraries = []
     yaml_library_ids = set()
 
@@ -47,7 +72,10 @@ def input_libs(yaml_lib_paths: List[Path]) -> dict[str, Library]:
             yaml_libraries.append(yaml_lib)
             yaml_library_ids.add(yaml_lib.id)
 
-    return resolve_library(yaml_libraries)
+    libraries = resolve_library(yaml_libraries)
+    if cache is not None:
+        cache.store(cache_key, libraries)
+    return libraries
 
 
 def input_database(study_path: Path, timeseries_path: Optional[Path]) -> DataBase:
@@ -60,10 +88,45 @@ def input_study(study_path: Path, librairies: dict[str, Library]) -> System:
         return resolve_system(parse_yaml_components(comp), librairies)
 
 
+def run_sweep_cli(
+    parsed_args: ParsedArguments,
+    network: Network,
+    database: DataBase,
+    timeblock: TimeBlock,
+    solver_config: SolverConfig,
+) -> None:
+    # Only imported when needed, as it depends on polars
+    from andromede.simulation.sweep import SweepStudy, run_sweep
+
+    assert parsed_args.sweep_path is not None
+    with parsed_args.sweep_path.open() as file:
+        input_sweep = parse_yaml_sweep(file)
+    study = SweepStudy(
+        network,
+        database,
+        timeblock,
+        parsed_args.nb_scenarios,
+        parsed_args.solver,
+        solver_config,
+        parsed_args.build_presolve,
+        parsed_args.aggregate_variables,
+    )
+    results = run_sweep(
+        study,
+        build_sweep_variants(input_sweep, parsed_args.timeseries_path),
+        outputs=[(output.component, output.variable) for output in input_sweep.outputs],
+    )
+    print(results)
+
+    if parsed_args.output_dir is not None:
+        parsed_args.output_dir.mkdir(parents=True, exist_ok=True)
+        results.write_parquet(parsed_args.output_dir / "sweep.parquet")
+
+
 def main_cli() -> None:
     parsed_args = parse_cli()
 
-    lib_dict = input_libs(parsed_args.models_path)
+    lib_dict = input_libs(parsed_args.models_path, parsed_args.lib_cache_dir)
     study = input_study(parsed_args.components_path, lib_dict)
 
     models = {}
@@ -87,18 +150,53 @@ def main_cli() -> None:
     timeblock = TimeBlock(1, list(range(parsed_args.duration)))
     scenario = parsed_args.nb_scenarios
 
+    solver_config = SolverConfig(
+        threads=parsed_args.threads,
+        time_limit=parsed_args.time_limit,
+        presolve=parsed_args.presolve,
+        lp_algorithm=(
+            LpAlgorithm(parsed_args.lp_algorithm)
+            if parsed_args.lp_algorithm is not None
+            else None
+        ),
+        relative_mip_gap=parsed_args.mip_gap,
+        solver_parameters=parsed_args.solver_parameters,
+    )
+
+    if parsed_args.sweep_path is not None:
+        run_sweep_cli(parsed_args, network, database, timeblock, solver_config)
+        return
+
     try:
-        problem = build_problem(network, database, timeblock, scenario)
+        # Names of solver objects are not used by the CLI
+        problem = build_problem(
+            network,
+            database,
+            timeblock,
+            scenario,
+            solver_id=parsed_args.solver,
+            anonymous_names=True,
+            solver_config=solver_config,
+            build_presolve=parsed_args.build_presolve,
+            aggregate_variables=parsed_args.aggregate_variables,
+        )
 
     except IndexError as e:
         raise IndexError(
             f"{e}. Did parameters '--duration' and '--scenario' were correctly set?"
         )
 
-    status = problem.solver.Solve()
+    status = problem.solve()
     print("status : ", status)
 
-    print("final average cost : ", problem.solver.Objective().Value())
+    print("final average cost : ", problem.objective_value())
+
+    if parsed_args.output_dir is not None:
+        # Only imported when needed, as it depends on polars
+        from andromede.simulation.result_writer import ResultWriter
+
+        writer = ResultWriter(parsed_args.output_dir, with_duals=parsed_args.with_duals)
+        writer.write_block(timeblock.id, problem)
 
 
 if __name__ == "__main__":
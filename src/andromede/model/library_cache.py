@@ -0,0 +1,110 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+On-disk cache of resolved libraries.
+
+Resolving a library parses every expression of its models, which is costly.
+Resolved libraries are serialized to a cache directory, under a key computed
+from the content of the input YAML files and from the sources of the classes
+of resolved libraries, and loaded back when the same files are used again
+with the same code.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from andromede.model.library import Library
+
+
+@functools.lru_cache(maxsize=None)
+def _sources_hash() -> str:
+    """
+    Hash of the sources of the packages whose objects are pickled,
+    so that entries written by another version of the code are not used.
+    """
+    hasher = hashlib.sha256()
+    for package in ["expression", "model"]:
+        root = Path(__file__).parents[1] / package
+        for path in sorted(root.rglob("*.py")):
+            hasher.update(path.relative_to(root).as_posix().encode())
+            hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+def library_cache_key(yaml_lib_paths: Iterable[Path]) -> str:
+    """
+    Key identifying a set of library files, based on their content
+    and on the version of the code which resolves them.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(
+        f"{_sources_hash()}-{sys.version_info.major}.{sys.version_info.minor}".encode()
+    )
+    for path in yaml_lib_paths:
+        content = path.read_bytes()
+        hasher.update(len(content).to_bytes(8, "little"))
+        hasher.update(content)
+    return hasher.hexdigest()
+
+
+class LibraryCache:
+    """
+    Stores resolved libraries as pickle files in a directory, one file per key.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pickle"
+
+    def load(self, key: str) -> Optional[Dict[str, Library]]:
+        """
+        Returns the libraries stored under that key, or None if there are none.
+
+        Unreadable entries (for example written by an incompatible version)
+        are considered as missing.
+        """
+        path = self._entry_path(key)
+        if not path.is_file():
+            return None
+        try:
+            with path.open("rb") as file:
+                libraries = pickle.load(file)
+        except Exception:
+            return None
+        if not isinstance(libraries, dict):
+            return None
+        return libraries
+
+    def store(self, key: str, libraries: Dict[str, Library]) -> None:
+        """
+        Writes the libraries under that key.
+
+        The entry is first written to a temporary file then renamed,
+        so that concurrent processes never read a partial entry.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(libraries, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self._entry_path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
@@ -15,7 +15,7 @@ from typing import List, Optional
 from pydantic import Field, ValidationError
 from yaml import safe_load
 
-from andromede.utils import ModifiedBaseModel, _to_kebab
+from andromede.input_model import ModifiedBaseModel, _to_kebab
 
 
 def parse_yaml_library(input: typing.TextIO) -> "InputLibrary":
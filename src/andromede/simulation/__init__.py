@@ -15,8 +15,28 @@ from .benders_decomposed import (
     build_benders_decomposed_problem,
 )
 from .decision_tree import DecisionTreeNode, InterDecisionTimeScenarioConfig
-from .optimization import BlockBorderManagement, OptimizationProblem, build_problem
-from .output_values import BendersSolution, OutputValues
-from .runner import BendersRunner, MergeMPSRunner
+from .optimization import (
+    BlockBorderManagement,
+    OptimizationProblem,
+    build_problem,
+    solve_problems,
+)
+from .output_values import BendersSolution, OutputValues, OutputValuesDiff, VariableDiff
+from .runner import (
+    BendersRunner,
+    CommandRunner,
+    MergeMPSRunner,
+    RunResult,
+    RunStatus,
+    run_commands,
+)
+from .scenario_reduction import ReducedScenarios, select_scenarios
+from .solver_config import LpAlgorithm, SolverConfig
 from .strategy import MergedProblemStrategy, ModelSelectionStrategy
 from .time_block import TimeBlock
+from .time_reduction import (
+    AggregationRule,
+    ReducedHorizon,
+    aggregate_timesteps,
+    select_representative_periods,
+)
@@ -0,0 +1,459 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Solver backends, which hold the optimization problem built from the network.
+
+The problem is built through vectorized primitives which take solver
+column and row indices only, so that backends are free to store it
+the way their solver consumes it, and to load it in bulk.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+from ortools.linear_solver import linear_solver_pb2
+
+from andromede.simulation.solution import solution_response, solution_values
+from andromede.simulation.solver_config import LpAlgorithm, SolverConfig
+
+# Solver ID of the backend solving problems with HiGHS through scipy
+SCIPY_HIGHS = "SCIPY_HIGHS"
+
+
+@dataclass(frozen=True)
+class SparseRows:
+    """
+    Block of constraints, in CSR format: coefficients of row i are at
+    positions starts[i] to starts[i + 1] of indices (of solver columns)
+    and coefficients, starts[0] is 0.
+
+    Names are None for anonymous rows.
+    """
+
+    starts: np.ndarray
+    indices: np.ndarray
+    coefficients: np.ndarray
+    lower_bounds: np.ndarray
+    upper_bounds: np.ndarray
+    names: Optional[List[str]] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.lower_bounds)
+
+
+class SparseRowsBuilder:
+    """
+    Accumulates rows one by one, to add them to a backend in one block.
+    """
+
+    def __init__(self, named: bool = True) -> None:
+        self._starts: List[int] = [0]
+        self._indices: List[int] = []
+        self._coefficients: List[float] = []
+        self._lower_bounds: List[float] = []
+        self._upper_bounds: List[float] = []
+        self._names: Optional[List[str]] = [] if named else None
+
+    def add_row(
+        self,
+        lower_bound: float,
+        upper_bound: float,
+        indices: Iterable[int],
+        coefficients: Iterable[float],
+        name: str = "",
+    ) -> None:
+        self._indices.extend(indices)
+        self._coefficients.extend(coefficients)
+        self._starts.append(len(self._indices))
+        self._lower_bounds.append(lower_bound)
+        self._upper_bounds.append(upper_bound)
+        if self._names is not None:
+            self._names.append(name)
+
+    def build(self) -> SparseRows:
+        return SparseRows(
+            np.array(self._starts, dtype=np.int64),
+            np.array(self._indices, dtype=np.int64),
+            np.array(self._coefficients, dtype=float),
+            np.array(self._lower_bounds, dtype=float),
+            np.array(self._upper_bounds, dtype=float),
+            self._names,
+        )
+
+
+class SolverBackend(ABC):
+    """
+    Builds and solves a minimization problem.
+
+    Coefficients of a column which appears several times in a row,
+    or in the objective, are summed.
+    Solve statuses are the ones of OR-Tools linear solver (lp.Solver.OPTIMAL ...).
+    """
+
+    _solver_config = SolverConfig()
+
+    @property
+    def solver_config(self) -> SolverConfig:
+        return self._solver_config
+
+    def configure(self, config: SolverConfig) -> None:
+        """
+        Sets the parameters of the next solves.
+
+        Raises ValueError for parameters the solver does not accept.
+        """
+        self._solver_config = config
+
+    @abstractmethod
+    def num_variables(self) -> int:
+        ...
+
+    @abstractmethod
+    def num_constraints(self) -> int:
+        ...
+
+    @abstractmethod
+    def add_variables(
+        self,
+        lower_bounds: np.ndarray,
+        upper_bounds: np.ndarray,
+        integer: bool,
+        names: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        Adds consecutive columns, returns the index of the first one.
+        """
+        ...
+
+    @abstractmethod
+    def add_constraints(self, rows: SparseRows) -> int:
+        """
+        Adds consecutive rows, returns the index of the first one.
+        """
+        ...
+
+    @abstractmethod
+    def add_objective(
+        self, indices: np.ndarray, coefficients: np.ndarray, offset: float
+    ) -> None:
+        """
+        Adds terms and a constant to the objective.
+        """
+        ...
+
+    def add_variable(
+        self, lower_bound: float, upper_bound: float, integer: bool, name: str = ""
+    ) -> int:
+        return self.add_variables(
+            np.array([lower_bound], dtype=float),
+            np.array([upper_bound], dtype=float),
+            integer,
+            [name],
+        )
+
+    def add_constraint(
+        self,
+        lower_bound: float,
+        upper_bound: float,
+        indices: Sequence[int],
+        coefficients: Sequence[float],
+        name: str = "",
+    ) -> int:
+        rows = SparseRowsBuilder()
+        rows.add_row(lower_bound, upper_bound, indices, coefficients, name)
+        return self.add_constraints(rows.build())
+
+    @abstractmethod
+    def set_variable_bounds(
+        self, indices: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def set_constraint_bounds(
+        self, indices: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def set_coefficients(
+        self, rows: np.ndarray, columns: np.ndarray, values: np.ndarray
+    ) -> None:
+        """
+        Replaces coefficients of the constraint matrix, at most one per
+        row and column. Zero values remove columns from rows.
+        """
+        ...
+
+    def set_hint(self, indices: np.ndarray, values: np.ndarray) -> None:
+        """
+        Gives values of columns as a starting point for the next solves,
+        replacing the previous hint.
+
+        Hints are mostly used by MIP solvers to find a first solution,
+        backends which cannot use them ignore them.
+        """
+
+    @abstractmethod
+    def objective_coefficients(self) -> np.ndarray:
+        ...
+
+    @abstractmethod
+    def variable_names(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    def constraint_names(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    def solve(self) -> int:
+        ...
+
+    @abstractmethod
+    def objective_value(self) -> float:
+        ...
+
+    @abstractmethod
+    def variable_values(self) -> np.ndarray:
+        """
+        Values of all columns in the last solution.
+        """
+        ...
+
+    @abstractmethod
+    def dual_values(self) -> Optional[np.ndarray]:
+        """
+        Dual values of all rows in the last solution,
+        None if the solver provides no dual values, for example for MIP problems.
+        """
+        ...
+
+    @abstractmethod
+    def reduced_costs(self) -> Optional[np.ndarray]:
+        ...
+
+    @abstractmethod
+    def export_as_proto(self) -> linear_solver_pb2.MPModelProto:
+        ...
+
+
+def remove_zero_coefficients(model: linear_solver_pb2.MPModelProto) -> None:
+    """
+    Removes zero coefficients from the constraints of an exported model:
+    OR-Tools keeps the coefficients of columns removed from rows, as zeros.
+    """
+    for constraint in model.constraint:
+        terms = [
+            (index, coefficient)
+            for index, coefficient in zip(constraint.var_index, constraint.coefficient)
+            if coefficient != 0
+        ]
+        if len(terms) < len(constraint.var_index):
+            del constraint.var_index[:]
+            del constraint.coefficient[:]
+            constraint.var_index.extend(index for index, _ in terms)
+            constraint.coefficient.extend(coefficient for _, coefficient in terms)
+
+
+class ORToolsBackend(SolverBackend):
+    """
+    Problem held by an OR-Tools linear solver (pywraplp).
+    """
+
+    def __init__(self, solver: lp.Solver) -> None:
+        self._solver = solver
+        # Whether columns were removed from rows, by zero coefficients
+        self._removed_coefficients = False
+
+    @property
+    def solver(self) -> lp.Solver:
+        return self._solver
+
+    def num_variables(self) -> int:
+        return self._solver.NumVariables()
+
+    def num_constraints(self) -> int:
+        return self._solver.NumConstraints()
+
+    def add_variables(
+        self,
+        lower_bounds: np.ndarray,
+        upper_bounds: np.ndarray,
+        integer: bool,
+        names: Optional[Sequence[str]] = None,
+    ) -> int:
+        # The linear solver has no bulk operations
+        offset = self._solver.NumVariables()
+        for i, (lower_bound, upper_bound) in enumerate(
+            zip(lower_bounds.tolist(), upper_bounds.tolist())
+        ):
+            name = "" if names is None else names[i]
+            self._solver.Var(lower_bound, upper_bound, integer, name)
+        return offset
+
+    def add_constraints(self, rows: SparseRows) -> int:
+        offset = self._solver.NumConstraints()
+        starts = rows.starts.tolist()
+        indices = rows.indices.tolist()
+        coefficients = rows.coefficients.tolist()
+        for i, (lower_bound, upper_bound) in enumerate(
+            zip(rows.lower_bounds.tolist(), rows.upper_bounds.tolist())
+        ):
+            name = "" if rows.names is None else rows.names[i]
+            constraint = self._solver.Constraint(lower_bound, upper_bound, name)
+            for k in range(starts[i], starts[i + 1]):
+                variable = self._solver.variable(indices[k])
+                constraint.SetCoefficient(
+                    variable, constraint.GetCoefficient(variable) + coefficients[k]
+                )
+        return offset
+
+    def add_objective(
+        self, indices: np.ndarray, coefficients: np.ndarray, offset: float
+    ) -> None:
+        objective = self._solver.Objective()
+        for index, coefficient in zip(indices.tolist(), coefficients.tolist()):
+            variable = self._solver.variable(index)
+            objective.SetCoefficient(
+                variable, objective.GetCoefficient(variable) + coefficient
+            )
+        # This should have no effect on the optimization
+        objective.SetOffset(objective.offset() + offset)
+
+    def set_variable_bounds(
+        self, indices: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        for index, lower_bound, upper_bound in zip(
+            indices.tolist(), lower_bounds.tolist(), upper_bounds.tolist()
+        ):
+            self._solver.variable(index).SetBounds(lower_bound, upper_bound)
+
+    def set_constraint_bounds(
+        self, indices: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        for index, lower_bound, upper_bound in zip(
+            indices.tolist(), lower_bounds.tolist(), upper_bounds.tolist()
+        ):
+            self._solver.constraint(index).SetBounds(lower_bound, upper_bound)
+
+    def set_coefficients(
+        self, rows: np.ndarray, columns: np.ndarray, values: np.ndarray
+    ) -> None:
+        self._removed_coefficients |= bool(np.any(values == 0))
+        for row, column, value in zip(rows.tolist(), columns.tolist(), values.tolist()):
+            self._solver.constraint(row).SetCoefficient(
+                self._solver.variable(column), value
+            )
+
+    def set_hint(self, indices: np.ndarray, values: np.ndarray) -> None:
+        self._solver.SetHint(
+            [self._solver.variable(index) for index in indices.tolist()],
+            values.tolist(),
+        )
+
+    def objective_coefficients(self) -> np.ndarray:
+        objective = self._solver.Objective()
+        return np.array(
+            [objective.GetCoefficient(v) for v in self._solver.variables()],
+            dtype=float,
+        )
+
+    def variable_names(self) -> List[str]:
+        return [variable.name() for variable in self._solver.variables()]
+
+    def constraint_names(self) -> List[str]:
+        return [constraint.name() for constraint in self._solver.constraints()]
+
+    def configure(self, config: SolverConfig) -> None:
+        if config.solver_parameters and not (
+            self._solver.SetSolverSpecificParametersAsString(config.solver_parameters)
+        ):
+            raise ValueError(
+                f"Invalid parameters for solver {self._solver.SolverVersion()}: "
+                f"{config.solver_parameters}"
+            )
+        if config.threads is not None:
+            # Fails for single-threaded solvers, which are left as they are
+            self._solver.SetNumThreads(config.threads)
+        if config.time_limit is not None:
+            self._solver.SetTimeLimit(round(config.time_limit * 1000))
+        if config.verbose:
+            self._solver.EnableOutput()
+        else:
+            self._solver.SuppressOutput()
+        super().configure(config)
+
+    def _parameters(self) -> lp.MPSolverParameters:
+        config = self.solver_config
+        parameters = lp.MPSolverParameters()
+        if config.presolve is not None:
+            parameters.SetIntegerParam(
+                parameters.PRESOLVE,
+                parameters.PRESOLVE_ON if config.presolve else parameters.PRESOLVE_OFF,
+            )
+        if config.lp_algorithm is not None:
+            parameters.SetIntegerParam(
+                parameters.LP_ALGORITHM,
+                {
+                    LpAlgorithm.PRIMAL: parameters.PRIMAL,
+                    LpAlgorithm.DUAL: parameters.DUAL,
+                    LpAlgorithm.BARRIER: parameters.BARRIER,
+                }[config.lp_algorithm],
+            )
+        if config.relative_mip_gap is not None:
+            parameters.SetDoubleParam(
+                parameters.RELATIVE_MIP_GAP, config.relative_mip_gap
+            )
+        return parameters
+
+    def solve(self) -> int:
+        # The solver keeps its state between solves: LP problems modified
+        # in place are solved again from the previous basis
+        return self._solver.Solve(self._parameters())
+
+    def objective_value(self) -> float:
+        return self._solver.Objective().Value()
+
+    def variable_values(self) -> np.ndarray:
+        values = solution_values(
+            solution_response(self._solver).variable_value,
+            self._solver.NumVariables(),
+        )
+        if values is None:
+            # Some solvers do not fill the solution response
+            values = np.array(
+                [variable.solution_value() for variable in self._solver.variables()],
+                dtype=float,
+            )
+        return values
+
+    def dual_values(self) -> Optional[np.ndarray]:
+        return solution_values(
+            solution_response(self._solver).dual_value, self._solver.NumConstraints()
+        )
+
+    def reduced_costs(self) -> Optional[np.ndarray]:
+        return solution_values(
+            solution_response(self._solver).reduced_cost, self._solver.NumVariables()
+        )
+
+    def export_as_proto(self) -> linear_solver_pb2.MPModelProto:
+        model = linear_solver_pb2.MPModelProto()
+        self._solver.ExportModelToProto(model)
+        if self._removed_coefficients:
+            remove_zero_coefficients(model)
+        return model
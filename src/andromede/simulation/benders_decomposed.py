@@ -16,9 +16,10 @@ with Benders solver related functions
 """
 
 import pathlib
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from andromede.simulation.decision_tree import DecisionTreeNode
+from andromede.simulation.mps_writer import mps_file_name, write_mps_files
 from andromede.simulation.optimization import (
     BlockBorderManagement,
     OptimizationProblem,
@@ -31,6 +32,7 @@ from andromede.simulation.output_values import (
     BendersSolution,
 )
 from andromede.simulation.runner import BendersRunner, MergeMPSRunner
+from andromede.simulation.solver_config import SolverConfig
 from andromede.simulation.strategy import (
     ExpectedValue,
     InvestmentProblemStrategy,
@@ -76,40 +78,35 @@ class BendersDecomposedProblem:
 
     def export_structure(self) -> str:
         """
-        Write the structure.txt file
+        Content of the structure.txt file
         """
+        return "".join(self._structure_lines())
 
+    def _structure_lines(self) -> Iterator[str]:
+        """
+        Lines of the structure.txt file, problem by problem.
+
+        Like in Xpansion, each line gives the column index of a candidate
+        (a variable of the master) in the master or in a sub-problem.
+        """
         if not self.subproblems:
             raise RuntimeError("Subproblem list must have at least one sub problem")
 
-        # A mapping similar to the Xpansion mapping for keeping track of variable indexes
-        # in Master and Sub-problem files
-        problem_to_candidates: Dict[str, Dict[str, int]] = {}
-        candidates = set()
-
-        problem_to_candidates["master"] = {}
-        for solver_var_info in self.master.context._solver_variables.values():
-            problem_to_candidates["master"][
-                solver_var_info.name
-            ] = solver_var_info.column_id
-            candidates.add(solver_var_info.name)
+        candidates: Dict[str, int] = {}
+        for solver_var_info in self.master.solver_variables():
+            candidates[solver_var_info.name] = solver_var_info.column_id
+        for candidate, index in candidates.items():
+            yield f"{'master':>50}{candidate:>50}{index:>10}\n"
 
         for problem in self.subproblems:
-            problem_to_candidates[problem.name] = {}
-
-            for solver_var_info in problem.context._solver_variables.values():
-                if solver_var_info.name in candidates:
-                    # If candidate was identified in master
-                    problem_to_candidates[problem.name][
-                        solver_var_info.name
-                    ] = solver_var_info.column_id
-
-        structure_str = ""
-        for problem_name, candidate_to_index in problem_to_candidates.items():
-            for candidate, index in candidate_to_index.items():
-                structure_str += f"{problem_name:>50}{candidate:>50}{index:>10}\n"
-
-        return structure_str
+            # If candidate was identified in master
+            problem_candidates = {
+                solver_var_info.name: solver_var_info.column_id
+                for solver_var_info in problem.solver_variables()
+                if solver_var_info.name in candidates
+            }
+            for candidate, index in problem_candidates.items():
+                yield f"{problem.name:>50}{candidate:>50}{index:>10}\n"
 
     def export_options(
         self, *, solver_name: str = "XPRESS", log_level: int = 0
@@ -149,17 +146,30 @@ class BendersDecomposedProblem:
         solver_name: str = "XPRESS",
         log_level: int = 0,
         is_debug: bool = False,
+        compress: bool = False,
+        workers: int = 1,
     ) -> None:
-        serialize(
-            f"{self.master.name}.mps", self.master.export_as_mps(), self.emplacement
-        )
-        for subproblem in self.subproblems:
-            serialize(
-                f"{subproblem.name}.mps", subproblem.export_as_mps(), self.emplacement
-            )
-        serialize(
-            f"{self.structure_filename}", self.export_structure(), self.emplacement
+        """
+        Writes the input files of the Benders solver.
+
+        MPS files are written in streaming fashion, gzip-compressed if required
+        (as .mps.gz files), and by several worker processes if workers > 1.
+        """
+        problems = [self.master, *self.subproblems]
+        write_mps_files(
+            (
+                (
+                    problem.export_as_proto(),
+                    self.emplacement / mps_file_name(problem.name, compress),
+                )
+                for problem in problems
+            ),
+            compress=compress,
+            workers=workers,
         )
+        self.emplacement.mkdir(parents=True, exist_ok=True)
+        with (self.emplacement / self.structure_filename).open("w") as file:
+            file.writelines(self._structure_lines())
         serialize_json(
             "options.json",
             self.export_options(solver_name=solver_name, log_level=log_level),
@@ -197,16 +207,17 @@ class BendersDecomposedProblem:
         log_level: int = 0,
         should_merge: bool = False,
         show_debug: bool = False,
+        timeout: Optional[float] = None,
     ) -> bool:
         self.initialise(
             solver_name=solver_name, log_level=log_level, is_debug=show_debug
         )
 
         if not should_merge:
-            return_code = BendersRunner(self.emplacement).run()
+            return_code = BendersRunner(self.emplacement, timeout=timeout).run()
         else:
             self.is_merged = True
-            return_code = MergeMPSRunner(self.emplacement).run()
+            return_code = MergeMPSRunner(self.emplacement, timeout=timeout).run()
 
         if return_code == 0:
             self.read_solution()
@@ -222,6 +233,7 @@ def build_benders_decomposed_problem(
     border_management: BlockBorderManagement = BlockBorderManagement.CYCLE,
     solver_id: str = "GLOP",
     struct_filename: str = "structure.txt",
+    solver_config: Optional[SolverConfig] = None,
 ) -> BendersDecomposedProblem:
     """
     Entry point to build the xpansion pathway problem.
@@ -250,6 +262,7 @@ def build_benders_decomposed_problem(
         null_scenario,
         problem_name="coupler",
         solver_id=solver_id,
+        solver_config=solver_config,
         build_strategy=InvestmentProblemStrategy(),
         risk_strategy=ExpectedValue(0.0),
         use_full_var_name=False,
@@ -269,6 +282,7 @@ def build_benders_decomposed_problem(
                 null_scenario,
                 problem_name=f"master{suffix_tree}",
                 solver_id=solver_id,
+                solver_config=solver_config,
                 build_strategy=InvestmentProblemStrategy(),
                 decision_tree_node=tree_node.id,
                 risk_strategy=ExpectedValue(tree_node.prob),
@@ -286,6 +300,7 @@ def build_benders_decomposed_problem(
                     tree_node.config.scenarios,
                     problem_name=f"subproblem{suffix_tree}{suffix_block}",
                     solver_id=solver_id,
+                    solver_config=solver_config,
                     build_strategy=OperationalProblemStrategy(),
                     decision_tree_node=tree_node.id,
                     risk_strategy=ExpectedValue(tree_node.prob),
@@ -0,0 +1,252 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Backend holding the problem in memory as arrays, without any solver.
+
+Blocks of columns and rows are kept as they are added, and concatenated
+when the whole problem is needed, for exports or for solvers which take
+the problem as matrices.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from ortools.linear_solver import linear_solver_pb2
+
+from andromede.simulation.backend import SolverBackend, SparseRows
+
+
+def _concatenate(arrays: List[np.ndarray], dtype: type) -> np.ndarray:
+    return np.concatenate(arrays) if arrays else np.zeros(0, dtype=dtype)
+
+
+class MatrixBackend(SolverBackend):
+    """
+    Problem held as arrays, which cannot be solved.
+
+    Useful to export problems, or to inspect built problems in tests.
+    """
+
+    def __init__(self) -> None:
+        self._num_variables = 0
+        self._lower_bounds: List[np.ndarray] = []
+        self._upper_bounds: List[np.ndarray] = []
+        self._integers: List[np.ndarray] = []
+        self._variable_names: List[str] = []
+
+        self._num_constraints = 0
+        self._rows: List[SparseRows] = []
+        self._constraint_names: List[str] = []
+
+        self._objective_indices: List[np.ndarray] = []
+        self._objective_coefficients: List[np.ndarray] = []
+        self._objective_offset = 0.0
+
+        self._hint_indices = np.zeros(0, dtype=np.int64)
+        self._hint_values = np.zeros(0, dtype=float)
+
+    def num_variables(self) -> int:
+        return self._num_variables
+
+    def num_constraints(self) -> int:
+        return self._num_constraints
+
+    def add_variables(
+        self,
+        lower_bounds: np.ndarray,
+        upper_bounds: np.ndarray,
+        integer: bool,
+        names: Optional[Sequence[str]] = None,
+    ) -> int:
+        offset = self._num_variables
+        count = len(lower_bounds)
+        self._lower_bounds.append(np.asarray(lower_bounds, dtype=float))
+        self._upper_bounds.append(np.asarray(upper_bounds, dtype=float))
+        self._integers.append(np.full(count, integer))
+        self._variable_names.extend([""] * count if names is None else names)
+        self._num_variables += count
+        return offset
+
+    def add_constraints(self, rows: SparseRows) -> int:
+        offset = self._num_constraints
+        self._rows.append(rows)
+        self._constraint_names.extend(
+            [""] * rows.size if rows.names is None else rows.names
+        )
+        self._num_constraints += rows.size
+        return offset
+
+    def add_objective(
+        self, indices: np.ndarray, coefficients: np.ndarray, offset: float
+    ) -> None:
+        self._objective_indices.append(np.asarray(indices, dtype=np.int64))
+        self._objective_coefficients.append(np.asarray(coefficients, dtype=float))
+        self._objective_offset += offset
+
+    def set_variable_bounds(
+        self, indices: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        # Blocks are merged, to be modified in place
+        self._lower_bounds = [self.lower_bounds()]
+        self._upper_bounds = [self.upper_bounds()]
+        self._lower_bounds[0][indices] = lower_bounds
+        self._upper_bounds[0][indices] = upper_bounds
+
+    def set_constraint_bounds(
+        self, indices: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        rows = self.constraint_rows()
+        rows.lower_bounds[indices] = lower_bounds
+        rows.upper_bounds[indices] = upper_bounds
+        self._rows = [rows]
+
+    def set_coefficients(
+        self, rows: np.ndarray, columns: np.ndarray, values: np.ndarray
+    ) -> None:
+        current = self.constraint_rows()
+        current_rows = np.repeat(
+            np.arange(self._num_constraints), np.diff(current.starts)
+        )
+        # Current coefficients of the columns are removed, then new ones added
+        replaced = np.isin(
+            current_rows * self._num_variables + current.indices,
+            rows * self._num_variables + columns,
+        )
+        added = values != 0
+        all_rows = np.concatenate([current_rows[~replaced], rows[added]])
+        order = np.argsort(all_rows, kind="stable")
+        starts = np.zeros(self._num_constraints + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(all_rows, minlength=self._num_constraints), out=starts[1:]
+        )
+        self._rows = [
+            SparseRows(
+                starts,
+                np.concatenate([current.indices[~replaced], columns[added]])[order],
+                np.concatenate([current.coefficients[~replaced], values[added]])[order],
+                current.lower_bounds,
+                current.upper_bounds,
+                current.names,
+            )
+        ]
+
+    def set_hint(self, indices: np.ndarray, values: np.ndarray) -> None:
+        self._hint_indices = np.asarray(indices, dtype=np.int64)
+        self._hint_values = np.asarray(values, dtype=float)
+
+    @property
+    def objective_offset(self) -> float:
+        return self._objective_offset
+
+    def lower_bounds(self) -> np.ndarray:
+        return _concatenate(self._lower_bounds, float)
+
+    def upper_bounds(self) -> np.ndarray:
+        return _concatenate(self._upper_bounds, float)
+
+    def integers(self) -> np.ndarray:
+        return _concatenate(self._integers, bool)
+
+    def objective_coefficients(self) -> np.ndarray:
+        # Duplicate indices are summed
+        return np.bincount(
+            _concatenate(self._objective_indices, np.int64),
+            weights=_concatenate(self._objective_coefficients, float),
+            minlength=self._num_variables,
+        )
+
+    def constraint_rows(self) -> SparseRows:
+        """
+        All rows in one block, duplicate columns of a row are not summed.
+        """
+        starts = [np.zeros(1, dtype=np.int64)]
+        nnz = 0
+        for rows in self._rows:
+            starts.append(rows.starts[1:] + nnz)
+            nnz += len(rows.indices)
+        return SparseRows(
+            np.concatenate(starts),
+            _concatenate([rows.indices for rows in self._rows], np.int64),
+            _concatenate([rows.coefficients for rows in self._rows], float),
+            _concatenate([rows.lower_bounds for rows in self._rows], float),
+            _concatenate([rows.upper_bounds for rows in self._rows], float),
+            list(self._constraint_names),
+        )
+
+    def variable_names(self) -> List[str]:
+        return list(self._variable_names)
+
+    def constraint_names(self) -> List[str]:
+        return list(self._constraint_names)
+
+    def solve(self) -> int:
+        raise ValueError("The problem is not held by a solver")
+
+    def objective_value(self) -> float:
+        raise ValueError("The problem is not held by a solver")
+
+    def variable_values(self) -> np.ndarray:
+        raise ValueError("The problem is not held by a solver")
+
+    def dual_values(self) -> Optional[np.ndarray]:
+        return None
+
+    def reduced_costs(self) -> Optional[np.ndarray]:
+        return None
+
+    def export_as_proto(self) -> linear_solver_pb2.MPModelProto:
+        model = linear_solver_pb2.MPModelProto()
+        model.objective_offset = self._objective_offset
+        for lower_bound, upper_bound, integer, name, coefficient in zip(
+            self.lower_bounds().tolist(),
+            self.upper_bounds().tolist(),
+            self.integers().tolist(),
+            self._variable_names,
+            self.objective_coefficients().tolist(),
+        ):
+            model.variable.add(
+                name=name,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound,
+                is_integer=integer,
+                objective_coefficient=coefficient,
+            )
+
+        rows = self.constraint_rows()
+        starts = rows.starts.tolist()
+        indices = rows.indices.tolist()
+        values = rows.coefficients.tolist()
+        for row, (lower_bound, upper_bound, name) in enumerate(
+            zip(
+                rows.lower_bounds.tolist(),
+                rows.upper_bounds.tolist(),
+                self._constraint_names,
+            )
+        ):
+            # Duplicate columns are summed, in the order of their first occurrence
+            coefficients: Dict[int, float] = {}
+            for index, coefficient in zip(
+                indices[starts[row] : starts[row + 1]],
+                values[starts[row] : starts[row + 1]],
+            ):
+                coefficients[index] = coefficients.get(index, 0.0) + coefficient
+            model.constraint.add(
+                name=name,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound,
+                var_index=list(coefficients.keys()),
+                coefficient=list(coefficients.values()),
+            )
+
+        model.solution_hint.var_index.extend(self._hint_indices.tolist())
+        model.solution_hint.var_value.extend(self._hint_values.tolist())
+        return model
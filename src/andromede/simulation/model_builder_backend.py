@@ -0,0 +1,199 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Backend based on OR-Tools model builder.
+
+The helpers of model builder are used directly: they take and return NumPy
+arrays, without the pandas layer of the model_builder module.
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+from ortools.linear_solver import linear_solver_pb2
+from ortools.linear_solver.python import model_builder_helper as mbh
+
+from andromede.simulation.backend import (
+    SolverBackend,
+    SparseRows,
+    remove_zero_coefficients,
+)
+from andromede.simulation.solver_config import SolverConfig
+
+
+class ModelBuilderBackend(SolverBackend):
+    """
+    Problem held by an OR-Tools model builder, solved by the named solver
+    ("glop", "scip", "pdlp" ...).
+
+    Only the time limit, solver-specific parameters and verbosity of solver
+    configurations are applied, other parameters are left to solver defaults.
+    """
+
+    def __init__(self, solver_name: str = "scip") -> None:
+        self._model = mbh.ModelBuilderHelper()
+        self._solver = mbh.ModelSolverHelper(solver_name)
+        if not self._solver.solver_is_supported():
+            raise ValueError(f"Solver {solver_name} is not available")
+        # Whether columns were removed from rows, by zero coefficients
+        self._removed_coefficients = False
+
+    def num_variables(self) -> int:
+        return self._model.num_variables()
+
+    def num_constraints(self) -> int:
+        return self._model.num_constraints()
+
+    def add_variables(
+        self,
+        lower_bounds: np.ndarray,
+        upper_bounds: np.ndarray,
+        integer: bool,
+        names: Optional[Sequence[str]] = None,
+    ) -> int:
+        offset = self._model.num_variables()
+        self._model.add_var_array_with_bounds(
+            np.asarray(lower_bounds, dtype=float),
+            np.asarray(upper_bounds, dtype=float),
+            np.full(len(lower_bounds), integer),
+            "",
+        )
+        if names is not None:
+            for index, name in enumerate(names, offset):
+                self._model.set_var_name(index, name)
+        return offset
+
+    def add_constraints(self, rows: SparseRows) -> int:
+        offset = self._model.num_constraints()
+        starts = rows.starts.tolist()
+        indices = rows.indices.tolist()
+        coefficients = rows.coefficients.tolist()
+        for i, (lower_bound, upper_bound) in enumerate(
+            zip(rows.lower_bounds.tolist(), rows.upper_bounds.tolist())
+        ):
+            # Coefficients of duplicate columns are summed by the helper
+            constraint = self._model.add_linear_constraint()
+            self._model.set_constraint_lower_bound(constraint, lower_bound)
+            self._model.set_constraint_upper_bound(constraint, upper_bound)
+            self._model.add_terms_to_constraint(
+                constraint,
+                indices[starts[i] : starts[i + 1]],
+                coefficients[starts[i] : starts[i + 1]],
+            )
+            if rows.names is not None:
+                self._model.set_constraint_name(constraint, rows.names[i])
+        return offset
+
+    def add_objective(
+        self, indices: np.ndarray, coefficients: np.ndarray, offset: float
+    ) -> None:
+        # Duplicate indices are summed, and added to the current coefficients
+        unique_indices, positions = np.unique(indices, return_inverse=True)
+        summed = np.bincount(positions, weights=coefficients).tolist()
+        unique_indices_list = unique_indices.tolist()
+        current = [
+            self._model.var_objective_coefficient(i) for i in unique_indices_list
+        ]
+        self._model.set_objective_coefficients(
+            unique_indices_list, [c + s for c, s in zip(current, summed)]
+        )
+        self._model.set_objective_offset(self._model.objective_offset() + offset)
+
+    def set_variable_bounds(
+        self, indices: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        for index, lower_bound, upper_bound in zip(
+            indices.tolist(), lower_bounds.tolist(), upper_bounds.tolist()
+        ):
+            self._model.set_var_lower_bound(index, lower_bound)
+            self._model.set_var_upper_bound(index, upper_bound)
+
+    def set_constraint_bounds(
+        self, indices: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        for index, lower_bound, upper_bound in zip(
+            indices.tolist(), lower_bounds.tolist(), upper_bounds.tolist()
+        ):
+            self._model.set_constraint_lower_bound(index, lower_bound)
+            self._model.set_constraint_upper_bound(index, upper_bound)
+
+    def set_coefficients(
+        self, rows: np.ndarray, columns: np.ndarray, values: np.ndarray
+    ) -> None:
+        self._removed_coefficients |= bool(np.any(values == 0))
+        for row, column, value in zip(rows.tolist(), columns.tolist(), values.tolist()):
+            self._model.set_constraint_coefficient(row, column, value)
+
+    def set_hint(self, indices: np.ndarray, values: np.ndarray) -> None:
+        self._model.clear_hints()
+        for index, value in zip(indices.tolist(), values.tolist()):
+            self._model.add_hint(index, value)
+
+    def objective_coefficients(self) -> np.ndarray:
+        return np.array(
+            [
+                self._model.var_objective_coefficient(i)
+                for i in range(self._model.num_variables())
+            ],
+            dtype=float,
+        )
+
+    def variable_names(self) -> List[str]:
+        return [self._model.var_name(i) for i in range(self._model.num_variables())]
+
+    def constraint_names(self) -> List[str]:
+        return [
+            self._model.constraint_name(i) for i in range(self._model.num_constraints())
+        ]
+
+    def configure(self, config: SolverConfig) -> None:
+        if config.time_limit is not None:
+            self._solver.set_time_limit_in_seconds(config.time_limit)
+        self._solver.set_solver_specific_parameters(config.solver_parameters)
+        self._solver.enable_output(config.verbose)
+        super().configure(config)
+
+    def solve(self) -> int:
+        self._solver.solve(self._model)
+        # Statuses have the same names as the ones of the linear solver
+        return getattr(lp.Solver, self._solver.status().name, lp.Solver.ABNORMAL)
+
+    def objective_value(self) -> float:
+        return self._solver.objective_value()
+
+    def variable_values(self) -> np.ndarray:
+        if not self._solver.has_solution():
+            return np.zeros(self._model.num_variables())
+        return self._solver.variable_values()
+
+    def dual_values(self) -> Optional[np.ndarray]:
+        if not self._solver.has_solution():
+            return None
+        duals = self._solver.dual_values()
+        return duals if len(duals) == self._model.num_constraints() else None
+
+    def reduced_costs(self) -> Optional[np.ndarray]:
+        if not self._solver.has_solution():
+            return None
+        reduced_costs = self._solver.reduced_costs()
+        if len(reduced_costs) != self._model.num_variables():
+            return None
+        return reduced_costs
+
+    def export_as_proto(self) -> linear_solver_pb2.MPModelProto:
+        model: linear_solver_pb2.MPModelProto = mbh.to_mpmodel_proto(  # type: ignore
+            self._model
+        )
+        if self._removed_coefficients:
+            remove_zero_coefficients(model)
+        return model
@@ -0,0 +1,269 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Streaming export of problems to free MPS files.
+
+The solver only exports whole problems as strings, which needs several
+times the size of the file in memory for large problems. Here, the model
+is fetched from the solver as a protocol buffer, then written section by
+section to the file, so that the text of the file is never fully in memory.
+
+Several problems can be written in parallel by worker processes.
+"""
+import gzip
+import itertools
+import math
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, Iterable, List, Tuple
+
+import numpy as np
+from ortools.linear_solver import linear_solver_pb2
+
+# Number of non-zero coefficients formatted at once in the COLUMNS section
+_CHUNK_SIZE = 1 << 16
+
+_OBJECTIVE_ROW = "COST"
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+def _name(name: str) -> str:
+    # Fields are separated by spaces in free MPS, like the solver export
+    return name.replace(" ", "_")
+
+
+def mps_file_name(problem_name: str, compress: bool) -> str:
+    return f"{problem_name}.mps.gz" if compress else f"{problem_name}.mps"
+
+
+def _open_text(path: Path, compress: bool) -> IO[str]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    return path.open("w", encoding="utf-8")
+
+
+def _check_supported(model: linear_solver_pb2.MPModelProto) -> None:
+    if len(model.general_constraint) > 0 or model.HasField("quadratic_objective"):
+        raise ValueError(
+            f"Problem {model.name} has general constraints or a quadratic objective, "
+            "which cannot be exported to MPS"
+        )
+
+
+def _row_lines(
+    model: linear_solver_pb2.MPModelProto,
+) -> Tuple[List[str], List[Tuple[str, float]], List[Tuple[str, float]]]:
+    """
+    Lines of the ROWS section, with right-hand sides and ranges.
+    """
+    rows = [f" N  {_OBJECTIVE_ROW}\n"]
+    rhs: List[Tuple[str, float]] = []
+    ranges: List[Tuple[str, float]] = []
+    if model.objective_offset != 0:
+        # By convention, the right-hand side of the objective is minus its offset
+        rhs.append((_OBJECTIVE_ROW, -model.objective_offset))
+
+    for constraint in model.constraint:
+        name = _name(constraint.name)
+        lower, upper = constraint.lower_bound, constraint.upper_bound
+        if lower == upper:
+            rows.append(f" E  {name}\n")
+            value = lower
+        elif math.isinf(lower) and math.isinf(upper):
+            rows.append(f" N  {name}\n")
+            value = 0.0
+        elif math.isinf(lower):
+            rows.append(f" L  {name}\n")
+            value = upper
+        else:
+            rows.append(f" G  {name}\n")
+            value = lower
+            if not math.isinf(upper):
+                ranges.append((name, upper - lower))
+        if value != 0:
+            rhs.append((name, value))
+    return rows, rhs, ranges
+
+
+def _bound_lines(variable: linear_solver_pb2.MPVariableProto) -> Iterable[str]:
+    name = _name(variable.name)
+    lower, upper = variable.lower_bound, variable.upper_bound
+    if lower == upper:
+        yield f" FX BOUND  {name}  {_number(lower)}\n"
+        return
+    if math.isinf(lower):
+        if math.isinf(upper):
+            yield f" FR BOUND  {name}\n"
+            return
+        yield f" MI BOUND  {name}\n"
+    elif lower != 0 or upper < 0:
+        yield f" LO BOUND  {name}  {_number(lower)}\n"
+    if not math.isinf(upper):
+        yield f" UP BOUND  {name}  {_number(upper)}\n"
+    elif variable.is_integer:
+        # Some readers give a default upper bound of 1 to integer variables
+        yield f" PL BOUND  {name}\n"
+
+
+def _write_columns(model: linear_solver_pb2.MPModelProto, file: IO[str]) -> None:
+    # Coefficients are stored by row in the model, and written by column
+    row_sizes = np.fromiter(
+        (len(constraint.var_index) for constraint in model.constraint),
+        dtype=np.int64,
+        count=len(model.constraint),
+    )
+    nnz = int(row_sizes.sum())
+    columns = np.fromiter(
+        itertools.chain.from_iterable(c.var_index for c in model.constraint),
+        dtype=np.int64,
+        count=nnz,
+    )
+    coefficients = np.fromiter(
+        itertools.chain.from_iterable(c.coefficient for c in model.constraint),
+        dtype=np.float64,
+        count=nnz,
+    )
+    order = np.argsort(columns, kind="stable")
+    rows = np.repeat(np.arange(len(model.constraint), dtype=np.int64), row_sizes)[order]
+    coefficients = coefficients[order]
+    column_starts = np.searchsorted(
+        columns[order], np.arange(len(model.variable) + 1)
+    ).tolist()
+    del columns, order
+
+    row_names = [_name(constraint.name) for constraint in model.constraint]
+    file.write("COLUMNS\n")
+    in_integer_block = False
+    marker = 0
+    lines: List[str] = []
+    chunk_start = chunk_end = 0
+    chunk_rows: List[int] = []
+    chunk_coefficients: List[float] = []
+    for index, variable in enumerate(model.variable):
+        if variable.is_integer != in_integer_block:
+            kind = "INTEND" if in_integer_block else "INTORG"
+            lines.append(f"    MARKER{marker}  'MARKER'  '{kind}'\n")
+            marker += 1
+            in_integer_block = variable.is_integer
+
+        start, end = column_starts[index], column_starts[index + 1]
+        if end > chunk_end:
+            # Coefficients are converted to Python objects chunk by chunk
+            chunk_start = start
+            chunk_end = max(end, min(start + _CHUNK_SIZE, nnz))
+            chunk_rows = rows[chunk_start:chunk_end].tolist()
+            chunk_coefficients = coefficients[chunk_start:chunk_end].tolist()
+
+        name = _name(variable.name)
+        if variable.objective_coefficient != 0 or start == end:
+            # Columns without any coefficient must still be declared
+            lines.append(
+                f"    {name}  {_OBJECTIVE_ROW}  {_number(variable.objective_coefficient)}\n"
+            )
+        for k in range(start - chunk_start, end - chunk_start):
+            lines.append(
+                f"    {name}  {row_names[chunk_rows[k]]}  {chunk_coefficients[k]!r}\n"
+            )
+        if len(lines) >= _CHUNK_SIZE:
+            file.writelines(lines)
+            lines = []
+
+    if in_integer_block:
+        lines.append(f"    MARKER{marker}  'MARKER'  'INTEND'\n")
+    file.writelines(lines)
+
+
+def write_mps(model: linear_solver_pb2.MPModelProto, file: IO[str]) -> None:
+    """
+    Writes the model to a text file, in free MPS format.
+    """
+    _check_supported(model)
+    file.write(f"NAME  {_name(model.name)}\n")
+    if model.maximize:
+        file.write("OBJSENSE\n    MAX\n")
+
+    rows, rhs, ranges = _row_lines(model)
+    file.write("ROWS\n")
+    file.writelines(rows)
+    del rows
+
+    _write_columns(model, file)
+
+    file.write("RHS\n")
+    file.writelines(f"    RHS  {name}  {_number(value)}\n" for name, value in rhs)
+    if ranges:
+        file.write("RANGES\n")
+        file.writelines(
+            f"    RANGE  {name}  {_number(value)}\n" for name, value in ranges
+        )
+    file.write("BOUNDS\n")
+    for variable in model.variable:
+        file.writelines(_bound_lines(variable))
+    file.write("ENDATA\n")
+
+
+def write_mps_file(
+    model: linear_solver_pb2.MPModelProto, path: Path, *, compress: bool = False
+) -> None:
+    """
+    Writes the model to an MPS file, gzip-compressed if required.
+    """
+    with _open_text(path, compress) as file:
+        write_mps(model, file)
+
+
+def _write_serialized_mps_file(model_bytes: bytes, path: Path, compress: bool) -> None:
+    model = linear_solver_pb2.MPModelProto.FromString(model_bytes)
+    del model_bytes
+    write_mps_file(model, path, compress=compress)
+
+
+def write_mps_files(
+    models: Iterable[Tuple[linear_solver_pb2.MPModelProto, Path]],
+    *,
+    compress: bool = False,
+    workers: int = 1,
+) -> None:
+    """
+    Writes each model to its MPS file.
+
+    With more than one worker, files are written by worker processes.
+    Models are consumed lazily, and at most two models per worker are
+    waiting to be written at any time.
+    """
+    if workers <= 1:
+        for model, path in models:
+            write_mps_file(model, path, compress=compress)
+        return
+
+    pending: List[Future[None]] = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        for model, path in models:
+            if len(pending) >= 2 * workers:
+                pending.pop(0).result()
+            pending.append(
+                executor.submit(
+                    _write_serialized_mps_file,
+                    model.SerializeToString(),
+                    path,
+                    compress,
+                )
+            )
+        for future in pending:
+            future.result()
@@ -17,14 +17,39 @@ into a mathematical optimization problem.
 
 import itertools
 import math
-from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Iterable, List, Optional
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+import numpy as np
 import ortools.linear_solver.pywraplp as lp
-
-from andromede.expression import EvaluationVisitor, ExpressionNode, ValueProvider, visit
+from ortools.linear_solver import linear_solver_pb2
+
+from andromede.expression import (
+    EvaluationVisitor,
+    ExpressionNode,
+    ValueProvider,
+    literal,
+    visit,
+)
 from andromede.expression.context_adder import add_component_context
+from andromede.expression.dependencies import (
+    ComponentParameterKey,
+    ParameterDependencies,
+    parameter_dependencies,
+)
 from andromede.expression.indexing import IndexingStructureProvider, compute_indexation
 from andromede.expression.indexing_structure import IndexingStructure
 from andromede.expression.operators_expansion import ProblemDimensions, expand_operators
@@ -32,8 +57,20 @@ from andromede.expression.port_resolver import PortFieldKey, resolve_port
 from andromede.model.common import ValueType
 from andromede.model.constraint import Constraint
 from andromede.model.port import PortFieldId
+from andromede.model.variable import Variable
+from andromede.simulation.backend import (
+    SCIPY_HIGHS,
+    ORToolsBackend,
+    SolverBackend,
+    SparseRows,
+    SparseRowsBuilder,
+)
 from andromede.simulation.linear_expression import LinearExpression, Term
 from andromede.simulation.linearize import ParameterGetter, linearize_expression
+from andromede.simulation.presolve import PresolveBackend
+from andromede.simulation.registry import IndexLayout, IndexRegistry
+from andromede.simulation.solution import gather_arrays, scatter_arrays
+from andromede.simulation.solver_config import SolverConfig
 from andromede.simulation.strategy import (
     MergedProblemStrategy,
     ModelSelectionStrategy,
@@ -41,8 +78,8 @@ from andromede.simulation.strategy import (
     UniformRisk,
 )
 from andromede.simulation.time_block import TimeBlock
-from andromede.study.data import DataBase
-from andromede.study.network import Component, Network
+from andromede.study.data import AbstractDataStructure, DataBase
+from andromede.study.network import Component, Network, Node, PortRef
 from andromede.utils import get_or_add
 
 
@@ -58,6 +95,20 @@ class TimestepComponentVariableKey:
     scenario: Optional[int] = None
 
 
+@dataclass(eq=True, frozen=True)
+class TimestepComponentConstraintKey:
+    """
+    Identifies the solver constraint for one timestep and one component constraint.
+
+    Constraints which do not depend on time or scenario have index 0.
+    """
+
+    component_id: str
+    constraint_name: str
+    block_timestep: int
+    scenario: int
+
+
 def _get_parameter_value(
     context: "OptimizationContext",
     block_timestep: Optional[int],
@@ -170,6 +221,9 @@ class OptimizationContext:
         risk_strategy: RiskManagementStrategy = UniformRisk(),
         decision_tree_node: str = "",
         use_full_var_name: bool = True,
+        backend: Optional[SolverBackend] = None,
+        anonymous_names: bool = False,
+        scenario_weights: Optional[Sequence[float]] = None,
     ):
         self._network = network
         self._database = database
@@ -180,12 +234,30 @@ class OptimizationContext:
         self._risk_strategy = risk_strategy
         self._tree_node = decision_tree_node
         self._full_var_name = use_full_var_name
+        self._backend = backend
+        self._anonymous_names = anonymous_names
+        self._scenario_weights = scenario_weights
 
-        self._component_variables: Dict[TimestepComponentVariableKey, lp.Variable] = {}
-        self._solver_variables: Dict[str, SolverVariableInfo] = {}
+        # Solver columns and rows of component variables and constraints
+        self._variable_registry = IndexRegistry()
+        self._constraint_registry = IndexRegistry()
         self._connection_fields_expressions: Dict[
             PortFieldKey, List[ExpressionNode]
         ] = {}
+        # Sums of connection fields expressions, built once for the problem
+        self._connection_fields_sums: Dict[PortFieldKey, ExpressionNode] = {}
+        # Instantiated definitions of port fields, by master component, port and field
+        self._port_definitions: Dict[Tuple[str, str, str], ExpressionNode] = {}
+        # Parts of the problem built for each component, to update them in place
+        self._component_parts: Dict[str, List["_ComponentPart"]] = {}
+        # Parts computed from each parameter, and parameters of each part (by ID)
+        self._parameter_parts: Dict[
+            ComponentParameterKey, Dict[int, "_ComponentPart"]
+        ] = {}
+        self._part_dependencies: Dict[int, ParameterDependencies] = {}
+        # Parameters of time operators, which define the terms of the problem,
+        # with the number of parts using them
+        self._structural_parameters: Dict[ComponentParameterKey, int] = {}
 
         self._constant_value_provider = self._make_constant_value_provider()
         self._indexing_structure_provider = self._make_data_structure_provider()
@@ -195,6 +267,27 @@ class OptimizationContext:
     def network(self) -> Network:
         return self._network
 
+    @property
+    def backend(self) -> SolverBackend:
+        if self._backend is None:
+            raise ValueError("The optimization context has no solver backend")
+        return self._backend
+
+    @property
+    def solver(self) -> lp.Solver:
+        backend = self.backend
+        if not isinstance(backend, ORToolsBackend):
+            raise ValueError("The problem is not held by an OR-Tools solver")
+        return backend.solver
+
+    @property
+    def variable_registry(self) -> IndexRegistry:
+        return self._variable_registry
+
+    @property
+    def constraint_registry(self) -> IndexRegistry:
+        return self._constraint_registry
+
     @property
     def scenarios(self) -> int:
         return self._scenarios
@@ -215,14 +308,30 @@ class OptimizationContext:
     def full_var_name(self) -> bool:
         return self._full_var_name
 
+    @property
+    def anonymous_names(self) -> bool:
+        """
+        If true, solver variables and constraints are created without names,
+        names are generated from the registries when needed.
+        """
+        return self._anonymous_names
+
     def block_length(self) -> int:
         return len(self._block.timesteps)
 
+    @property
+    def block_weight(self) -> float:
+        return self._block.weight
+
     @property
     def connection_fields_expressions(self) -> Dict[PortFieldKey, List[ExpressionNode]]:
         return self._connection_fields_expressions
 
-    # TODO: Need to think about data processing when creating blocks with varying or inequal time steps length (aggregation, sum ?, mean of data ?)
+    @property
+    def connection_fields_sums(self) -> Dict[PortFieldKey, ExpressionNode]:
+        return self._connection_fields_sums
+
+    # Aggregated timesteps are built by andromede.simulation.time_reduction
     def block_timestep_to_absolute_timestep(
         self, block_timestep: Optional[int]
     ) -> Optional[int]:
@@ -249,48 +358,203 @@ class OptimizationContext:
         else:
             raise NotImplementedError
 
-    def get_time_indices(self, index_structure: IndexingStructure) -> Iterable[int]:
+    def get_time_indices(self, index_structure: IndexingStructure) -> Sequence[int]:
         return range(self.block_length()) if index_structure.time else range(1)
 
-    def get_scenario_indices(self, index_structure: IndexingStructure) -> Iterable[int]:
+    def get_scenario_indices(self, index_structure: IndexingStructure) -> Sequence[int]:
         return range(self.scenarios) if index_structure.scenario else range(1)
 
-    def get_component_variable(
+    def get_component_variable_index(
         self,
         block_timestep: Optional[int],
         scenario: Optional[int],
         component_id: str,
         variable_name: str,
-    ) -> lp.Variable:
+    ) -> int:
         if block_timestep is not None:
             block_timestep = self._manage_border_timesteps(block_timestep)
-        return self._component_variables[
-            TimestepComponentVariableKey(
-                component_id, variable_name, block_timestep, scenario
+        return self._variable_registry.index(
+            component_id, variable_name, block_timestep, scenario
+        )
+
+    def get_component_variable(
+        self,
+        block_timestep: Optional[int],
+        scenario: Optional[int],
+        component_id: str,
+        variable_name: str,
+    ) -> lp.Variable:
+        return self.solver.variable(
+            self.get_component_variable_index(
+                block_timestep, scenario, component_id, variable_name
             )
-        ]
+        )
 
     def get_all_component_variables(
         self,
     ) -> Dict[TimestepComponentVariableKey, lp.Variable]:
-        return self._component_variables
+        """
+        All solver variables by component variable, timestep and scenario.
+
+        Intended for export and debugging, variables are looked up by index
+        while building the problem.
+        """
+        solver = self.solver
+        return {
+            TimestepComponentVariableKey(component_id, variable_name, t, s): (
+                solver.variable(index)
+            )
+            for (
+                component_id,
+                variable_name,
+            ), layout in self._variable_registry.layouts()
+            for t, s, index in layout.indices()
+        }
+
+    def register_component_variables(
+        self, component_id: str, model_var_name: str, layout: IndexLayout
+    ) -> None:
+        self._variable_registry.register(component_id, model_var_name, layout)
 
-    def register_component_variable(
+    def get_all_component_constraints(
         self,
-        block_timestep: Optional[int],
-        scenario: Optional[int],
-        component_id: str,
-        model_var_name: str,
-        variable: lp.Variable,
+    ) -> Dict[TimestepComponentConstraintKey, lp.Constraint]:
+        """
+        All solver constraints by component constraint, timestep and scenario.
+
+        Intended for export and debugging.
+        """
+        solver = self.solver
+        return {
+            TimestepComponentConstraintKey(
+                component_id, constraint_name, t or 0, s or 0
+            ): solver.constraint(index)
+            for (
+                component_id,
+                constraint_name,
+            ), layout in self._constraint_registry.layouts()
+            for t, s, index in layout.indices()
+        }
+
+    def register_component_constraints(
+        self, component_id: str, model_constraint_name: str, layout: IndexLayout
     ) -> None:
-        key = TimestepComponentVariableKey(
-            component_id, model_var_name, block_timestep, scenario
-        )
-        if key not in self._component_variables:
-            self._solver_variables[variable.name()] = SolverVariableInfo(
-                variable.name(), len(self._solver_variables), False
+        self._constraint_registry.register(component_id, model_constraint_name, layout)
+
+    def register_component_part(
+        self, part: "_ComponentPart", dependencies: ParameterDependencies
+    ) -> None:
+        get_or_add(self._component_parts, part.component_id, lambda: []).append(part)
+        self.set_part_dependencies(part, dependencies)
+
+    def set_part_dependencies(
+        self, part: "_ComponentPart", dependencies: ParameterDependencies
+    ) -> None:
+        """
+        Registers the parameters a part is computed from, in place of previous ones.
+        """
+        self._unregister_part_dependencies(part)
+        if not dependencies.all:
+            return
+        self._part_dependencies[id(part)] = dependencies
+        for key in dependencies.time_bounds:
+            self._structural_parameters[key] = (
+                self._structural_parameters.get(key, 0) + 1
             )
-        self._component_variables[key] = variable
+        for key in dependencies.values:
+            get_or_add(self._parameter_parts, key, lambda: {})[id(part)] = part
+
+    def _unregister_part_dependencies(self, part: "_ComponentPart") -> None:
+        dependencies = self._part_dependencies.pop(id(part), None)
+        if dependencies is None:
+            return
+        for key in dependencies.time_bounds:
+            self._structural_parameters[key] -= 1
+            if not self._structural_parameters[key]:
+                del self._structural_parameters[key]
+        for key in dependencies.values:
+            parts = self._parameter_parts[key]
+            del parts[id(part)]
+            if not parts:
+                del self._parameter_parts[key]
+
+    def component_parts(self, component_id: str) -> List["_ComponentPart"]:
+        return self._component_parts.get(component_id, [])
+
+    def remove_component_parts(self, component_id: str) -> List["_ComponentPart"]:
+        parts = self._component_parts.pop(component_id, [])
+        for part in parts:
+            self._unregister_part_dependencies(part)
+        return parts
+
+    def parameter_parts(
+        self, keys: Iterable[ComponentParameterKey]
+    ) -> List["_ComponentPart"]:
+        """
+        Parts of the problem computed from the parameters, each one once.
+        """
+        parts: Dict[int, _ComponentPart] = {}
+        for key in keys:
+            parts.update(self._parameter_parts.get(key, {}))
+        return list(parts.values())
+
+    @property
+    def structural_parameters(self) -> Set[ComponentParameterKey]:
+        """
+        Parameters used in time operators (shifts, sums ...), which define
+        the terms of the problem rather than its coefficients.
+        """
+        return set(self._structural_parameters)
+
+    def register_component_connections(self, component: Component) -> None:
+        """
+        Registers the expressions of the port fields of the component,
+        from its connections in the network, in place of previous ones.
+        """
+        self._clear_connection_fields(component)
+        port_connections = self._network.get_port_connections(component.id)
+        for port_id, connections in port_connections.items():
+            for cnx in connections:
+                for port_field, master_port in cnx.master_port.items():
+                    self.register_connection_fields_expressions(
+                        component_id=component.id,
+                        port_name=port_id,
+                        field_name=port_field.name,
+                        expression=self._port_definition(master_port, port_field.name),
+                    )
+
+    def unregister_component_connections(self, component: Component) -> None:
+        self._clear_connection_fields(component)
+        for port_name, port in component.model.ports.items():
+            for port_field in port.port_type.fields:
+                self._port_definitions.pop(
+                    (component.id, port_name, port_field.name), None
+                )
+
+    def _clear_connection_fields(self, component: Component) -> None:
+        for port_name, port in component.model.ports.items():
+            for port_field in port.port_type.fields:
+                key = PortFieldKey(
+                    component.id, PortFieldId(port_name, port_field.name)
+                )
+                self._connection_fields_expressions.pop(key, None)
+                self._connection_fields_sums.pop(key, None)
+
+    def _port_definition(self, master_port: PortRef, field_name: str) -> ExpressionNode:
+        # A port may be connected to many others, for example the balance
+        # port of a node: definitions of master ports are instantiated once.
+        key = (master_port.component.id, master_port.port_id, field_name)
+        expression = self._port_definitions.get(key)
+        if expression is None:
+            port_definition = master_port.component.model.port_fields_definitions.get(
+                PortFieldId(port_name=master_port.port_id, field_name=field_name)
+            )
+            expression = add_component_context(
+                master_port.component.id,
+                port_definition.definition,  # type: ignore
+            )
+            self._port_definitions[key] = expression
+        return expression
 
     def register_connection_fields_expressions(
         self,
@@ -338,7 +602,9 @@ class OptimizationContext:
         return Impl()
 
     def expand_operators(self, expression: ExpressionNode) -> ExpressionNode:
-        dimensions = ProblemDimensions(self.block_length(), self.scenarios)
+        dimensions = ProblemDimensions(
+            self.block_length(), self.scenarios, self._scenario_weights
+        )
         time_bound_evaluator = self.evaluate_time_bound
         return expand_operators(
             expression,
@@ -440,21 +706,24 @@ def _instantiate_model_expression(
     """
     with_component = add_component_context(component_id, model_expression)
     with_component_and_ports = resolve_port(
-        with_component, component_id, optimization_context.connection_fields_expressions
+        with_component,
+        component_id,
+        optimization_context.connection_fields_expressions,
+        optimization_context.connection_fields_sums,
     )
     return with_component_and_ports
 
 
-def _create_constraint(
-    solver: lp.Solver,
+def _constraint_rows(
     context: OptimizationContext,
     constraint: Constraint,
-) -> None:
+    constraint_indexing: IndexingStructure,
+) -> SparseRows:
     """
-    Adds a component-related constraint to the solver.
+    Rows of a component-related constraint, for all timesteps and scenarios.
     """
     expanded = context.expand_operators(constraint.expression)
-    constraint_indexing = _compute_indexing(context, constraint)
+    rows = SparseRowsBuilder(named=not context.anonymous_names)
 
     for block_timestep in context.get_time_indices(constraint_indexing):
         for scenario in context.get_scenario_indices(constraint_indexing):
@@ -480,40 +749,60 @@ def _create_constraint(
                 expression=linear_expr_at_t,
             )
             make_constraint(
-                solver,
+                rows,
                 context,
                 block_timestep,
                 scenario,
                 constraint_data,
             )
+    return rows.build()
 
 
-def _create_objective(
-    solver: lp.Solver,
-    opt_context: OptimizationContext,
-    component: Component,
-    objective_contribution: ExpressionNode,
+def _create_constraint(
+    backend: SolverBackend, context: OptimizationContext, part: "_ConstraintRows"
 ) -> None:
-    instantiated_expr = _instantiate_model_expression(
-        objective_contribution, component.id, opt_context
+    """
+    Adds a component-related constraint to the solver.
+    """
+    dependencies = part.instantiate(context)
+    rows = _constraint_rows(context, part.constraint, part.indexing)
+
+    # All timesteps and scenarios of the constraint are added at once
+    offset = backend.add_constraints(rows)
+    context.register_component_constraints(
+        part.component_id,
+        part.model_constraint.name,
+        IndexLayout(
+            offset,
+            len(context.get_time_indices(part.indexing)),
+            len(context.get_scenario_indices(part.indexing)),
+            part.indexing.time,
+            part.indexing.scenario,
+        ),
     )
-    expanded = opt_context.expand_operators(instantiated_expr)
-    linear_expr = opt_context.linearize_expression(expanded)
-
-    obj: lp.Objective = solver.Objective()
-    for term in linear_expr.terms.values():
-        solver_var = _get_solver_var(
-            term,
-            opt_context,
-        )
-        opt_context._solver_variables[solver_var.name()].is_in_objective = True
-        obj.SetCoefficient(
-            solver_var,
-            obj.GetCoefficient(solver_var) + term.coefficient,
-        )
+    if part.keep_rows:
+        part.rows = rows
+    context.register_component_part(part, dependencies)
+
+
+def _objective_terms(
+    context: OptimizationContext, expression: ExpressionNode
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Solver columns, coefficients and constant of an objective contribution.
+    """
+    expanded = context.expand_operators(expression)
+    linear_expr = context.linearize_expression(expanded)
 
-    # This should have no effect on the optimization
-    obj.SetOffset(linear_expr.constant + obj.offset())
+    terms = linear_expr.terms.values()
+    return (
+        np.array(
+            [_get_solver_var_index(term, context) for term in terms],
+            dtype=np.int64,
+        ),
+        np.array([term.coefficient for term in terms], dtype=float),
+        linear_expr.constant,
+    )
 
 
 @dataclass
@@ -524,11 +813,11 @@ class ConstraintData:
     expression: LinearExpression
 
 
-def _get_solver_var(
+def _get_solver_var_index(
     term: Term,
     context: OptimizationContext,
-) -> lp.Variable:
-    return context.get_component_variable(
+) -> int:
+    return context.get_component_variable_index(
         term.time_index,
         term.scenario_index,
         term.component_id,
@@ -536,81 +825,274 @@ def _get_solver_var(
     )
 
 
+def _solver_constraint_name(
+    constraint_name: str, block_timestep: Optional[int], scenario: Optional[int]
+) -> str:
+    return f"{constraint_name}_t{block_timestep or 0}_s{scenario or 0}"
+
+
 def make_constraint(
-    solver: lp.Solver,
+    rows: SparseRowsBuilder,
     context: OptimizationContext,
     block_timestep: int,
     scenario: int,
     data: ConstraintData,
 ) -> None:
     """
-    Adds constraint to the solver.
+    Adds constraint to the rows to be added to the solver.
+    """
+    constraint_name = (
+        ""
+        if context.anonymous_names
+        else _solver_constraint_name(data.name, block_timestep, scenario)
+    )
+
+    terms = data.expression.terms.values()
+    constant = data.expression.constant
+    rows.add_row(
+        data.lower_bound - constant,
+        data.upper_bound - constant,
+        [_get_solver_var_index(term, context) for term in terms],
+        [term.coefficient for term in terms],
+        constraint_name,
+    )
+
+
+def _changed_coefficients(
+    previous: SparseRows, rows: SparseRows, columns_count: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rows (relative to the block), columns and values of the coefficients
+    which differ between two versions of a block of rows.
+    Coefficients of columns removed from rows are zero.
     """
-    constraint_name = f"{data.name}_t{block_timestep}_s{scenario}"
 
-    solver_constraint: lp.Constraint = solver.Constraint(constraint_name)
-    constant: float = 0
-    for term in data.expression.terms.values():
-        solver_var = _get_solver_var(
-            term,
-            context,
+    def summed(block: SparseRows) -> Tuple[np.ndarray, np.ndarray]:
+        block_rows = np.repeat(np.arange(block.size), np.diff(block.starts))
+        keys, positions = np.unique(
+            block_rows * columns_count + block.indices, return_inverse=True
         )
-        coefficient = term.coefficient + solver_constraint.GetCoefficient(solver_var)
-        solver_constraint.SetCoefficient(solver_var, coefficient)
+        return keys, np.bincount(
+            positions, weights=block.coefficients, minlength=len(keys)
+        )
+
+    previous_keys, previous_values = summed(previous)
+    keys, values = summed(rows)
+    all_keys = np.union1d(previous_keys, keys)
+    all_previous_values = np.zeros(len(all_keys))
+    all_previous_values[np.searchsorted(all_keys, previous_keys)] = previous_values
+    all_values = np.zeros(len(all_keys))
+    all_values[np.searchsorted(all_keys, keys)] = values
 
-    constant += data.expression.constant
-    solver_constraint.SetBounds(
-        data.lower_bound - constant, data.upper_bound - constant
+    changed = all_values != all_previous_values
+    return (
+        all_keys[changed] // columns_count,
+        all_keys[changed] % columns_count,
+        all_values[changed],
     )
 
 
+class _ComponentPart(ABC):
+    """
+    Part of the problem built for a component: bounds of a variable, rows
+    of a constraint or objective terms.
+
+    It is computed again and patched in the backend when the parameters
+    it depends on, or the connections of the component, change.
+    """
+
+    component_id: str
+
+    @abstractmethod
+    def instantiate(self, context: OptimizationContext) -> ParameterDependencies:
+        """
+        Instantiates the model expressions of the part with the current
+        connections of the component, returns the parameters they use.
+        """
+        ...
+
+    @abstractmethod
+    def update(self, problem: "OptimizationProblem") -> None:
+        """
+        Computes the part again and patches it in the backend.
+        """
+        ...
+
+    def prepare_reconnection(self, problem: "OptimizationProblem") -> None:
+        """
+        Keeps what is needed to patch the part once connections have changed.
+        """
+
+    def remove(self, problem: "OptimizationProblem") -> None:
+        """
+        Removes the contribution of the part to the problem.
+        """
+
+
+@dataclass(eq=False)
+class _VariableBounds(_ComponentPart):
+    component_id: str
+    variable: Variable
+    lower_bound: Optional[ExpressionNode] = None
+    upper_bound: Optional[ExpressionNode] = None
+
+    def instantiate(self, context: OptimizationContext) -> ParameterDependencies:
+        if self.variable.lower_bound:
+            self.lower_bound = _instantiate_model_expression(
+                self.variable.lower_bound, self.component_id, context
+            )
+        if self.variable.upper_bound:
+            self.upper_bound = _instantiate_model_expression(
+                self.variable.upper_bound, self.component_id, context
+            )
+        return parameter_dependencies(
+            *(e for e in [self.lower_bound, self.upper_bound] if e)
+        )
+
+    def update(self, problem: "OptimizationProblem") -> None:
+        layout = problem.context.variable_registry.layout(
+            self.component_id, self.variable.name
+        )
+        lower_bounds, upper_bounds = problem._variable_bounds(
+            self.component_id, self.variable, self.lower_bound, self.upper_bound
+        )
+        problem.backend.set_variable_bounds(
+            np.arange(layout.offset, layout.offset + layout.size),
+            lower_bounds,
+            upper_bounds,
+        )
+
+
+@dataclass(eq=False)
+class _ConstraintRows(_ComponentPart):
+    """
+    Rows are only kept when coefficients depend on parameters, or while
+    connections change, to find changed coefficients. Otherwise only bounds
+    are updated.
+    """
+
+    component_id: str
+    model_constraint: Constraint
+    constraint: Constraint = field(init=False)
+    indexing: IndexingStructure = field(init=False)
+    keep_rows: bool = field(init=False, default=False)
+    rows: Optional[SparseRows] = field(init=False, default=None)
+
+    def instantiated(self, context: OptimizationContext) -> Constraint:
+        return Constraint(
+            name=f"{self.component_id}_{self.model_constraint.name}",
+            expression=_instantiate_model_expression(
+                self.model_constraint.expression, self.component_id, context
+            ),
+            lower_bound=_instantiate_model_expression(
+                self.model_constraint.lower_bound, self.component_id, context
+            ),
+            upper_bound=_instantiate_model_expression(
+                self.model_constraint.upper_bound, self.component_id, context
+            ),
+        )
+
+    def instantiate(self, context: OptimizationContext) -> ParameterDependencies:
+        self.constraint = self.instantiated(context)
+        self.indexing = _compute_indexing(context, self.constraint)
+        self.keep_rows = bool(parameter_dependencies(self.constraint.expression).values)
+        return parameter_dependencies(
+            self.constraint.expression,
+            self.constraint.lower_bound,
+            self.constraint.upper_bound,
+        )
+
+    def _rows(self, problem: "OptimizationProblem") -> np.ndarray:
+        layout = problem.context.constraint_registry.layout(
+            self.component_id, self.model_constraint.name
+        )
+        return np.arange(layout.offset, layout.offset + layout.size)
+
+    def update(self, problem: "OptimizationProblem") -> None:
+        context, backend = problem.context, problem.backend
+        indices = self._rows(problem)
+        rows = _constraint_rows(context, self.constraint, self.indexing)
+        backend.set_constraint_bounds(indices, rows.lower_bounds, rows.upper_bounds)
+        if self.rows is not None:
+            changed_rows, columns, values = _changed_coefficients(
+                self.rows, rows, backend.num_variables()
+            )
+            backend.set_coefficients(indices[changed_rows], columns, values)
+        self.rows = rows if self.keep_rows else None
+
+    def prepare_reconnection(self, problem: "OptimizationProblem") -> None:
+        if self.rows is None:
+            self.rows = _constraint_rows(
+                problem.context, self.constraint, self.indexing
+            )
+
+    def remove(self, problem: "OptimizationProblem") -> None:
+        # Rows are kept in the backend, without bounds
+        indices = self._rows(problem)
+        problem.backend.set_constraint_bounds(
+            indices,
+            np.full(len(indices), -math.inf),
+            np.full(len(indices), math.inf),
+        )
+
+
+@dataclass(eq=False)
+class _ObjectiveTerms(_ComponentPart):
+    component_id: str
+    contribution: ExpressionNode
+    expression: ExpressionNode = field(init=False)
+    indices: np.ndarray = field(
+        init=False, default_factory=lambda: np.empty(0, dtype=np.int64)
+    )
+    coefficients: np.ndarray = field(init=False, default_factory=lambda: np.empty(0))
+    constant: float = field(init=False, default=0.0)
+
+    def instantiate(self, context: OptimizationContext) -> ParameterDependencies:
+        self.expression = _instantiate_model_expression(
+            self.contribution, self.component_id, context
+        )
+        return parameter_dependencies(self.expression)
+
+    def update(self, problem: "OptimizationProblem") -> None:
+        indices, coefficients, constant = _objective_terms(
+            problem.context, self.expression
+        )
+        # Objective terms are summed: previous terms are removed with their opposite
+        problem.backend.add_objective(
+            np.concatenate([self.indices, indices]),
+            np.concatenate([-self.coefficients, coefficients]),
+            constant - self.constant,
+        )
+        self.indices, self.coefficients, self.constant = indices, coefficients, constant
+
+    def remove(self, problem: "OptimizationProblem") -> None:
+        problem.backend.add_objective(self.indices, -self.coefficients, -self.constant)
+
+
 class OptimizationProblem:
     name: str
-    solver: lp.Solver
+    backend: SolverBackend
     context: OptimizationContext
 
     def __init__(
         self,
         name: str,
-        solver: lp.Solver,
+        backend: SolverBackend,
         opt_context: OptimizationContext,
     ) -> None:
         self.name = name
-        self.solver = solver
+        self.backend = backend
         self.context = opt_context
 
-        self._register_connection_fields_definitions()
-        self._create_variables()
-        self._create_constraints()
-        self._create_objectives()
-
-    def _register_connection_fields_definitions(self) -> None:
-        for cnx in self.context.network.connections:
-            for field_name in list(cnx.master_port.keys()):
-                master_port = cnx.master_port[field_name]
-                port_definition = (
-                    master_port.component.model.port_fields_definitions.get(
-                        PortFieldId(
-                            port_name=master_port.port_id, field_name=field_name.name
-                        )
-                    )
-                )
-                expression_node = port_definition.definition  # type: ignore
-                instantiated_expression = add_component_context(
-                    master_port.component.id, expression_node
-                )
-                self.context.register_connection_fields_expressions(
-                    component_id=cnx.port1.component.id,
-                    port_name=cnx.port1.port_id,
-                    field_name=field_name.name,
-                    expression=instantiated_expression,
-                )
-                self.context.register_connection_fields_expressions(
-                    component_id=cnx.port2.component.id,
-                    port_name=cnx.port2.port_id,
-                    field_name=field_name.name,
-                    expression=instantiated_expression,
-                )
+        network = self.context.network
+        for component in network.all_components:
+            self.context.register_component_connections(component)
+        for component in network.all_components:
+            self._create_variables(component)
+        for component in network.all_components:
+            self._create_constraints(component)
+        for component in network.all_components:
+            self._create_objectives(component)
 
     def _solver_variable_name(
         self, component_id: str, var_name: str, t: Optional[int], s: Optional[int]
@@ -638,120 +1120,457 @@ class OptimizationProblem:
             f"{tree_prefix}{component_prefix}{var_name}{block_suffix}{scenario_suffix}"
         )
 
-    def _create_variables(self) -> None:
-        for component in self.context.network.all_components:
-            model = component.model
+    def _variable_indices(
+        self, variable: Variable
+    ) -> Tuple[Sequence[Optional[int]], Sequence[Optional[int]]]:
+        """
+        Timesteps and scenarios of the solver variables of a model variable,
+        None when it is not indexed on time or scenario.
+        """
+        var_indexing = variable.structure
+        time_indices: Sequence[Optional[int]] = [None]
+        if var_indexing.is_time_varying():
+            time_indices = self.context.get_time_indices(var_indexing)
 
-            for model_var in self.context.build_strategy.get_variables(model):
-                var_indexing = model_var.structure
-                instantiated_lb_expr = None
-                instantiated_ub_expr = None
+        scenario_indices: Sequence[Optional[int]] = [None]
+        if var_indexing.is_scenario_varying():
+            scenario_indices = self.context.get_scenario_indices(var_indexing)
+        return time_indices, scenario_indices
 
-                if model_var.lower_bound:
-                    instantiated_lb_expr = _instantiate_model_expression(
-                        model_var.lower_bound, component.id, self.context
-                    )
-                if model_var.upper_bound:
-                    instantiated_ub_expr = _instantiate_model_expression(
-                        model_var.upper_bound, component.id, self.context
-                    )
+    def _variable_bounds(
+        self,
+        component_id: str,
+        variable: Variable,
+        lower_bound_expr: Optional[ExpressionNode],
+        upper_bound_expr: Optional[ExpressionNode],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bounds of the solver variables of a component variable,
+        by timestep then by scenario.
+        """
+        lower_bounds: List[float] = []
+        upper_bounds: List[float] = []
+        for t, s in itertools.product(*self._variable_indices(variable)):
+            lower_bound = -math.inf
+            upper_bound = math.inf
+            if lower_bound_expr:
+                lower_bound = _compute_expression_value(
+                    lower_bound_expr, self.context, t, s
+                )
+            if upper_bound_expr:
+                upper_bound = _compute_expression_value(
+                    upper_bound_expr, self.context, t, s
+                )
 
-                time_indices: Iterable[Optional[int]] = [None]
-                if var_indexing.is_time_varying():
-                    time_indices = self.context.get_time_indices(var_indexing)
+            if lower_bound > upper_bound:
+                solver_var_name = self._solver_variable_name(
+                    component_id, variable.name, t, s
+                )
+                raise ValueError(
+                    f"Upper bound ({upper_bound}) must be strictly greater than lower bound ({lower_bound}) for variable {solver_var_name}"
+                )
 
-                scenario_indices: Iterable[Optional[int]] = [None]
-                if var_indexing.is_scenario_varying():
-                    scenario_indices = self.context.get_scenario_indices(var_indexing)
+            if variable.data_type == ValueType.BOOLEAN:
+                lower_bound, upper_bound = 0, 1
+            lower_bounds.append(lower_bound)
+            upper_bounds.append(upper_bound)
+        return (
+            np.array(lower_bounds, dtype=float),
+            np.array(upper_bounds, dtype=float),
+        )
 
-                for t, s in itertools.product(time_indices, scenario_indices):
-                    lower_bound = -self.solver.infinity()
-                    upper_bound = self.solver.infinity()
-                    if instantiated_lb_expr:
-                        lower_bound = _compute_expression_value(
-                            instantiated_lb_expr, self.context, t, s
-                        )
-                    if instantiated_ub_expr:
-                        upper_bound = _compute_expression_value(
-                            instantiated_ub_expr, self.context, t, s
-                        )
+    def _create_variables(self, component: Component) -> None:
+        for model_var in self.context.build_strategy.get_variables(component.model):
+            var_indexing = model_var.structure
+            part = _VariableBounds(component.id, model_var)
+            dependencies = part.instantiate(self.context)
 
-                    solver_var_name = self._solver_variable_name(
-                        component.id, model_var.name, t, s
-                    )
+            # Variables are created consecutively, by timestep then by scenario
+            time_indices, scenario_indices = self._variable_indices(model_var)
+            lower_bounds, upper_bounds = self._variable_bounds(
+                component.id, model_var, part.lower_bound, part.upper_bound
+            )
+            names: Optional[List[str]] = None
+            if not self.context.anonymous_names:
+                names = [
+                    self._solver_variable_name(component.id, model_var.name, t, s)
+                    for t, s in itertools.product(time_indices, scenario_indices)
+                ]
+
+            offset = self.backend.add_variables(
+                lower_bounds,
+                upper_bounds,
+                model_var.data_type != ValueType.CONTINUOUS,
+                names,
+            )
+            self.context.register_component_variables(
+                component.id,
+                model_var.name,
+                IndexLayout(
+                    offset,
+                    len(time_indices),
+                    len(scenario_indices),
+                    var_indexing.is_time_varying(),
+                    var_indexing.is_scenario_varying(),
+                ),
+            )
+            if part.lower_bound or part.upper_bound:
+                self.context.register_component_part(part, dependencies)
+
+    def _create_constraints(self, component: Component) -> None:
+        for constraint in self.context.build_strategy.get_constraints(component.model):
+            _create_constraint(
+                self.backend,
+                self.context,
+                _ConstraintRows(component.id, constraint),
+            )
 
-                    if lower_bound > upper_bound:
-                        raise ValueError(
-                            f"Upper bound ({upper_bound}) must be strictly greater than lower bound ({lower_bound}) for variable {solver_var_name}"
-                        )
+    def _create_objectives(self, component: Component) -> None:
+        model = component.model
+        weight = self.context.block_weight
+        for objective in self.context.build_strategy.get_objectives(model):
+            if objective is not None:
+                if objective is model.objective_operational_contribution and (
+                    weight != 1
+                ):
+                    # Timesteps of the block represent several timesteps
+                    objective = literal(weight) * objective
+                part = _ObjectiveTerms(
+                    component.id, self.context.risk_strategy(objective)
+                )
+                dependencies = part.instantiate(self.context)
+                # Terms are added as a difference with the (empty) previous terms
+                part.update(self)
+                self.context.register_component_part(part, dependencies)
 
-                    if model_var.data_type == ValueType.BOOLEAN:
-                        solver_var = self.solver.BoolVar(
-                            solver_var_name,
-                        )
-                    elif model_var.data_type == ValueType.INTEGER:
-                        solver_var = self.solver.IntVar(
-                            lower_bound,
-                            upper_bound,
-                            solver_var_name,
-                        )
-                    else:
-                        solver_var = self.solver.NumVar(
-                            lower_bound,
-                            upper_bound,
-                            solver_var_name,
-                        )
-                    self.context.register_component_variable(
-                        t, s, component.id, model_var.name, solver_var
-                    )
+    @property
+    def solver(self) -> lp.Solver:
+        """
+        The OR-Tools solver holding the problem,
+        only for problems built with an OR-Tools solver.
+        """
+        return self.context.solver
 
-    def _create_constraints(self) -> None:
-        for component in self.context.network.all_components:
-            for constraint in self.context.build_strategy.get_constraints(
-                component.model
-            ):
-                instantiated_expr = _instantiate_model_expression(
-                    constraint.expression, component.id, self.context
-                )
-                instantiated_lb = _instantiate_model_expression(
-                    constraint.lower_bound, component.id, self.context
-                )
-                instantiated_ub = _instantiate_model_expression(
-                    constraint.upper_bound, component.id, self.context
+    def solve(self) -> int:
+        """
+        Solves the problem, returns the OR-Tools status of the solution.
+        """
+        return self.backend.solve()
+
+    def objective_value(self) -> float:
+        return self.backend.objective_value()
+
+    def update_parameters(
+        self, data: Mapping[ComponentParameterKey, AbstractDataStructure]
+    ) -> None:
+        """
+        Replaces the data of parameters, by component ID and parameter name,
+        in the database, and updates the problem in place: only the bounds,
+        coefficients and objective terms computed from those parameters are
+        computed again and replaced in the solver.
+
+        Other problems built from the same database are not updated.
+        Parameters used in time operators (shifts, sums ...) define which
+        terms the problem is made of: the problem must be built again
+        when they change.
+        """
+        structural = sorted(data.keys() & self.context.structural_parameters)
+        if structural:
+            raise ValueError(
+                f"Parameters {structural} define the structure of the problem, "
+                "it must be built again"
+            )
+        for (component_id, parameter_name), parameter_data in data.items():
+            self._check_parameter_data(
+                self.context.network.get_component(component_id),
+                parameter_name,
+                parameter_data,
+            )
+
+        for (component_id, parameter_name), parameter_data in data.items():
+            self.context.database.add_data(component_id, parameter_name, parameter_data)
+        for part in self.context.parameter_parts(data.keys()):
+            part.update(self)
+
+    def _check_parameter_data(
+        self, component: Component, parameter_name: str, data: AbstractDataStructure
+    ) -> None:
+        structure = component.model.parameters[parameter_name].structure
+        if not data.check_requirement(structure.time, structure.scenario):
+            raise ValueError(
+                f"Data inconsistency for component: {component.id}, "
+                f"parameter: {parameter_name}. Requirement not met."
+            )
+
+    def add_component(
+        self, component: Component, connections: Iterable[Tuple[PortRef, PortRef]] = ()
+    ) -> None:
+        """
+        Adds a component (or a node) to the network of the problem, with its
+        connections to components of the network, and builds it in place:
+        its variables, constraints and objective terms are added, and the
+        parts of connected components which use their ports (for example
+        the balance constraints of nodes) are updated.
+
+        Data of its parameters must already be in the database.
+        Other components are not built again.
+        """
+        network = self.context.network
+        if network.has_component(component.id):
+            raise ValueError(f"Component {component.id} is already in the network")
+        connections = list(connections)
+        for port1, port2 in connections:
+            if port1.component is not component and port2.component is not component:
+                raise ValueError(
+                    f"Connection between {port1.component.id} and "
+                    f"{port2.component.id} does not involve {component.id}"
                 )
+        for parameter in component.model.parameters.values():
+            self._check_parameter_data(
+                component,
+                parameter.name,
+                self.context.database.get_data(component.id, parameter.name),
+            )
+
+        if isinstance(component, Node):
+            network.add_node(component)
+        else:
+            network.add_component(component)
+        for port1, port2 in connections:
+            network.connect(port1, port2)
+        neighbors = _connected_components(network, component.id)
+        try:
+            parts = self._prepare_reconnection(neighbors)
+            self.context.register_component_connections(component)
+        except ValueError:
+            network.remove_component(component.id)
+            self.context.unregister_component_connections(component)
+            for neighbor in neighbors:
+                self.context.register_component_connections(neighbor)
+            raise
+
+        self._create_variables(component)
+        self._create_constraints(component)
+        self._create_objectives(component)
+        self._reconnect(parts)
+
+    def remove_component(self, component_id: str) -> None:
+        """
+        Removes a component (or a node) and its connections from the network
+        of the problem, and from the problem in place: the parts of connected
+        components which used its ports are updated, and its own part of the
+        problem is deactivated.
+
+        Solver variables and constraints of the component are not deleted:
+        variables are fixed to 0, constraints are left without bounds and
+        objective terms are removed. They are no longer part of the outputs.
+        """
+        network = self.context.network
+        component = network.get_component(component_id)
+        neighbors = _connected_components(network, component_id)
+        removed_connections = network.remove_component(component_id)
+        try:
+            parts = self._prepare_reconnection(neighbors)
+        except ValueError:
+            if isinstance(component, Node):
+                network.add_node(component)
+            else:
+                network.add_component(component)
+            for connection in removed_connections:
+                network.connect(connection.port1, connection.port2)
+            for neighbor in neighbors:
+                self.context.register_component_connections(neighbor)
+            raise
+        self.context.unregister_component_connections(component)
+        self._reconnect(parts)
+
+        for part in self.context.remove_component_parts(component_id):
+            part.remove(self)
+        registry = self.context.variable_registry
+        for model_var in self.context.build_strategy.get_variables(component.model):
+            layout = registry.unregister(component_id, model_var.name)
+            columns = np.arange(layout.offset, layout.offset + layout.size)
+            zeros = np.zeros(layout.size)
+            self.backend.set_variable_bounds(columns, zeros, zeros)
+        for constraint in self.context.build_strategy.get_constraints(component.model):
+            self.context.constraint_registry.unregister(component_id, constraint.name)
+
+    def _prepare_reconnection(
+        self, components: Sequence[Component]
+    ) -> List[_ComponentPart]:
+        """
+        Registers the expressions of the ports of the components from their
+        current connections, and returns their parts, ready to be patched.
 
-                instantiated_constraint = Constraint(
-                    name=f"{component.id}_{constraint.name}",
-                    expression=instantiated_expr,
-                    lower_bound=instantiated_lb,
-                    upper_bound=instantiated_ub,
+        Raises a ValueError if rows of constraints would be indexed differently,
+        port expressions are then left unchanged.
+        """
+        parts = [
+            part
+            for component in components
+            for part in self.context.component_parts(component.id)
+        ]
+        for part in parts:
+            part.prepare_reconnection(self)
+        for component in components:
+            self.context.register_component_connections(component)
+        for part in parts:
+            if isinstance(part, _ConstraintRows):
+                indexing = _compute_indexing(
+                    self.context, part.instantiated(self.context)
                 )
-                _create_constraint(
-                    self.solver,
-                    self.context,
-                    instantiated_constraint,
+                if indexing != part.indexing:
+                    raise ValueError(
+                        f"Constraint {part.constraint.name} would be indexed "
+                        "differently, the problem must be built again"
+                    )
+        return parts
+
+    def _reconnect(self, parts: Iterable[_ComponentPart]) -> None:
+        for part in parts:
+            self.context.set_part_dependencies(part, part.instantiate(self.context))
+            part.update(self)
+
+    def set_hint(self, arrays: Iterable[Tuple[str, str, np.ndarray]]) -> None:
+        """
+        Gives a starting point to the next solves, from the values of
+        component variables, for example of a previous solution:
+
+            problem.set_hint(OutputValues(previous_problem).variable_arrays())
+
+        Values are (scenarios, timesteps) arrays, by component ID and variable
+        name. Unknown variables and NaN values are skipped, and only common
+        scenarios and timesteps are used when shapes differ.
+        Hints are mostly useful to MIP solvers, to find a first solution.
+        """
+        indices, values = scatter_arrays(self.context.variable_registry, arrays)
+        self.backend.set_hint(indices, values)
+
+    def duals(self) -> Dict[Tuple[str, str], np.ndarray]:
+        """
+        Dual values of component constraints in the last solution,
+        as (scenarios, timesteps) arrays indexed by component ID and constraint name.
+
+        The dual values of balance constraints are the marginal prices,
+        weighted by the probability of their scenario in the objective.
+        Empty if the solver provides no dual values, for example for MIP problems.
+        """
+        duals = self.backend.dual_values()
+        if duals is None:
+            return {}
+        return gather_arrays(self.context.constraint_registry, duals)
+
+    def reduced_costs(self) -> Dict[Tuple[str, str], np.ndarray]:
+        """
+        Reduced costs of component variables in the last solution,
+        as (scenarios, timesteps) arrays indexed by component ID and variable name.
+
+        Empty if the solver provides no reduced costs, for example for MIP problems.
+        """
+        reduced_costs = self.backend.reduced_costs()
+        if reduced_costs is None:
+            return {}
+        return gather_arrays(self.context.variable_registry, reduced_costs)
+
+    def solver_variables(self) -> Iterator[SolverVariableInfo]:
+        """
+        Name, column and presence in the objective of all solver variables.
+        """
+        names = self.variable_names()
+        in_objective = (self.backend.objective_coefficients() != 0).tolist()
+        for index, name in enumerate(names):
+            yield SolverVariableInfo(name, index, in_objective[index])
+
+    def variable_names(self) -> List[str]:
+        """
+        Names of the solver variables, by column.
+
+        When the problem was built with anonymous names, names of component
+        variables are generated from the variable registry.
+        """
+        names = self.backend.variable_names()
+        if not self.context.anonymous_names:
+            return names
+        for (
+            component_id,
+            var_name,
+        ), layout in self.context.variable_registry.layouts():
+            for t, s, index in layout.indices():
+                names[index] = self._solver_variable_name(component_id, var_name, t, s)
+        return names
+
+    def constraint_names(self) -> List[str]:
+        """
+        Names of the solver constraints, by row.
+
+        When the problem was built with anonymous names, names of component
+        constraints are generated from the constraint registry.
+        """
+        names = self.backend.constraint_names()
+        if not self.context.anonymous_names:
+            return names
+        for (
+            component_id,
+            constraint_name,
+        ), layout in self.context.constraint_registry.layouts():
+            for t, s, index in layout.indices():
+                names[index] = _solver_constraint_name(
+                    f"{component_id}_{constraint_name}", t, s
                 )
+        return names
 
-    def _create_objectives(self) -> None:
-        for component in self.context.network.all_components:
-            model = component.model
-
-            for objective in self.context.build_strategy.get_objectives(model):
-                if objective is not None:
-                    _create_objective(
-                        self.solver,
-                        self.context,
-                        component,
-                        self.context.risk_strategy(objective),
-                    )
+    def export_as_proto(self) -> linear_solver_pb2.MPModelProto:
+        """
+        The problem as a protocol buffer, with the names of variables and constraints.
+        """
+        model = self.backend.export_as_proto()
+        if self.context.anonymous_names:
+            for variable, name in zip(model.variable, self.variable_names()):
+                variable.name = name
+            for constraint, name in zip(model.constraint, self.constraint_names()):
+                constraint.name = name
+        return model
 
     def export_as_mps(self) -> str:
+        if self.context.anonymous_names or not isinstance(self.backend, ORToolsBackend):
+            return lp.ExportModelAsMpsFormat(self.export_as_proto())
         return self.solver.ExportModelAsMpsFormat(fixed_format=True, obfuscated=False)
 
     def export_as_lp(self) -> str:
+        if self.context.anonymous_names or not isinstance(self.backend, ORToolsBackend):
+            return lp.ExportModelAsLpFormat(self.export_as_proto())
         return self.solver.ExportModelAsLpFormat(obfuscated=False)
 
 
+def _connected_components(network: Network, component_id: str) -> List[Component]:
+    """
+    Other components connected to the ports of the component, each one once.
+    """
+    components: Dict[str, Component] = {}
+    for connections in network.get_port_connections(component_id).values():
+        for connection in connections:
+            for port in [connection.port1, connection.port2]:
+                if port.component.id != component_id:
+                    components.setdefault(port.component.id, port.component)
+    return list(components.values())
+
+
+def create_backend(solver_id: str) -> SolverBackend:
+    """
+    Backend for the solver ID: SCIPY_HIGHS for HiGHS through scipy,
+    otherwise the ID of an OR-Tools linear solver.
+    """
+    if solver_id == SCIPY_HIGHS:
+        # Only imported when needed, as scipy is slow to import
+        from andromede.simulation.scipy_backend import ScipyHighsBackend
+
+        return ScipyHighsBackend()
+    solver = lp.Solver.CreateSolver(solver_id)
+    if solver is None:
+        raise ValueError(f"Solver {solver_id} is not available")
+    return ORToolsBackend(solver)
+
+
 def build_problem(
     network: Network,
     database: DataBase,
@@ -765,11 +1584,60 @@ def build_problem(
     risk_strategy: RiskManagementStrategy = UniformRisk(),
     decision_tree_node: str = "",
     use_full_var_name: bool = True,
+    anonymous_names: bool = False,
+    backend: Optional[SolverBackend] = None,
+    solver_config: Optional[SolverConfig] = None,
+    build_presolve: bool = False,
+    aggregate_variables: bool = False,
+    scenario_weights: Optional[Sequence[float]] = None,
 ) -> OptimizationProblem:
     """
     Entry point to build the optimization problem for a time period.
+
+    With anonymous_names, solver variables and constraints are created
+    without names, which saves time and memory when names are not needed.
+    They are still generated for exports (see OptimizationProblem.variable_names).
+
+    With solver_id SCIPY_HIGHS, no OR-Tools object is created: the problem
+    is held as sparse matrices and solved by HiGHS through scipy.
+
+    Another solver backend may be given, the problem is then built in this
+    (empty) backend and solver_id is ignored.
+
+    The solver configuration (threads, time limit ...) is applied to the
+    backend, it can be changed later with problem.backend.configure.
+
+    With build_presolve, the problem is presolved at each solve before it is
+    loaded in the solver, see PresolveBackend. This presolve is independent
+    of the presolve of the solver (SolverConfig.presolve). With
+    aggregate_variables, the presolve also eliminates variables tied to
+    another variable by an equality constraint, such as port flows.
+
+    scenario_weights are the probabilities of the scenarios in expectations,
+    they are uniform by default.
     """
-    solver: lp.Solver = lp.Solver.CreateSolver(solver_id)
+    if scenario_weights is not None and (
+        len(scenario_weights) != scenarios
+        or min(scenario_weights) < 0
+        or not math.isclose(sum(scenario_weights), 1)
+    ):
+        raise ValueError(
+            f"Scenario weights must be {scenarios} non-negative probabilities "
+            f"summing to one, got {list(scenario_weights)}"
+        )
+    if build_presolve or aggregate_variables:
+        if backend is not None:
+            raise ValueError(
+                "build_presolve creates its own backend, "
+                "use a PresolveBackend to presolve with another backend"
+            )
+        backend = PresolveBackend(
+            lambda: create_backend(solver_id), aggregate=aggregate_variables
+        )
+    if backend is None:
+        backend = create_backend(solver_id)
+    if solver_config is not None:
+        backend.configure(solver_config)
 
     database.requirements_consistency(network)
 
@@ -783,9 +1651,36 @@ def build_problem(
         risk_strategy,
         decision_tree_node,
         use_full_var_name,
+        backend,
+        anonymous_names,
+        scenario_weights,
     )
 
-    return OptimizationProblem(problem_name, solver, opt_context)
+    return OptimizationProblem(problem_name, backend, opt_context)
+
+
+def solve_problems(
+    problems: Sequence[OptimizationProblem],
+    *,
+    solver_config: SolverConfig = SolverConfig(),
+    cores: Optional[int] = None,
+) -> List[int]:
+    """
+    Solves independent problems concurrently, returns their statuses.
+
+    The cores (by default, all the cores available to the process) are shared
+    between concurrent solves and solver threads, see
+    SolverConfig.for_concurrent_solves. All problems are configured with
+    the resulting solver configuration.
+    """
+    if not problems:
+        return []
+    jobs, config = solver_config.for_concurrent_solves(len(problems), cores)
+    for problem in problems:
+        problem.backend.configure(config)
+    # Solvers release the GIL while solving
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(OptimizationProblem.solve, problems))
 
 
 def fusion_problems(
@@ -804,38 +1699,30 @@ def fusion_problems(
 
     # We stock the coupler's variables to check for
     # same name variables in the masters
-    for var in root_master.solver.variables():
-        root_vars[var.name()] = var
+    for var, var_name in zip(
+        root_master.solver.variables(), root_master.variable_names()
+    ):
+        root_vars[var_name] = var
 
     for master in masters:
-        context = master.context
         objective = master.solver.Objective()
+        constraint_names = master.constraint_names()
 
-        for var in master.solver.variables():
+        for var, var_name in zip(master.solver.variables(), master.variable_names()):
             # If variable not already in coupler, we add it
             # Otherwise we update its upper and lower bounds
-            if var.name() not in root_vars:
-                root_var = root_master.solver.NumVar(var.lb(), var.ub(), var.name())
-                root_master.context._solver_variables[var.name()] = SolverVariableInfo(
-                    var.name(),
-                    len(root_master.context._solver_variables),
-                    context._solver_variables[var.name()].is_in_objective,
-                )
+            if var_name not in root_vars:
+                root_var = root_master.solver.NumVar(var.lb(), var.ub(), var_name)
             else:
-                root_var = root_vars[var.name()]
+                root_var = root_vars[var_name]
                 root_var.SetLb(var.lb())
                 root_var.SetUb(var.ub())
-                root_master.context._solver_variables[
-                    var.name()
-                ].is_in_objective = context._solver_variables[
-                    var.name()
-                ].is_in_objective
 
             for cstr in master.solver.constraints():
                 coeff = cstr.GetCoefficient(var)
                 # If variable present in constraint, we add the constraint to root
                 if coeff != 0:
-                    key = f"{master.name}_{cstr.name()}"
+                    key = f"{master.name}_{constraint_names[cstr.index()]}"
                     if key not in root_constraints:
                         root_constraints[key] = root_master.solver.Constraint(
                             cstr.Lb(), cstr.Ub(), key
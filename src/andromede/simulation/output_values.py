@@ -15,10 +15,23 @@ Util class to obtain solver results
 """
 import math
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Mapping, Optional, Tuple, TypeVar, Union, cast
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+import numpy as np
 
 from andromede.simulation.optimization import OptimizationProblem
-from andromede.study.data import TimeScenarioIndex
+from andromede.simulation.solution import gather_arrays
 
 
 @dataclass
@@ -35,12 +48,12 @@ class OutputValues:
         'scenario_only_var': [s1, s2],
         'time_scenario_var': [[t1s1, t2s1, t3s1], [t1s2, t2s2, t3s2]]
 
-        Internally, the _value attribute will be a dict mapping TimeScenarioIndex(t,s) to float
+        Internally, values are stored in a (scenarios, timesteps) array,
+        values which have not been set are NaN.
         """
 
         _name: str
-        _value: Dict[TimeScenarioIndex, float] = field(init=False, default_factory=dict)
-        _size: Tuple[int, int] = field(init=False, default=(0, 0))
+        _array: np.ndarray = field(init=False, default_factory=lambda: np.empty((0, 0)))
         ignore: bool = field(default=False, init=False)
 
         def __eq__(self, other: object) -> bool:
@@ -48,8 +61,7 @@ class OutputValues:
                 return NotImplemented
             return (self.ignore or other.ignore) or (
                 self._name == other._name
-                and self._size == other._size
-                and self._value == other._value
+                and bool(np.array_equal(self._array, other._array, equal_nan=True))
             )
 
         def is_close(
@@ -59,21 +71,12 @@ class OutputValues:
             rel_tol: float = 1.0e-9,
             abs_tol: float = 0.0,
         ) -> bool:
-            # From the docs in https://docs.python.org/3/library/math.html#math.isclose
-            # math.isclose(a, b) returns abs(a-b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
-            return (self.ignore or other.ignore) or (
-                self._name == other._name
-                and self._size == other._size
-                and self._value.keys() == other._value.keys()
-                and all(
-                    math.isclose(
-                        self._value[key],
-                        other._value[key],
-                        rel_tol=rel_tol,
-                        abs_tol=abs_tol,
-                    )
-                    for key in self._value
-                )
+            if self.ignore or other.ignore:
+                return True
+            if self._name != other._name or self._size != other._size:
+                return False
+            return bool(
+                np.all(_close_mask(self._array, other._array, rel_tol, abs_tol))
             )
 
         def __str__(self) -> str:
@@ -81,58 +84,60 @@ class OutputValues:
                 f"{self._name} : {str(self.value)} {'(ignored)' if self.ignore else ''}"
             )
 
+        @property
+        def _size(self) -> Tuple[int, int]:
+            size_s, size_t = self._array.shape
+            return size_s, size_t
+
+        @property
+        def array(self) -> np.ndarray:
+            """
+            Read-only view of the values, indexed by scenario then timestep.
+            """
+            view = self._array.view()
+            view.flags.writeable = False
+            return view
+
         @property
         def value(self) -> Union[None, float, List[float], List[List[float]]]:
             size_s, size_t = self._size
             if size_t == 1:
                 if size_s == 1:
                     # Constant
-                    return self._value[TimeScenarioIndex(0, 0)]
+                    return float(self._array[0, 0])
                 else:
                     # Scenario-only
-                    return [self._value[TimeScenarioIndex(0, s)] for s in range(size_s)]
+                    return cast(List[float], self._array[:, 0].tolist())
             else:
                 # Either Time-only or Time-Scenario
-                return [
-                    [self._value[TimeScenarioIndex(t, s)] for t in range(size_t)]
-                    for s in range(size_s)
-                ]
+                return cast(List[List[float]], self._array.tolist())
 
         @value.setter
         def value(self, values: Union[float, List[float], List[List[float]]]) -> None:
-            size_s, size_t = 1, 1
-
             if isinstance(values, list):
-                size_s = len(values)
-                for scenario, timesteps in enumerate(values):
-                    if isinstance(timesteps, list):
-                        size_t = len(timesteps)
-                        for timestep, value in enumerate(timesteps):
-                            # Either Time-only or Time-Scenario
-                            self._value[TimeScenarioIndex(timestep, scenario)] = value
-                    else:
-                        # Scenario-only
-                        self._value[TimeScenarioIndex(0, scenario)] = cast(
-                            float, timesteps
-                        )
+                if values and isinstance(values[0], list):
+                    # Either Time-only or Time-Scenario
+                    self._array = np.array(values, dtype=float)
+                else:
+                    # Scenario-only
+                    self._array = np.array(values, dtype=float).reshape(-1, 1)
             else:
                 # Constant
-                self._value[TimeScenarioIndex(0, 0)] = values
-
-            self._size = (size_s, size_t)
+                self._array = np.full((1, 1), values, dtype=float)
 
         def _set(
             self, timestep: Optional[int], scenario: Optional[int], value: float
         ) -> None:
             timestep = 0 if timestep is None else timestep
             scenario = 0 if scenario is None else scenario
-            key = TimeScenarioIndex(timestep, scenario)
-            if key not in self._value:
-                size_s = max(self._size[0], scenario + 1)
-                size_t = max(self._size[1], timestep + 1)
-                self._size = (size_s, size_t)
-
-            self._value[key] = value
+            size_s, size_t = self._size
+            if scenario >= size_s or timestep >= size_t:
+                array = np.full(
+                    (max(size_s, scenario + 1), max(size_t, timestep + 1)), np.nan
+                )
+                array[:size_s, :size_t] = self._array
+                self._array = array
+            self._array[scenario, timestep] = value
 
     @dataclass
     class Component:
@@ -192,6 +197,41 @@ class OutputValues:
             self._components, other._components, rel_tol, abs_tol
         )
 
+    def diff(
+        self, other: "OutputValues", *, rel_tol: float = 1.0e-9, abs_tol: float = 0.0
+    ) -> "OutputValuesDiff":
+        """
+        Detailed differences with other values, with the same tolerances
+        and the same handling of ignored components and variables as is_close.
+        """
+        only_in_lhs: List[str] = []
+        only_in_rhs: List[str] = []
+        variables: List[VariableDiff] = []
+        _collect_missing(self._components, other._components, "", only_in_lhs)
+        _collect_missing(other._components, self._components, "", only_in_rhs)
+        for component_id in self._components.keys() & other._components.keys():
+            lhs, rhs = self._components[component_id], other._components[component_id]
+            if lhs.ignore or rhs.ignore:
+                continue
+            prefix = f"{component_id}."
+            _collect_missing(lhs._variables, rhs._variables, prefix, only_in_lhs)
+            _collect_missing(rhs._variables, lhs._variables, prefix, only_in_rhs)
+            for variable_name in lhs._variables.keys() & rhs._variables.keys():
+                variable_diff = _variable_diff(
+                    component_id,
+                    lhs._variables[variable_name],
+                    rhs._variables[variable_name],
+                    rel_tol,
+                    abs_tol,
+                )
+                if variable_diff is not None:
+                    variables.append(variable_diff)
+
+        variables.sort(
+            key=lambda d: (-d.max_abs_error, d.component_id, d.variable_name)
+        )
+        return OutputValuesDiff(sorted(only_in_lhs), sorted(only_in_rhs), variables)
+
     def __str__(self) -> str:
         string = "\n"
         for comp in self._components.values():
@@ -203,22 +243,180 @@ class OutputValues:
         if self.problem is None:
             return
 
-        for key, value in self.problem.context.get_all_component_variables().items():
-            (
-                self.component(key.component_id)
-                .var(str(key.variable_name))
-                ._set(key.block_timestep, key.scenario, value.solution_value())
-            )
+        # Values of all solver variables are fetched at once,
+        # then grouped by component variable.
+        values = self.problem.backend.variable_values()
+        arrays = gather_arrays(self.problem.context.variable_registry, values)
+        for (component_id, variable_name), array in arrays.items():
+            self.component(component_id).var(variable_name)._array = array
 
     def component(self, component_id: str) -> "OutputValues.Component":
         if component_id not in self._components:
             self._components[component_id] = OutputValues.Component(component_id)
         return self._components[component_id]
 
+    def variable_arrays(self) -> Iterator[Tuple[str, str, np.ndarray]]:
+        """
+        Component ID, variable name and values of all variables.
+        """
+        for component_id, component in self._components.items():
+            for variable_name, variable in component._variables.items():
+                yield component_id, variable_name, variable.array
+
 
 Comparable = TypeVar("Comparable", OutputValues.Component, OutputValues.Variable)
 
 
+def _close_mask(
+    lhs: np.ndarray, rhs: np.ndarray, rel_tol: float, abs_tol: float
+) -> np.ndarray:
+    """
+    Element-wise equivalent of math.isclose, values which are not set
+    (NaN) are only close to values which are not set either.
+    """
+    # math.isclose(a, b) returns abs(a-b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
+    with np.errstate(invalid="ignore"):
+        tolerance = np.maximum(rel_tol * np.maximum(np.abs(lhs), np.abs(rhs)), abs_tol)
+        return (
+            (lhs == rhs)
+            | (np.isnan(lhs) & np.isnan(rhs))
+            | (np.abs(lhs - rhs) <= tolerance)
+        )
+
+
+@dataclass(frozen=True)
+class VariableDiff:
+    """
+    Differences between the values of a variable in two outputs.
+
+    Errors are infinite when values cannot be compared: different shapes,
+    or values set on one side only. The worst index is the (scenario, timestep) position of
+    the largest absolute error, it is None when shapes differ.
+    """
+
+    component_id: str
+    variable_name: str
+    lhs_shape: Tuple[int, int]
+    rhs_shape: Tuple[int, int]
+    mismatch_count: int
+    max_abs_error: float
+    max_rel_error: float
+    worst_index: Optional[Tuple[int, int]]
+
+    def __str__(self) -> str:
+        name = f"{self.component_id}.{self.variable_name}"
+        if self.worst_index is None:
+            return f"{name}: shapes differ, {self.lhs_shape} != {self.rhs_shape}"
+        scenario, timestep = self.worst_index
+        return (
+            f"{name}: {self.mismatch_count} values differ, "
+            f"max abs error {self.max_abs_error:g} "
+            f"(scenario {scenario}, timestep {timestep}), "
+            f"max rel error {self.max_rel_error:g}"
+        )
+
+
+@dataclass(frozen=True)
+class OutputValuesDiff:
+    """
+    Differences between two outputs, as returned by OutputValues.diff.
+
+    Components and variables present in only one output are given
+    as "component" or "component.variable" names. Variable differences
+    are sorted by decreasing absolute error.
+    """
+
+    only_in_lhs: List[str] = field(default_factory=list)
+    only_in_rhs: List[str] = field(default_factory=list)
+    variables: List[VariableDiff] = field(default_factory=list)
+
+    @property
+    def is_close(self) -> bool:
+        return not (self.only_in_lhs or self.only_in_rhs or self.variables)
+
+    @property
+    def max_abs_error(self) -> float:
+        return max((d.max_abs_error for d in self.variables), default=0.0)
+
+    @property
+    def max_rel_error(self) -> float:
+        return max((d.max_rel_error for d in self.variables), default=0.0)
+
+    def __str__(self) -> str:
+        if self.is_close:
+            return "No differences"
+        string = ""
+        for name in self.only_in_lhs:
+            string += f"{name}: only in left-hand side\n"
+        for name in self.only_in_rhs:
+            string += f"{name}: only in right-hand side\n"
+        for variable_diff in self.variables:
+            string += f"{variable_diff}\n"
+        return string
+
+
+def _collect_missing(
+    lhs: Mapping[str, Comparable],
+    rhs: Mapping[str, Comparable],
+    prefix: str,
+    missing: List[str],
+) -> None:
+    missing.extend(
+        f"{prefix}{key}" for key in lhs.keys() - rhs.keys() if not lhs[key].ignore
+    )
+
+
+def _variable_diff(
+    component_id: str,
+    lhs: OutputValues.Variable,
+    rhs: OutputValues.Variable,
+    rel_tol: float,
+    abs_tol: float,
+) -> Optional[VariableDiff]:
+    """
+    Differences between the values of the variable, None if all are close.
+    """
+    if lhs.ignore or rhs.ignore:
+        return None
+    lhs_array, rhs_array = lhs._array, rhs._array
+    if lhs_array.shape != rhs_array.shape:
+        return VariableDiff(
+            component_id,
+            lhs._name,
+            lhs._size,
+            rhs._size,
+            max(lhs_array.size, rhs_array.size),
+            math.inf,
+            math.inf,
+            None,
+        )
+
+    close = _close_mask(lhs_array, rhs_array, rel_tol, abs_tol)
+    mismatch_count = int(close.size - np.count_nonzero(close))
+    if mismatch_count == 0:
+        return None
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        abs_errors = np.where(close, 0.0, np.abs(lhs_array - rhs_array))
+        rel_errors = abs_errors / np.maximum(np.abs(lhs_array), np.abs(rhs_array))
+    abs_errors[np.isnan(abs_errors)] = np.inf
+    rel_errors[np.isnan(rel_errors)] = np.inf
+    rel_errors[close] = 0.0
+    worst_scenario, worst_timestep = np.unravel_index(
+        np.argmax(abs_errors), abs_errors.shape
+    )
+    return VariableDiff(
+        component_id,
+        lhs._name,
+        lhs._size,
+        rhs._size,
+        mismatch_count,
+        float(abs_errors.max()),
+        float(rel_errors.max()),
+        (int(worst_scenario), int(worst_timestep)),
+    )
+
+
 def _are_mappings_close(
     lhs: Mapping[str, Comparable],
     rhs: Mapping[str, Comparable],
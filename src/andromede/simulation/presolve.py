@@ -0,0 +1,761 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Presolve of built problems, before they are loaded in the solver.
+
+Every row of every constraint is built, even when it is empty for some
+timesteps, and columns keep their place in the variable registry even
+when they are fixed. Presolve removes from the problem given to the solver:
+ - empty rows, after checking that they are feasible, and rows without bounds,
+ - fixed columns, whose values are substituted in the bounds of rows
+   and in the objective,
+ - singleton rows, which become bounds of their column,
+ - duplicate rows (equal up to a factor), whose bounds are intersected,
+ - optionally, columns defined by another column with an equality row of
+   two columns, which are substituted in the other rows (aggregation).
+
+Reductions are applied again until none is found. Solutions of the
+presolved problem are then mapped back to all columns and rows (postsolve).
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+
+from andromede.simulation.backend import SolverBackend, SparseRows
+from andromede.simulation.matrix_backend import MatrixBackend
+
+# Absolute tolerance on the feasibility of removed rows and of bounds
+_TOLERANCE = 1e-9
+
+Entries = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+@dataclass(frozen=True)
+class _SingletonRows:
+    rows: np.ndarray
+
+
+@dataclass(frozen=True)
+class _DuplicateRows:
+    # Rows kept in place of their duplicates
+    rows: np.ndarray
+
+
+@dataclass(frozen=True)
+class _AggregatedColumns:
+    """
+    Columns eliminated with the equality rows of two columns:
+    columns = scales * kept + constants.
+    """
+
+    rows: np.ndarray
+    columns: np.ndarray
+    kept: np.ndarray
+    scales: np.ndarray
+    constants: np.ndarray
+    # Coefficients of the eliminated columns in their rows
+    coefficients: np.ndarray
+
+
+_Reduction = Union[_SingletonRows, _DuplicateRows, _AggregatedColumns]
+
+
+@dataclass
+class PresolvedProblem:
+    """
+    Problem left by the presolve, and what is needed to map its solutions back.
+
+    Columns and rows are the indices, in the whole problem, of the columns
+    and rows of the presolved problem. The offset is the objective constant
+    of the fixed and eliminated columns, to be added to the one of the whole
+    problem. The problem is not feasible when the presolve found that it is
+    infeasible, the other fields are then not meaningful.
+    """
+
+    feasible: bool
+    columns: np.ndarray
+    rows: np.ndarray
+    lower_bounds: np.ndarray
+    upper_bounds: np.ndarray
+    integers: np.ndarray
+    objective: np.ndarray
+    offset: float
+    constraints: SparseRows
+    # Whole problem, with duplicate coefficients summed, and values of fixed columns
+    _matrix: Entries = field(repr=False)
+    _objective: np.ndarray = field(repr=False)
+    _values: np.ndarray = field(repr=False)
+    # Reductions, in order, and the rows which set the bounds of columns and rows
+    _reductions: List[_Reduction] = field(repr=False)
+    _column_lower_sources: np.ndarray = field(repr=False)
+    _column_upper_sources: np.ndarray = field(repr=False)
+    _source_coefficients: np.ndarray = field(repr=False)
+    _row_lower_sources: np.ndarray = field(repr=False)
+    _row_lower_scales: np.ndarray = field(repr=False)
+    _row_upper_sources: np.ndarray = field(repr=False)
+    _row_upper_scales: np.ndarray = field(repr=False)
+
+    def variable_values(self, values: np.ndarray) -> np.ndarray:
+        """
+        Values of all columns, from the values of the presolved columns.
+        """
+        all_values = self._values.copy()
+        all_values[self.columns] = values
+        for reduction in reversed(self._reductions):
+            if isinstance(reduction, _AggregatedColumns):
+                all_values[reduction.columns] = (
+                    reduction.scales * all_values[reduction.kept] + reduction.constants
+                )
+        return all_values
+
+    def dual_values(self, duals: np.ndarray) -> np.ndarray:
+        """
+        Dual values of all rows, from the dual values of the presolved rows.
+
+        Dual values of removed rows are zero, except for the rows which
+        set an active bound: duplicate rows, singleton rows which take
+        the reduced costs of their column, and rows of eliminated columns.
+        """
+        all_duals = np.zeros(len(self._row_lower_sources))
+        all_duals[self.rows] = duals
+        for index in reversed(range(len(self._reductions))):
+            reduction = self._reductions[index]
+            if isinstance(reduction, _DuplicateRows):
+                self._move_duals(all_duals, reduction.rows)
+                continue
+            if isinstance(reduction, _AggregatedColumns):
+                # Eliminated columns have no reduced cost
+                reduced_costs = self._stage_reduced_costs(all_duals, index)
+                all_duals[reduction.rows] = (
+                    reduced_costs[reduction.columns] / reduction.coefficients
+                )
+            self._move_reduced_costs(all_duals, reduction.rows, index)
+        return all_duals
+
+    def reduced_costs(self, all_duals: np.ndarray) -> np.ndarray:
+        """
+        Reduced costs of all columns, from the dual values of all rows.
+        """
+        rows, columns, values = self._matrix
+        return self._objective - np.bincount(
+            columns, weights=values * all_duals[rows], minlength=len(self._objective)
+        )
+
+    def _stage_reduced_costs(self, all_duals: np.ndarray, index: int) -> np.ndarray:
+        """
+        Reduced costs of the columns of the problem when a reduction was
+        applied: columns eliminated before are part of their kept column.
+        """
+        reduced_costs = self.reduced_costs(all_duals)
+        for reduction in self._reductions[:index]:
+            if isinstance(reduction, _AggregatedColumns):
+                np.add.at(
+                    reduced_costs,
+                    reduction.kept,
+                    reduction.scales * reduced_costs[reduction.columns],
+                )
+        return reduced_costs
+
+    def _move_reduced_costs(
+        self, all_duals: np.ndarray, rows: np.ndarray, index: int
+    ) -> None:
+        reduced_costs = self._stage_reduced_costs(all_duals, index)
+        for sources, active in [
+            (self._column_lower_sources, reduced_costs > 0),
+            (self._column_upper_sources, reduced_costs < 0),
+        ]:
+            columns = np.flatnonzero(active & np.isin(sources, rows))
+            sources = sources[columns]
+            np.add.at(
+                all_duals,
+                sources,
+                reduced_costs[columns] / self._source_coefficients[sources],
+            )
+
+    def _move_duals(self, all_duals: np.ndarray, rows: np.ndarray) -> None:
+        duals = all_duals[rows]
+        for sources, scales, active in [
+            (self._row_lower_sources, self._row_lower_scales, duals > 0),
+            (self._row_upper_sources, self._row_upper_scales, duals < 0),
+        ]:
+            moved = rows[active & (sources[rows] != rows)]
+            np.add.at(all_duals, sources[moved], all_duals[moved] / scales[moved])
+            all_duals[moved] = 0
+
+
+class _Infeasible(Exception):
+    pass
+
+
+def _summed(
+    rows: np.ndarray, columns: np.ndarray, values: np.ndarray, columns_count: int
+) -> Entries:
+    """
+    Entries sorted by row then by column, duplicate entries summed
+    and zero entries removed.
+    """
+    width = max(columns_count, 1)
+    keys, positions = np.unique(rows * width + columns, return_inverse=True)
+    sums = np.bincount(positions, weights=values, minlength=len(keys))
+    nonzero = sums != 0
+    return keys[nonzero] // width, keys[nonzero] % width, sums[nonzero]
+
+
+def _tightest(
+    targets: np.ndarray, candidates: np.ndarray, current: np.ndarray, larger: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions of the candidate bounds which tighten the current bounds
+    of their target, the tightest one for each target.
+    """
+    keys = candidates if larger else -candidates
+    order = np.lexsort((keys, targets))
+    last = np.r_[targets[order][1:] != targets[order][:-1], True]
+    best = order[last]
+    if larger:
+        tighter = candidates[best] > current[targets[best]]
+    else:
+        tighter = candidates[best] < current[targets[best]]
+    return targets[best[tighter]], best[tighter]
+
+
+def _check_crossing(lower_bounds: np.ndarray, upper_bounds: np.ndarray) -> None:
+    """
+    Raises _Infeasible if some lower bounds are above their upper bound,
+    beyond the tolerance. Lower bounds just above their upper bound are set to it.
+    """
+    above = lower_bounds > upper_bounds
+    if (
+        lower_bounds[above] - upper_bounds[above]
+        > _TOLERANCE * (1 + np.abs(upper_bounds[above]))
+    ).any():
+        raise _Infeasible()
+    lower_bounds[above] = upper_bounds[above]
+
+
+def _bounds(
+    lower_bounds: np.ndarray,
+    upper_bounds: np.ndarray,
+    scales: np.ndarray,
+    integer: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bounds of v such that scales * v is between the bounds,
+    rounded for integer values.
+    """
+    positive = scales > 0
+    lows = np.where(positive, lower_bounds, upper_bounds) / scales
+    highs = np.where(positive, upper_bounds, lower_bounds) / scales
+    if integer is not None:
+        lows[integer] = np.ceil(lows[integer] - _TOLERANCE)
+        highs[integer] = np.floor(highs[integer] + _TOLERANCE)
+    return lows, highs
+
+
+class _Presolver:
+    """
+    Applies reductions to a problem until none is found.
+    """
+
+    def __init__(
+        self,
+        lower_bounds: np.ndarray,
+        upper_bounds: np.ndarray,
+        integers: np.ndarray,
+        objective: np.ndarray,
+        rows: SparseRows,
+        aggregate: bool,
+    ) -> None:
+        self._columns_count, self._rows_count = len(lower_bounds), rows.size
+        self._matrix = _summed(
+            np.repeat(np.arange(self._rows_count), np.diff(rows.starts)),
+            rows.indices,
+            rows.coefficients,
+            self._columns_count,
+        )
+        self._entries = self._matrix
+        self._original_objective = np.asarray(objective, dtype=float)
+        self._objective = self._original_objective.copy()
+        self._integers = np.asarray(integers, dtype=bool)
+        self._aggregate = aggregate
+
+        self._lower_bounds = np.array(lower_bounds, dtype=float)
+        self._upper_bounds = np.array(upper_bounds, dtype=float)
+        self._row_lower_bounds = np.array(rows.lower_bounds, dtype=float)
+        self._row_upper_bounds = np.array(rows.upper_bounds, dtype=float)
+        self._active_columns = np.ones(self._columns_count, dtype=bool)
+        self._active_rows = np.ones(self._rows_count, dtype=bool)
+        self._values = np.zeros(self._columns_count)
+        self._offset = 0.0
+
+        self._reductions: List[_Reduction] = []
+        self._column_lower_sources = np.full(self._columns_count, -1)
+        self._column_upper_sources = np.full(self._columns_count, -1)
+        self._source_coefficients = np.ones(self._rows_count)
+        self._row_lower_sources = np.arange(self._rows_count)
+        self._row_upper_sources = np.arange(self._rows_count)
+        self._row_lower_scales = np.ones(self._rows_count)
+        self._row_upper_scales = np.ones(self._rows_count)
+        # Random weights of columns, to hash rows
+        self._weights = np.random.default_rng(0).random((2, self._columns_count))
+
+    def run(self) -> PresolvedProblem:
+        try:
+            changed = True
+            while changed:
+                changed = self._fix_columns()
+                changed |= self._remove_rows()
+                changed |= self._merge_duplicate_rows()
+                if self._aggregate:
+                    changed |= self._aggregate_columns()
+        except _Infeasible:
+            return self._result(False)
+        return self._result(True)
+
+    def _keep_entries(self, kept: np.ndarray) -> None:
+        rows, columns, values = self._entries
+        self._entries = rows[kept], columns[kept], values[kept]
+
+    def _counts(self) -> np.ndarray:
+        return np.bincount(self._entries[0], minlength=self._rows_count)
+
+    def _shift_rows(self, rows: np.ndarray, shifts: np.ndarray) -> None:
+        shifts = np.bincount(rows, weights=shifts, minlength=self._rows_count)
+        self._row_lower_bounds -= shifts
+        self._row_upper_bounds -= shifts
+
+    def _fix_columns(self) -> bool:
+        """
+        Substitutes the values of fixed columns.
+        """
+        fixed = self._active_columns & (self._lower_bounds == self._upper_bounds)
+        if not fixed.any():
+            return False
+        values = self._lower_bounds
+        self._values[fixed] = values[fixed]
+        self._offset += float(self._objective[fixed] @ values[fixed])
+        rows, columns, coefficients = self._entries
+        in_fixed = fixed[columns]
+        self._shift_rows(
+            rows[in_fixed], coefficients[in_fixed] * values[columns[in_fixed]]
+        )
+        self._keep_entries(~in_fixed)
+        self._active_columns[fixed] = False
+        return True
+
+    def _remove_rows(self) -> bool:
+        """
+        Removes empty rows, rows without bounds, and singleton rows
+        which become bounds of their column.
+        """
+        counts = self._counts()
+        lower_bounds, upper_bounds = self._row_lower_bounds, self._row_upper_bounds
+        empty = self._active_rows & (counts == 0)
+        if (lower_bounds[empty] > _TOLERANCE).any() or (
+            upper_bounds[empty] < -_TOLERANCE
+        ).any():
+            raise _Infeasible()
+        free = np.isneginf(lower_bounds) & np.isposinf(upper_bounds)
+        removed = empty | (self._active_rows & free)
+
+        singletons = self._active_rows & ~removed & (counts == 1)
+        if singletons.any():
+            rows, columns, coefficients = self._entries
+            in_singletons = singletons[rows]
+            rows = rows[in_singletons]
+            columns = columns[in_singletons]
+            coefficients = coefficients[in_singletons]
+            lows, highs = _bounds(
+                lower_bounds[rows],
+                upper_bounds[rows],
+                coefficients,
+                self._integers[columns],
+            )
+            self._tighten_columns(rows, columns, coefficients, lows, highs)
+            self._reductions.append(_SingletonRows(rows))
+            removed |= singletons
+
+        if not removed.any():
+            return False
+        self._active_rows[removed] = False
+        self._keep_entries(~removed[self._entries[0]])
+        return True
+
+    def _tighten_columns(
+        self,
+        rows: np.ndarray,
+        columns: np.ndarray,
+        coefficients: np.ndarray,
+        lows: np.ndarray,
+        highs: np.ndarray,
+    ) -> None:
+        """
+        Tightens the bounds of columns with the bounds implied by rows,
+        in which they have the coefficients.
+        """
+        tightened, best = _tightest(columns, lows, self._lower_bounds, larger=True)
+        self._lower_bounds[tightened] = lows[best]
+        self._column_lower_sources[tightened] = rows[best]
+        tightened, best = _tightest(columns, highs, self._upper_bounds, larger=False)
+        self._upper_bounds[tightened] = highs[best]
+        self._column_upper_sources[tightened] = rows[best]
+        self._source_coefficients[rows] = coefficients
+        _check_crossing(self._lower_bounds, self._upper_bounds)
+
+    def _merge_duplicate_rows(self) -> bool:
+        """
+        Merges rows equal up to a factor.
+
+        Duplicate rows have the same hashes of their coefficients,
+        divided by their first one. Candidates are then compared.
+        """
+        rows, columns, values = self._entries
+        counts = self._counts()
+        starts = np.searchsorted(rows, np.arange(self._rows_count + 1))
+        candidates = np.flatnonzero(self._active_rows & (counts >= 2))
+        pivots = np.ones(self._rows_count)
+        pivots[candidates] = values[starts[candidates]]
+        normalized = values / pivots[rows]
+        hashes = [
+            np.bincount(
+                rows,
+                weights=column_weights[columns] * normalized,
+                minlength=self._rows_count,
+            )[candidates]
+            for column_weights in self._weights
+        ]
+        order = np.lexsort((candidates, hashes[1], hashes[0], counts[candidates]))
+        candidates = candidates[order]
+        same = (
+            (counts[candidates[1:]] == counts[candidates[:-1]])
+            & (hashes[0][order][1:] == hashes[0][order][:-1])
+            & (hashes[1][order][1:] == hashes[1][order][:-1])
+        )
+        # Candidates of a group are sorted by row, the first one is kept
+        heads = np.r_[True, ~same][: len(candidates)]
+        groups = np.cumsum(heads) - 1
+        members = np.flatnonzero(~heads)
+        duplicates: List[int] = []
+        originals: List[int] = []
+        for row, original in zip(
+            candidates[members].tolist(),
+            candidates[heads][groups[members]].tolist(),
+        ):
+            row_slice = slice(starts[row], starts[row + 1])
+            original_slice = slice(starts[original], starts[original + 1])
+            if np.array_equal(
+                columns[row_slice], columns[original_slice]
+            ) and np.array_equal(normalized[row_slice], normalized[original_slice]):
+                duplicates.append(row)
+                originals.append(original)
+        if not duplicates:
+            return False
+
+        duplicate_rows = np.array(duplicates)
+        original_rows = np.array(originals)
+        # Duplicate rows are their original row times the scale
+        scales = pivots[duplicate_rows] / pivots[original_rows]
+        lows, highs = _bounds(
+            self._row_lower_bounds[duplicate_rows],
+            self._row_upper_bounds[duplicate_rows],
+            scales,
+        )
+        tightened, best = _tightest(
+            original_rows, lows, self._row_lower_bounds, larger=True
+        )
+        self._row_lower_bounds[tightened] = lows[best]
+        self._row_lower_sources[tightened] = duplicate_rows[best]
+        self._row_lower_scales[tightened] = scales[best]
+        tightened, best = _tightest(
+            original_rows, highs, self._row_upper_bounds, larger=False
+        )
+        self._row_upper_bounds[tightened] = highs[best]
+        self._row_upper_sources[tightened] = duplicate_rows[best]
+        self._row_upper_scales[tightened] = scales[best]
+        _check_crossing(self._row_lower_bounds, self._row_upper_bounds)
+
+        self._reductions.append(_DuplicateRows(np.unique(original_rows)))
+        self._active_rows[duplicate_rows] = False
+        self._keep_entries(self._active_rows[rows])
+        return True
+
+    def _aggregate_columns(self) -> bool:
+        """
+        Eliminates a column of each equality row of two columns,
+        column = scale * kept + constant, by substitution.
+
+        Integer columns are only eliminated when the other column is integer,
+        the scale is 1 or -1 and the constant is integer. Columns with fewer
+        finite bounds are eliminated first. A column is eliminated, or kept,
+        for one row at most by pass.
+        """
+        rows, columns, values = self._entries
+        counts = self._counts()
+        candidates = np.flatnonzero(
+            self._active_rows
+            & (counts == 2)
+            & (self._row_lower_bounds == self._row_upper_bounds)
+        )
+        if not len(candidates):
+            return False
+        first = np.searchsorted(rows, candidates)
+        second = first + 1
+        finite_bounds = (
+            2 * self._integers
+            + np.isfinite(self._lower_bounds)
+            + np.isfinite(self._upper_bounds)
+        )
+        swap = finite_bounds[columns[second]] < finite_bounds[columns[first]]
+        eliminated = np.where(swap, columns[second], columns[first])
+        kept = np.where(swap, columns[first], columns[second])
+        eliminated_coefficients = np.where(swap, values[second], values[first])
+        kept_coefficients = np.where(swap, values[first], values[second])
+        scales = -kept_coefficients / eliminated_coefficients
+        constants = self._row_lower_bounds[candidates] / eliminated_coefficients
+        allowed = ~self._integers[eliminated] | (
+            self._integers[kept]
+            & (np.abs(scales) == 1)
+            & (constants == np.round(constants))
+        )
+
+        used = np.zeros(self._columns_count, dtype=bool).tolist()
+        selected: List[int] = []
+        for position in np.flatnonzero(allowed).tolist():
+            column, other = int(eliminated[position]), int(kept[position])
+            if not (used[column] or used[other]):
+                used[column] = used[other] = True
+                selected.append(position)
+        if not selected:
+            return False
+        reduction = _AggregatedColumns(
+            candidates[selected],
+            eliminated[selected],
+            kept[selected],
+            scales[selected],
+            constants[selected],
+            eliminated_coefficients[selected],
+        )
+        self._reductions.append(reduction)
+
+        # Bounds of eliminated columns become bounds of kept columns
+        lows, highs = _bounds(
+            self._lower_bounds[reduction.columns] - reduction.constants,
+            self._upper_bounds[reduction.columns] - reduction.constants,
+            reduction.scales,
+            self._integers[reduction.kept],
+        )
+        self._tighten_columns(
+            reduction.rows,
+            reduction.kept,
+            kept_coefficients[selected],
+            lows,
+            highs,
+        )
+
+        costs = self._objective[reduction.columns]
+        self._offset += float(costs @ reduction.constants)
+        np.add.at(self._objective, reduction.kept, reduction.scales * costs)
+        self._objective[reduction.columns] = 0
+
+        self._active_rows[reduction.rows] = False
+        self._active_columns[reduction.columns] = False
+        positions = np.full(self._columns_count, -1)
+        positions[reduction.columns] = np.arange(len(selected))
+        substituted = (positions[columns] >= 0) & self._active_rows[rows]
+        aggregated = positions[columns[substituted]]
+        self._shift_rows(
+            rows[substituted], values[substituted] * reduction.constants[aggregated]
+        )
+        kept_entries = (positions[columns] < 0) & self._active_rows[rows]
+        self._entries = _summed(
+            np.concatenate([rows[kept_entries], rows[substituted]]),
+            np.concatenate([columns[kept_entries], reduction.kept[aggregated]]),
+            np.concatenate(
+                [
+                    values[kept_entries],
+                    values[substituted] * reduction.scales[aggregated],
+                ]
+            ),
+            self._columns_count,
+        )
+        return True
+
+    def _result(self, feasible: bool) -> PresolvedProblem:
+        kept_columns = np.flatnonzero(self._active_columns)
+        kept_rows = np.flatnonzero(self._active_rows)
+        column_positions = np.full(self._columns_count, -1)
+        column_positions[kept_columns] = np.arange(len(kept_columns))
+        row_positions = np.full(self._rows_count, -1)
+        row_positions[kept_rows] = np.arange(len(kept_rows))
+        rows, columns, values = self._entries
+        starts = np.zeros(len(kept_rows) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(row_positions[rows], minlength=len(kept_rows)),
+            out=starts[1:],
+        )
+        return PresolvedProblem(
+            feasible=feasible,
+            columns=kept_columns,
+            rows=kept_rows,
+            lower_bounds=self._lower_bounds[kept_columns],
+            upper_bounds=self._upper_bounds[kept_columns],
+            integers=self._integers[kept_columns],
+            objective=self._objective[kept_columns],
+            offset=self._offset,
+            constraints=SparseRows(
+                starts,
+                column_positions[columns],
+                values,
+                self._row_lower_bounds[kept_rows],
+                self._row_upper_bounds[kept_rows],
+            ),
+            _matrix=self._matrix,
+            _objective=self._original_objective,
+            _values=self._values,
+            _reductions=self._reductions,
+            _column_lower_sources=self._column_lower_sources,
+            _column_upper_sources=self._column_upper_sources,
+            _source_coefficients=self._source_coefficients,
+            _row_lower_sources=self._row_lower_sources,
+            _row_lower_scales=self._row_lower_scales,
+            _row_upper_sources=self._row_upper_sources,
+            _row_upper_scales=self._row_upper_scales,
+        )
+
+
+def presolve(
+    lower_bounds: np.ndarray,
+    upper_bounds: np.ndarray,
+    integers: np.ndarray,
+    objective: np.ndarray,
+    rows: SparseRows,
+    aggregate: bool = False,
+) -> PresolvedProblem:
+    """
+    Presolves a problem given as arrays. Coefficients of a column which
+    appears several times in a row are summed.
+
+    With aggregate, columns tied to another column by an equality row
+    (x = a * y + b, for example port flows defined as other variables)
+    are also eliminated, and computed back from the solution.
+    """
+    return _Presolver(
+        lower_bounds, upper_bounds, integers, objective, rows, aggregate
+    ).run()
+
+
+class PresolveBackend(MatrixBackend):
+    """
+    Problem held as arrays, presolved at each solve, then loaded in a new
+    backend of the solver and solved.
+
+    The problem is built and updated in place as with other backends,
+    presolve does not change the columns and rows of the problem: solutions
+    are mapped back to all of them. As each solve loads the presolved problem
+    in a new solver, solves do not restart from the previous basis,
+    solution hints of presolved columns are still given to the solver.
+    Solver configurations are checked when they are applied to the new
+    backend, at each solve.
+    """
+
+    def __init__(
+        self, create_backend: Callable[[], SolverBackend], aggregate: bool = False
+    ) -> None:
+        super().__init__()
+        self._create_backend = create_backend
+        self._aggregate = aggregate
+        self._presolved: Optional[PresolvedProblem] = None
+        self._solved: Optional[SolverBackend] = None
+
+    @property
+    def presolved(self) -> Optional[PresolvedProblem]:
+        """
+        The problem presolved at the last solve.
+        """
+        return self._presolved
+
+    def solve(self) -> int:
+        presolved = presolve(
+            self.lower_bounds(),
+            self.upper_bounds(),
+            self.integers(),
+            self.objective_coefficients(),
+            self.constraint_rows(),
+            self._aggregate,
+        )
+        self._presolved, self._solved = presolved, None
+        if not presolved.feasible:
+            return lp.Solver.INFEASIBLE
+
+        backend = self._create_backend()
+        backend.configure(self.solver_config)
+        # Columns are added in blocks of the same type, in order
+        breaks = np.flatnonzero(np.diff(presolved.integers)) + 1
+        for block in np.split(np.arange(len(presolved.columns)), breaks):
+            if len(block):
+                backend.add_variables(
+                    presolved.lower_bounds[block],
+                    presolved.upper_bounds[block],
+                    bool(presolved.integers[block[0]]),
+                )
+        backend.add_constraints(presolved.constraints)
+        backend.add_objective(
+            np.arange(len(presolved.columns)),
+            presolved.objective,
+            self.objective_offset + presolved.offset,
+        )
+
+        positions = np.full(self.num_variables(), -1)
+        positions[presolved.columns] = np.arange(len(presolved.columns))
+        hinted = positions[self._hint_indices]
+        backend.set_hint(hinted[hinted >= 0], self._hint_values[hinted >= 0])
+
+        self._solved = backend
+        if not len(presolved.columns):
+            # Nothing is left to solve
+            return lp.Solver.OPTIMAL
+        return backend.solve()
+
+    def _solved_columns(self) -> bool:
+        return self._presolved is not None and len(self._presolved.columns) > 0
+
+    def objective_value(self) -> float:
+        if self._solved is None or self._presolved is None:
+            return math.nan
+        if not self._solved_columns():
+            return self.objective_offset + self._presolved.offset
+        return self._solved.objective_value()
+
+    def variable_values(self) -> np.ndarray:
+        if self._solved is None or self._presolved is None:
+            return np.zeros(self.num_variables())
+        return self._presolved.variable_values(self._solved.variable_values())
+
+    def dual_values(self) -> Optional[np.ndarray]:
+        if self._solved is None or self._presolved is None:
+            return None
+        if not self._solved_columns():
+            return self._presolved.dual_values(np.zeros(0))
+        duals = self._solved.dual_values()
+        if duals is None:
+            return None
+        return self._presolved.dual_values(duals)
+
+    def reduced_costs(self) -> Optional[np.ndarray]:
+        all_duals = self.dual_values()
+        if all_duals is None or self._presolved is None:
+            return None
+        return self._presolved.reduced_costs(all_duals)
@@ -0,0 +1,102 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Compact mapping between component variables (or constraints)
+and the indices of the corresponding solver columns (or rows).
+
+Solver objects of one component variable are created consecutively, for all
+timesteps then for all scenarios of each timestep: their indices are described
+by the index of the first one and the sizes of the time and scenario dimensions,
+so that resolving the index for a timestep and a scenario is only arithmetic.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class IndexLayout:
+    """
+    Solver indices of one component variable or constraint.
+
+    The index for (timestep, scenario) is offset + timestep * scenarios + scenario.
+    A dimension on which the variable is not indexed has size 1,
+    its index may be given as None.
+    """
+
+    offset: int
+    timesteps: int
+    scenarios: int
+    time_indexed: bool
+    scenario_indexed: bool
+
+    @property
+    def size(self) -> int:
+        return self.timesteps * self.scenarios
+
+    def index(self, block_timestep: Optional[int], scenario: Optional[int]) -> int:
+        t = 0 if block_timestep is None else block_timestep
+        s = 0 if scenario is None else scenario
+        if not (0 <= t < self.timesteps and 0 <= s < self.scenarios):
+            raise KeyError(
+                f"No index for timestep {block_timestep}, scenario {scenario}"
+            )
+        return self.offset + t * self.scenarios + s
+
+    def indices(self) -> Iterator[Tuple[Optional[int], Optional[int], int]]:
+        """
+        Timestep, scenario and solver index of all solver objects,
+        timestep and scenario are None when not indexed.
+        """
+        index = self.offset
+        for t in range(self.timesteps):
+            for s in range(self.scenarios):
+                yield (
+                    t if self.time_indexed else None,
+                    s if self.scenario_indexed else None,
+                    index,
+                )
+                index += 1
+
+
+class IndexRegistry:
+    """
+    Index layouts of component variables or constraints,
+    by component ID and model variable or constraint name.
+    """
+
+    def __init__(self) -> None:
+        self._layouts: Dict[Tuple[str, str], IndexLayout] = {}
+
+    def __len__(self) -> int:
+        return len(self._layouts)
+
+    def register(self, component_id: str, name: str, layout: IndexLayout) -> None:
+        self._layouts[(component_id, name)] = layout
+
+    def unregister(self, component_id: str, name: str) -> IndexLayout:
+        return self._layouts.pop((component_id, name))
+
+    def layout(self, component_id: str, name: str) -> IndexLayout:
+        return self._layouts[(component_id, name)]
+
+    def index(
+        self,
+        component_id: str,
+        name: str,
+        block_timestep: Optional[int],
+        scenario: Optional[int],
+    ) -> int:
+        return self._layouts[(component_id, name)].index(block_timestep, scenario)
+
+    def layouts(self) -> Iterator[Tuple[Tuple[str, str], IndexLayout]]:
+        return iter(self._layouts.items())
@@ -0,0 +1,171 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Export of optimization results to columnar files.
+
+Results of each block are written to their own Parquet files as soon as
+the block has been solved, in a directory partitioned by block:
+
+    <output_dir>/block=<block id>/variables.parquet
+    <output_dir>/block=<block id>/duals.parquet
+
+Variables (resp. duals) files have one row per component variable
+(resp. constraint), scenario and timestep of the block (timesteps are
+indices inside the block). Rows are sorted by component and variable
+(resp. constraint), so that filters on those columns only read the
+relevant parts of the files.
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+import polars as pl
+
+from andromede.simulation.optimization import OptimizationProblem
+from andromede.simulation.output_values import OutputValues
+
+VARIABLES_FILE = "variables.parquet"
+DUALS_FILE = "duals.parquet"
+
+
+def _block_dir(output_dir: Path, block_id: int) -> Path:
+    return output_dir / f"block={block_id}"
+
+
+def _write_parquet(frame: pl.DataFrame, path: Path) -> None:
+    """
+    Writes to a temporary file first, so that readers never see partial files.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    os.close(fd)
+    try:
+        frame.write_parquet(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _component_frame(
+    arrays: Iterable[Tuple[str, str, np.ndarray]], name_column: str
+) -> pl.DataFrame:
+    # Pairs of names are stored once, rows refer to them by index
+    names: List[Tuple[str, str]] = []
+    name_indices: List[np.ndarray] = []
+    scenarios: List[np.ndarray] = []
+    timesteps: List[np.ndarray] = []
+    values: List[np.ndarray] = []
+    for component_id, name, array in sorted(
+        arrays, key=lambda item: (item[0], item[1])
+    ):
+        size_s, size_t = array.shape
+        name_indices.append(np.full(array.size, len(names), dtype=np.uint32))
+        names.append((component_id, name))
+        scenarios.append(np.repeat(np.arange(size_s, dtype=np.int32), size_t))
+        timesteps.append(np.tile(np.arange(size_t, dtype=np.int32), size_s))
+        values.append(array.ravel())
+
+    if not names:
+        return pl.DataFrame(
+            schema={
+                "component": pl.Categorical,
+                name_column: pl.Categorical,
+                "scenario": pl.Int32,
+                "timestep": pl.Int32,
+                "value": pl.Float64,
+            }
+        )
+
+    indices = pl.Series(np.concatenate(name_indices))
+    return pl.DataFrame(
+        {
+            "component": pl.Series([c for c, _ in names], dtype=pl.Categorical),
+            name_column: pl.Series([n for _, n in names], dtype=pl.Categorical),
+        }
+    )[indices].with_columns(
+        scenario=pl.Series(np.concatenate(scenarios)),
+        timestep=pl.Series(np.concatenate(timesteps)),
+        value=pl.Series(np.concatenate(values)),
+    )
+
+
+class ResultWriter:
+    """
+    Writes results of solved blocks to a directory of Parquet files.
+
+    Nothing is kept in memory between blocks, which allows to export
+    results of long multi-scenario simulations block after block.
+    """
+
+    def __init__(self, output_dir: Path, *, with_duals: bool = False) -> None:
+        self.output_dir = output_dir
+        self.with_duals = with_duals
+
+    def write_block(self, block_id: int, problem: OptimizationProblem) -> None:
+        """
+        Writes the results of the solved problem of a block.
+        """
+        self.write_output_values(block_id, OutputValues(problem))
+        if self.with_duals:
+            duals = (
+                (component_id, constraint_name, array)
+                for (component_id, constraint_name), array in problem.duals().items()
+            )
+            _write_parquet(
+                _component_frame(duals, "constraint"),
+                _block_dir(self.output_dir, block_id) / DUALS_FILE,
+            )
+
+    def write_output_values(self, block_id: int, output: OutputValues) -> None:
+        _write_parquet(
+            _component_frame(output.variable_arrays(), "variable"),
+            _block_dir(self.output_dir, block_id) / VARIABLES_FILE,
+        )
+
+
+def read_variables(output_dir: Path) -> pl.LazyFrame:
+    """
+    Lazily reads variables values written by a ResultWriter, for all blocks.
+
+    The "block" column is deduced from the directory of each file.
+    """
+    return pl.scan_parquet(output_dir / "*" / VARIABLES_FILE, hive_partitioning=True)
+
+
+def read_duals(output_dir: Path) -> pl.LazyFrame:
+    """
+    Lazily reads dual values written by a ResultWriter, for all blocks.
+    """
+    return pl.scan_parquet(output_dir / "*" / DUALS_FILE, hive_partitioning=True)
+
+
+def read_variable_arrays(
+    output_dir: Path, block_id: int
+) -> Iterator[Tuple[str, str, np.ndarray]]:
+    """
+    Component ID, variable name and (scenarios, timesteps) values of all
+    variables of a block written by a ResultWriter, in the format of
+    OutputValues.variable_arrays, for example to give solution hints.
+    """
+    frame = pl.read_parquet(_block_dir(output_dir, block_id) / VARIABLES_FILE)
+    for (component_id, variable_name), group in frame.group_by(
+        ["component", "variable"], maintain_order=True
+    ):
+        scenarios = group["scenario"].to_numpy()
+        timesteps = group["timestep"].to_numpy()
+        array = np.full((scenarios.max() + 1, timesteps.max() + 1), np.nan)
+        array[scenarios, timesteps] = group["value"].to_numpy()
+        yield str(component_id), str(variable_name), array
@@ -10,24 +10,83 @@
 #
 # This file is part of the Antares project.
 
-import os
+"""
+Execution of external solver binaries.
+
+Each command runs in its own working directory (the process working directory
+is never changed), with its outputs captured to log files in that directory,
+so that several commands can run at the same time.
+"""
 import pathlib
 import subprocess
-import sys
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, List, Optional
+
+
+class RunStatus(Enum):
+    SUCCESS = "SUCCESS"
+    FAILED = "FAILED"
+    TIMED_OUT = "TIMED_OUT"
+    NOT_FOUND = "NOT_FOUND"
+
+
+@dataclass(frozen=True)
+class RunResult:
+    """
+    Outcome of one command.
+
+    The return code is None when the command was not started
+    or was killed after its timeout.
+    """
+
+    command: pathlib.Path
+    emplacement: pathlib.Path
+    status: RunStatus
+    return_code: Optional[int]
+    duration: float
+    stdout_path: pathlib.Path
+    stderr_path: pathlib.Path
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == RunStatus.SUCCESS
 
 
 class CommandRunner:
+    """
+    Runs a binary with its arguments in the emplacement directory.
+
+    A relative binary path is resolved against the working directory
+    at the creation of the runner. Standard output and error are written
+    to <binary name>.stdout.log and <binary name>.stderr.log in the
+    emplacement. The command is killed if it runs longer than the timeout,
+    in seconds.
+    """
+
     def __init__(
         self,
         binary_path: pathlib.Path,
         list_arguments: List[str],
         emplacement: pathlib.Path,
+        *,
+        timeout: Optional[float] = None,
     ) -> None:
         self.current_dir: pathlib.Path = pathlib.Path().cwd()
-        self.command: pathlib.Path = binary_path
+        self.command: pathlib.Path = self.current_dir / binary_path
         self.emplacement: pathlib.Path = emplacement
         self.arguments: List[str] = list_arguments
+        self.timeout: Optional[float] = timeout
+
+    @property
+    def stdout_path(self) -> pathlib.Path:
+        return self.emplacement / f"{self.command.name}.stdout.log"
+
+    @property
+    def stderr_path(self) -> pathlib.Path:
+        return self.emplacement / f"{self.command.name}.stderr.log"
 
     def check_command(self) -> bool:
         if not self.command.is_file():
@@ -35,32 +94,90 @@ class CommandRunner:
             return False
         return True
 
-    def run(self) -> int:
+    def execute(self) -> RunResult:
         if not self.check_command():
+            return self._result(RunStatus.NOT_FOUND, None, 0.0)
+
+        start = time.monotonic()
+        with self.stdout_path.open("wb") as stdout, self.stderr_path.open(
+            "wb"
+        ) as stderr:
+            try:
+                res = subprocess.run(
+                    [self.command, *self.arguments],
+                    cwd=self.emplacement,
+                    stdout=stdout,
+                    stderr=stderr,
+                    timeout=self.timeout,
+                    shell=False,
+                )
+            except subprocess.TimeoutExpired:
+                # The process has been killed by subprocess.run
+                return self._result(RunStatus.TIMED_OUT, None, time.monotonic() - start)
+
+        status = RunStatus.SUCCESS if res.returncode == 0 else RunStatus.FAILED
+        return self._result(status, res.returncode, time.monotonic() - start)
+
+    def run(self) -> int:
+        result = self.execute()
+        if result.status == RunStatus.NOT_FOUND:
             # TODO For now, it will return 0 as if nothing is wrong
             # eventually if should return an error
             # maybe wait when we separate unit tests from integration tests
             # modify with bender_decomposed's read_solution
             print("Return code 0 for now")
             return 0
+        if result.status == RunStatus.TIMED_OUT:
+            print(f"{self.command} timed out after {self.timeout} s")
+            return -1
+        assert result.return_code is not None
+        return result.return_code
 
-        os.chdir(self.emplacement)
-        res = subprocess.run(
-            [self.current_dir / self.command, *self.arguments],
-            stdout=sys.stdout,
-            stderr=subprocess.DEVNULL,  # TODO For now, to avoid the "Invalid MIT-MAGIC-COOKIE-1 key" error
-            shell=False,
+    def _result(
+        self, status: RunStatus, return_code: Optional[int], duration: float
+    ) -> RunResult:
+        return RunResult(
+            command=self.command,
+            emplacement=self.emplacement,
+            status=status,
+            return_code=return_code,
+            duration=duration,
+            stdout_path=self.stdout_path,
+            stderr_path=self.stderr_path,
         )
-        os.chdir(self.current_dir)
-
-        return res.returncode
 
 
 class BendersRunner(CommandRunner):
-    def __init__(self, emplacement: pathlib.Path) -> None:
-        super().__init__(pathlib.Path("bin/benders"), ["options.json"], emplacement)
+    def __init__(
+        self, emplacement: pathlib.Path, *, timeout: Optional[float] = None
+    ) -> None:
+        super().__init__(
+            pathlib.Path("bin/benders"), ["options.json"], emplacement, timeout=timeout
+        )
 
 
 class MergeMPSRunner(CommandRunner):
-    def __init__(self, emplacement: pathlib.Path) -> None:
-        super().__init__(pathlib.Path("bin/merge_mps"), ["options.json"], emplacement)
+    def __init__(
+        self, emplacement: pathlib.Path, *, timeout: Optional[float] = None
+    ) -> None:
+        super().__init__(
+            pathlib.Path("bin/merge_mps"),
+            ["options.json"],
+            emplacement,
+            timeout=timeout,
+        )
+
+
+def run_commands(
+    runners: Iterable[CommandRunner], *, max_jobs: int = 1
+) -> List[RunResult]:
+    """
+    Runs the commands, at most max_jobs at the same time.
+
+    Results are in the order of the runners.
+    """
+    if max_jobs < 1:
+        raise ValueError(f"Number of jobs must be positive, got {max_jobs}")
+    # Threads only wait for their process, which does the actual work
+    with ThreadPoolExecutor(max_workers=max_jobs) as executor:
+        return list(executor.map(CommandRunner.execute, runners))
@@ -0,0 +1,188 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Reduction of the scenarios of studies.
+
+Representative scenarios are selected by fast forward selection
+(Heitsch and Römisch) over the scenario-dependent data of the study, for
+example load and renewable generation series together. Each scenario which
+is not selected gives its probability to the closest selected scenario.
+The reduced study is then solved with these probabilities:
+
+    reduced = select_scenarios(network, database, timesteps, 1000, 20)
+    problem = build_problem(
+        network,
+        reduced.database(network, database),
+        block,
+        len(reduced.scenarios),
+        scenario_weights=reduced.weights,
+    )
+"""
+
+import dataclasses
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from andromede.study.data import (
+    AbstractDataStructure,
+    DataBase,
+    ScenarioSeriesData,
+    Scenarization,
+    TimeScenarioSeriesData,
+    TreeData,
+)
+from andromede.study.network import Network
+
+ParameterKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class ReducedScenarios:
+    """
+    Scenarios kept from the scenarios of a study, and their probabilities:
+    scenario k of the reduced study is scenarios[k] of the study.
+    """
+
+    scenarios: List[int]
+    weights: List[float]
+
+    def database(self, network: Network, database: DataBase) -> DataBase:
+        """
+        Database of the reduced study, whose scenario-dependent data of
+        scenario k is the one of scenarios[k].
+        """
+        reduced = DataBase()
+        for component in network.all_components:
+            for parameter_name in component.model.parameters:
+                data = database.get_data(component.id, parameter_name)
+                reduced.add_data(component.id, parameter_name, self._reduced(data))
+        return reduced
+
+    def _reduced(self, data: AbstractDataStructure) -> AbstractDataStructure:
+        if isinstance(data, (TimeScenarioSeriesData, ScenarioSeriesData)):
+            scenarization = Scenarization(
+                {
+                    k: _column(data, scenario)
+                    for k, scenario in enumerate(self.scenarios)
+                }
+            )
+            return dataclasses.replace(data, scenarization=scenarization)
+        if isinstance(data, TreeData):
+            return TreeData(
+                {node_id: self._reduced(value) for node_id, value in data.data.items()}
+            )
+        return data
+
+
+def select_scenarios(
+    network: Network,
+    database: DataBase,
+    timesteps: Sequence[int],
+    scenarios: int,
+    count: int,
+    parameters: Optional[Sequence[ParameterKey]] = None,
+    probabilities: Optional[Sequence[float]] = None,
+) -> ReducedScenarios:
+    """
+    Selects count representative scenarios among the scenarios of a study,
+    by fast forward selection.
+
+    Scenarios are compared over the given timesteps, with the data of the
+    given (component ID, parameter name) pairs, by default all the
+    scenario-dependent series of the study. Each series is scaled by its
+    largest value, so that series of different units have the same importance.
+    Scenarios have the given probabilities, uniform by default.
+    """
+    if not 1 <= count <= scenarios:
+        raise ValueError(f"Cannot select {count} scenarios among {scenarios}")
+    if probabilities is not None and len(probabilities) != scenarios:
+        raise ValueError(f"Expected {scenarios} probabilities")
+    if parameters is None:
+        parameters = [
+            (component.id, parameter_name)
+            for component in network.all_components
+            for parameter_name in component.model.parameters
+        ]
+    features = [np.zeros((scenarios, 0))]
+    for key in parameters:
+        values = _scenario_values(database.get_data(*key), timesteps, scenarios)
+        scale = 0.0 if values is None else np.abs(values).max()
+        if values is not None and scale > 0:
+            features.append(values / scale)
+    distances = _distances(np.concatenate(features, axis=1))
+
+    weights = (
+        np.full(scenarios, 1 / scenarios)
+        if probabilities is None
+        else np.asarray(probabilities, dtype=float)
+    )
+    selected = _fast_forward_selection(distances, weights, count)
+    closest = np.argmin(distances[:, selected], axis=1)
+    reduced_weights = np.bincount(closest, weights=weights, minlength=count)
+    return ReducedScenarios(selected, reduced_weights.tolist())
+
+
+def _column(data: AbstractDataStructure, scenario: int) -> int:
+    """
+    Column of the data of a scenario of the study.
+    """
+    scenarization = getattr(data, "scenarization", None)
+    if scenarization is None:
+        return scenario
+    return scenarization.get_scenario_for_year(scenario)
+
+
+def _scenario_values(
+    data: AbstractDataStructure, timesteps: Sequence[int], scenarios: int
+) -> Optional[np.ndarray]:
+    """
+    Values of scenario-dependent data, as a (scenarios, timesteps) array,
+    None for other data.
+    """
+    if isinstance(data, TimeScenarioSeriesData):
+        columns = np.array([_column(data, s) for s in range(scenarios)])
+        values = data.time_scenario_series.to_numpy(dtype=float)
+        return values[np.ix_(np.asarray(timesteps), columns)].T
+    if isinstance(data, ScenarioSeriesData):
+        return np.array(
+            [[data.get_value(None, s)] for s in range(scenarios)], dtype=float
+        )
+    return None
+
+
+def _distances(features: np.ndarray) -> np.ndarray:
+    # Computed row by row, so that equal rows have a zero distance
+    return np.array([np.linalg.norm(features - row, axis=1) for row in features])
+
+
+def _fast_forward_selection(
+    distances: np.ndarray, probabilities: np.ndarray, count: int
+) -> List[int]:
+    """
+    Scenarios selected one at a time, each one minimizing the probability
+    weighted distance of the other scenarios to the selected ones.
+    """
+    costs = distances.copy()
+    remaining = np.ones(len(probabilities), dtype=bool)
+    selected: List[int] = []
+    for _ in range(count):
+        totals = probabilities[remaining] @ costs[remaining]
+        totals[~remaining] = np.inf
+        scenario = int(np.argmin(totals))
+        selected.append(scenario)
+        remaining[scenario] = False
+        # Distances to the selected scenarios, for each candidate
+        costs = np.minimum(costs, costs[:, [scenario]])
+    return selected
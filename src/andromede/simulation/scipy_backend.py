@@ -0,0 +1,192 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Backend solving problems with HiGHS, through scipy.
+
+No OR-Tools object is created: the problem is held as arrays, and passed
+to HiGHS as a sparse CSR matrix. LP problems are solved with
+scipy.optimize.linprog, which provides dual values, and MIP problems
+with scipy.optimize.milp.
+"""
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import scipy.sparse as sp
+from scipy.optimize import Bounds, LinearConstraint, OptimizeResult, linprog, milp
+
+from andromede.simulation.backend import SparseRows
+from andromede.simulation.matrix_backend import MatrixBackend
+from andromede.simulation.solver_config import LpAlgorithm, SolverConfig
+
+# Primal simplex is not available through scipy
+_LP_METHODS = {
+    None: "highs",
+    LpAlgorithm.DUAL: "highs-ds",
+    LpAlgorithm.BARRIER: "highs-ipm",
+}
+
+
+class ScipyHighsBackend(MatrixBackend):
+    """
+    Problem held as arrays, solved by HiGHS through scipy.
+
+    HiGHS runs single-threaded through scipy, the number of threads of
+    solver configurations is not used. Solution hints are not used either,
+    and each solve starts from scratch.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._result: Optional[OptimizeResult] = None
+        self._duals: Optional[np.ndarray] = None
+        self._reduced_costs: Optional[np.ndarray] = None
+
+    def configure(self, config: SolverConfig) -> None:
+        if config.solver_parameters:
+            raise ValueError("HiGHS through scipy takes no solver-specific parameters")
+        if config.lp_algorithm not in _LP_METHODS:
+            raise ValueError(
+                f"LP algorithm {config.lp_algorithm} is not available with scipy"
+            )
+        super().configure(config)
+
+    def _options(self) -> Dict[str, Any]:
+        config = self.solver_config
+        options: Dict[str, Any] = {"disp": config.verbose}
+        if config.time_limit is not None:
+            options["time_limit"] = config.time_limit
+        if config.presolve is not None:
+            options["presolve"] = config.presolve
+        return options
+
+    def _constraint_matrix(self, rows: SparseRows) -> sp.csr_matrix:
+        # Duplicate coefficients are summed
+        matrix = sp.csr_matrix(
+            (rows.coefficients, rows.indices, rows.starts),
+            shape=(self.num_constraints(), self.num_variables()),
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+    def solve(self) -> int:
+        c = self.objective_coefficients()
+        lower_bounds = self.lower_bounds()
+        upper_bounds = self.upper_bounds()
+        integers = self.integers()
+        rows = self.constraint_rows()
+        matrix = self._constraint_matrix(rows)
+        row_lower_bounds, row_upper_bounds = rows.lower_bounds, rows.upper_bounds
+
+        if integers.any():
+            options = self._options()
+            if self.solver_config.relative_mip_gap is not None:
+                options["mip_rel_gap"] = self.solver_config.relative_mip_gap
+            self._result = milp(
+                c,
+                integrality=integers.astype(np.uint8),
+                bounds=Bounds(lower_bounds, upper_bounds),
+                constraints=LinearConstraint(
+                    matrix, row_lower_bounds, row_upper_bounds
+                ),
+                options=options,
+            )
+            self._duals = self._reduced_costs = None
+        else:
+            self._solve_lp(
+                c,
+                lower_bounds,
+                upper_bounds,
+                matrix,
+                row_lower_bounds,
+                row_upper_bounds,
+            )
+        return self._status()
+
+    def _solve_lp(
+        self,
+        c: np.ndarray,
+        lower_bounds: np.ndarray,
+        upper_bounds: np.ndarray,
+        matrix: sp.csr_matrix,
+        row_lower_bounds: np.ndarray,
+        row_upper_bounds: np.ndarray,
+    ) -> None:
+        # linprog only takes equalities and upper bounded rows:
+        # lower bounded rows are negated, ranges are split in two rows
+        equal = row_lower_bounds == row_upper_bounds
+        upper = ~equal & np.isfinite(row_upper_bounds)
+        lower = ~equal & np.isfinite(row_lower_bounds)
+        a_ub = sp.vstack([matrix[upper], -matrix[lower]], format="csr")
+        b_ub = np.concatenate([row_upper_bounds[upper], -row_lower_bounds[lower]])
+        has_ub, has_eq = a_ub.shape[0] > 0, bool(equal.any())
+
+        result = linprog(
+            c,
+            A_ub=a_ub if has_ub else None,
+            b_ub=b_ub if has_ub else None,
+            A_eq=matrix[equal] if has_eq else None,
+            b_eq=row_lower_bounds[equal] if has_eq else None,
+            bounds=np.column_stack([lower_bounds, upper_bounds]),
+            method=_LP_METHODS[self.solver_config.lp_algorithm],
+            options=self._options(),
+        )
+        self._result = result
+        if result.x is None:
+            self._duals = self._reduced_costs = None
+            return
+
+        # Marginals are the sensitivities of the objective to the right-hand sides
+        duals = np.zeros(len(equal))
+        if has_eq:
+            duals[equal] = result.eqlin.marginals
+        if has_ub:
+            upper_count = int(upper.sum())
+            duals[upper] += result.ineqlin.marginals[:upper_count]
+            duals[lower] -= result.ineqlin.marginals[upper_count:]
+        self._duals = duals
+        self._reduced_costs = result.lower.marginals + result.upper.marginals
+
+    def _status(self) -> int:
+        assert self._result is not None
+        if self._result.status == 0:
+            return lp.Solver.OPTIMAL
+        if self._result.status == 1:
+            # Time or iteration limit
+            return (
+                lp.Solver.FEASIBLE
+                if self._result.x is not None
+                else lp.Solver.NOT_SOLVED
+            )
+        if self._result.status == 2:
+            return lp.Solver.INFEASIBLE
+        if self._result.status == 3:
+            return lp.Solver.UNBOUNDED
+        return lp.Solver.ABNORMAL
+
+    def objective_value(self) -> float:
+        if self._result is None or self._result.x is None:
+            return math.nan
+        return float(self._result.fun) + self._objective_offset
+
+    def variable_values(self) -> np.ndarray:
+        if self._result is None or self._result.x is None:
+            return np.zeros(self.num_variables())
+        return np.asarray(self._result.x, dtype=float)
+
+    def dual_values(self) -> Optional[np.ndarray]:
+        return self._duals
+
+    def reduced_costs(self) -> Optional[np.ndarray]:
+        return self._reduced_costs
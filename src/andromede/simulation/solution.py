@@ -0,0 +1,99 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Bulk extraction of solution values from the solver.
+
+The whole solution (primal values, duals and reduced costs) is fetched
+in one call, then values are gathered per component variable or constraint
+in (scenarios, timesteps) arrays, using the index layouts of the registries.
+Conversely, such arrays are scattered to solver columns to give solution hints.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+from ortools.linear_solver import linear_solver_pb2
+
+from andromede.simulation.registry import IndexRegistry
+
+
+def solution_response(solver: lp.Solver) -> linear_solver_pb2.MPSolutionResponse:
+    """
+    Last solution of the solver, with all its values.
+    """
+    response = linear_solver_pb2.MPSolutionResponse()
+    solver.FillSolutionResponseProto(response)
+    return response
+
+
+def solution_values(values: Sequence[float], count: int) -> Optional[np.ndarray]:
+    """
+    Values of all solver columns (or rows), or None if the solver provided
+    no values (for example dual values of MIP problems).
+    """
+    if len(values) != count:
+        return None
+    return np.array(values, dtype=float)
+
+
+def gather_arrays(
+    registry: IndexRegistry, values: np.ndarray
+) -> Dict[Tuple[str, str], np.ndarray]:
+    """
+    Values of all registered component variables (or constraints),
+    as (scenarios, timesteps) arrays.
+
+    Values are indexed by solver column (or row).
+    """
+    arrays: Dict[Tuple[str, str], np.ndarray] = {}
+    for key, layout in registry.layouts():
+        layout_values = values[layout.offset : layout.offset + layout.size]
+        arrays[key] = np.ascontiguousarray(
+            layout_values.reshape(layout.timesteps, layout.scenarios).T
+        )
+    return arrays
+
+
+def scatter_arrays(
+    registry: IndexRegistry, arrays: Iterable[Tuple[str, str, np.ndarray]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solver indices and values of component variables given as
+    (component ID, variable name, (scenarios, timesteps) array).
+
+    Variables which are not registered and NaN values are skipped.
+    When shapes differ, for example for blocks of different sizes,
+    only the values of the common scenarios and timesteps are used.
+    """
+    indices: List[np.ndarray] = []
+    values: List[np.ndarray] = []
+    for component_id, name, array in arrays:
+        try:
+            layout = registry.layout(component_id, name)
+        except KeyError:
+            continue
+        size_s = min(layout.scenarios, array.shape[0])
+        size_t = min(layout.timesteps, array.shape[1])
+        # Layouts are indexed by timestep then scenario
+        layout_indices = (
+            layout.offset
+            + np.arange(size_t)[np.newaxis, :] * layout.scenarios
+            + np.arange(size_s)[:, np.newaxis]
+        )
+        layout_values = array[:size_s, :size_t]
+        known = ~np.isnan(layout_values)
+        indices.append(layout_indices[known])
+        values.append(layout_values[known])
+    if not indices:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=float)
+    return np.concatenate(indices), np.concatenate(values).astype(float)
@@ -0,0 +1,92 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Configuration of solvers: threads, time limit and algorithm parameters.
+"""
+import os
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Optional, Tuple
+
+
+class LpAlgorithm(Enum):
+    PRIMAL = "PRIMAL"
+    DUAL = "DUAL"
+    BARRIER = "BARRIER"
+
+
+@dataclass(frozen=True)
+class SolverConfig:
+    """
+    Parameters of a solve. Parameters left to None keep the solver defaults.
+
+    The time limit is in seconds. Solver-specific parameters are given
+    in the format of the solver (for example "limits/gap = 0.01" for SCIP).
+    """
+
+    threads: Optional[int] = None
+    time_limit: Optional[float] = None
+    presolve: Optional[bool] = None
+    lp_algorithm: Optional[LpAlgorithm] = None
+    relative_mip_gap: Optional[float] = None
+    solver_parameters: str = ""
+    verbose: bool = False
+
+    def __post_init__(self) -> None:
+        if self.threads is not None and self.threads < 1:
+            raise ValueError(f"Number of threads must be positive, got {self.threads}")
+        if self.time_limit is not None and self.time_limit <= 0:
+            raise ValueError(f"Time limit must be positive, got {self.time_limit}")
+
+    def for_concurrent_solves(
+        self, solves: int, cores: Optional[int] = None
+    ) -> Tuple[int, "SolverConfig"]:
+        """
+        Number of solves to run at the same time, and the configuration
+        of each of them, so that the cores are shared without oversubscription.
+
+        A number of threads set in this configuration is kept, fewer solves
+        then run at the same time.
+        """
+        if cores is None:
+            cores = available_cores()
+        if self.threads is not None:
+            return max(1, min(solves, cores // self.threads)), self
+        jobs, threads = split_cores(solves, cores)
+        return jobs, replace(self, threads=threads)
+
+
+def available_cores() -> int:
+    """
+    Number of cores this process may run on.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover
+        # Not available on all platforms
+        return os.cpu_count() or 1
+
+
+def split_cores(solves: int, cores: int) -> Tuple[int, int]:
+    """
+    Number of concurrent solves and of threads per solve to use the cores.
+
+    Solves run concurrently first, as they scale better than solver threads,
+    the remaining cores are given to solver threads.
+    """
+    if solves < 1:
+        raise ValueError(f"Number of solves must be positive, got {solves}")
+    if cores < 1:
+        raise ValueError(f"Number of cores must be positive, got {cores}")
+    jobs = min(solves, cores)
+    return jobs, max(1, cores // jobs)
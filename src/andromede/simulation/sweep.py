@@ -0,0 +1,240 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Parameter sweeps: solves of one study for many variants of its parameters.
+
+Variants are distributed over a pool of processes. Each process builds the
+problem of the base study once, then for each variant applies the overrides
+in place (see OptimizationProblem.update_parameters) and solves it again,
+so that OR-Tools LP solvers also restart from the previous basis.
+"""
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import polars as pl
+
+from andromede.expression.dependencies import ComponentParameterKey
+from andromede.simulation.optimization import OptimizationProblem, build_problem
+from andromede.simulation.solver_config import SolverConfig
+from andromede.simulation.time_block import TimeBlock
+from andromede.study.data import AbstractDataStructure, DataBase
+from andromede.study.network import Network
+
+Overrides = Mapping[ComponentParameterKey, AbstractDataStructure]
+OutputKey = Tuple[str, str]
+
+
+def parameter_grid(
+    values: Mapping[ComponentParameterKey, Sequence[AbstractDataStructure]]
+) -> List[Dict[ComponentParameterKey, AbstractDataStructure]]:
+    """
+    Variants for all combinations of the values of each parameter,
+    the last parameter varying fastest.
+    """
+    keys = list(values)
+    return [
+        dict(zip(keys, combination))
+        for combination in itertools.product(*(values[key] for key in keys))
+    ]
+
+
+@dataclass(frozen=True)
+class SweepStudy:
+    """
+    Base study of a sweep: everything needed to build its problem.
+
+    It is sent to each process of the sweep, so it must be picklable.
+    """
+
+    network: Network
+    database: DataBase
+    block: TimeBlock
+    scenarios: int
+    solver_id: str = "SCIP"
+    solver_config: SolverConfig = field(default_factory=SolverConfig)
+    build_presolve: bool = False
+    aggregate_variables: bool = False
+
+    def build(self) -> OptimizationProblem:
+        return build_problem(
+            self.network,
+            self.database,
+            self.block,
+            self.scenarios,
+            solver_id=self.solver_id,
+            anonymous_names=True,
+            solver_config=self.solver_config,
+            build_presolve=self.build_presolve,
+            aggregate_variables=self.aggregate_variables,
+        )
+
+
+@dataclass(frozen=True)
+class _VariantResult:
+    status: int
+    objective: float
+    outputs: Dict[OutputKey, np.ndarray]
+
+
+class _SweepWorker:
+    """
+    Solves variants one after the other with the same problem.
+
+    Overrides of a variant are relative to the base study: parameters
+    overridden by the previous variant only are set back to their base data.
+    """
+
+    def __init__(self, study: SweepStudy, outputs: Sequence[OutputKey]) -> None:
+        self._study = study
+        self._outputs = outputs
+        self._problem = study.build()
+        self._base: Dict[ComponentParameterKey, AbstractDataStructure] = {}
+        self._applied: Set[ComponentParameterKey] = set()
+
+    def solve(self, overrides: Overrides) -> _VariantResult:
+        updates = {key: self._base[key] for key in self._applied - overrides.keys()}
+        updates.update(overrides)
+        database = self._study.database
+        for key in updates:
+            if key not in self._base:
+                self._base[key] = database.get_data(*key)
+
+        if updates.keys() & self._problem.context.structural_parameters:
+            for (component_id, parameter_name), data in updates.items():
+                database.add_data(component_id, parameter_name, data)
+            self._problem = self._study.build()
+        else:
+            self._problem.update_parameters(updates)
+        self._applied = set(overrides)
+
+        status = self._problem.solve()
+        return _VariantResult(status, *self._solution(status))
+
+    def _solution(self, status: int) -> Tuple[float, Dict[OutputKey, np.ndarray]]:
+        context = self._problem.context
+        shape = (context.scenarios, context.block_length())
+        if status not in (lp.Solver.OPTIMAL, lp.Solver.FEASIBLE):
+            return math.nan, {key: np.full(shape, np.nan) for key in self._outputs}
+
+        values = self._problem.backend.variable_values()
+        outputs = {}
+        for component_id, variable_name in self._outputs:
+            layout = context.variable_registry.layout(component_id, variable_name)
+            array = values[layout.offset : layout.offset + layout.size]
+            # Variables which are not time or scenario dependent are repeated
+            outputs[(component_id, variable_name)] = np.broadcast_to(
+                array.reshape(layout.timesteps, layout.scenarios).T, shape
+            )
+        return self._problem.objective_value(), outputs
+
+    def restore(self) -> None:
+        """
+        Sets back the base data of overridden parameters in the database.
+        """
+        for (component_id, parameter_name), data in self._base.items():
+            self._study.database.add_data(component_id, parameter_name, data)
+        self._applied = set()
+
+
+# Worker of each process of the pool
+_worker: Optional[_SweepWorker] = None
+
+
+def _init_worker(study: SweepStudy, outputs: Sequence[OutputKey]) -> None:
+    global _worker
+    _worker = _SweepWorker(study, outputs)
+
+
+def _solve_variant(overrides: Overrides) -> _VariantResult:
+    assert _worker is not None
+    return _worker.solve(overrides)
+
+
+def _results_frame(
+    results: Sequence[_VariantResult], outputs: Sequence[OutputKey]
+) -> pl.DataFrame:
+    variants = np.arange(len(results), dtype=np.int32)
+    statuses = np.array([r.status for r in results], dtype=np.int32)
+    objectives = np.array([r.objective for r in results], dtype=float)
+    if not outputs:
+        return pl.DataFrame(
+            {"variant": variants, "status": statuses, "objective": objectives}
+        )
+
+    if results:
+        size_s, size_t = results[0].outputs[outputs[0]].shape
+    else:
+        size_s = size_t = 0
+    rows = size_s * size_t
+    columns = {
+        "variant": np.repeat(variants, rows),
+        "status": np.repeat(statuses, rows),
+        "objective": np.repeat(objectives, rows),
+        "scenario": np.tile(
+            np.repeat(np.arange(size_s, dtype=np.int32), size_t), len(results)
+        ),
+        "timestep": np.tile(np.arange(size_t, dtype=np.int32), size_s * len(results)),
+    }
+    for key in outputs:
+        columns[".".join(key)] = np.concatenate(
+            [r.outputs[key].ravel() for r in results] or [np.empty(0)]
+        )
+    return pl.DataFrame(columns)
+
+
+def run_sweep(
+    study: SweepStudy,
+    variants: Sequence[Overrides],
+    *,
+    outputs: Sequence[OutputKey] = (),
+    cores: Optional[int] = None,
+) -> pl.DataFrame:
+    """
+    Solves the study for each variant of its parameters, returns the results
+    as one table.
+
+    Overrides of each variant replace the data of parameters, by component ID
+    and parameter name, of the base study. The cores (by default, all the cores
+    available to the process) are shared between processes and solver threads,
+    see SolverConfig.for_concurrent_solves.
+
+    The table has one row per variant with its index, the OR-Tools status of
+    the solve and the objective value (NaN when no solution was found).
+    When outputs are selected, by component ID and variable name, the table
+    has one row per variant, scenario and timestep instead, and one column
+    "<component>.<variable>" of values per output.
+    """
+    if not variants:
+        return _results_frame([], outputs)
+    jobs, solver_config = study.solver_config.for_concurrent_solves(
+        len(variants), cores
+    )
+    study = replace(study, solver_config=solver_config)
+
+    if jobs == 1:
+        worker = _SweepWorker(study, outputs)
+        try:
+            results = [worker.solve(overrides) for overrides in variants]
+        finally:
+            worker.restore()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(study, outputs)
+        ) as executor:
+            results = list(executor.map(_solve_variant, variants))
+    return _results_frame(results, outputs)
@@ -34,7 +34,11 @@ class TimeBlock:
     One block for otimization (week in current tool).
 
     timesteps: list of the different timesteps of the block (0, 1, ... 168 for each hour in one week)
+    weight: number of timesteps of the full horizon represented by each timestep
+    of the block, for reduced horizons (see time_reduction). Operational
+    objective contributions are multiplied by this weight.
     """
 
     id: int
     timesteps: List[int]
+    weight: float = 1.0
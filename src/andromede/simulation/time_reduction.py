@@ -0,0 +1,339 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Reduction of the time horizon of studies.
+
+Long studies are reduced by aggregating consecutive timesteps (for example
+3 or 6 hours by timestep), or by solving only representative periods (for
+example weeks) selected by clustering, each one weighted by the number of
+periods it represents. Both can be combined.
+
+The reduced horizon has its own database, whose time-dependent data is
+indexed by the timesteps of the reduced horizon, and one time block for
+each problem to build. Results are then mapped back to the full horizon.
+
+Time-dependent constraints of models (storage levels, minimum durations,
+ramps ...) are written by timestep: with aggregated timesteps, their
+parameters must be given by reduced timestep.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from andromede.simulation.optimization import OptimizationProblem, build_problem
+from andromede.simulation.output_values import OutputValues
+from andromede.simulation.time_block import TimeBlock
+from andromede.study.data import (
+    AbstractDataStructure,
+    ConstantData,
+    DataBase,
+    TimeIndex,
+    TimeScenarioSeriesData,
+    TimeSeriesData,
+    TreeData,
+)
+from andromede.study.network import Network
+
+ParameterKey = Tuple[str, str]
+
+
+class AggregationRule(Enum):
+    """
+    How time-dependent data is aggregated over timesteps: for example the
+    mean for capacities and demands, the sum for energy inflows.
+    """
+
+    MEAN = "mean"
+    SUM = "sum"
+    MIN = "min"
+    MAX = "max"
+
+
+@dataclass(frozen=True)
+class ReducedHorizon:
+    """
+    Database and time blocks of the problems of a reduced horizon.
+
+    timesteps gives, for each timestep of the full horizon, the timestep
+    of the reduced database which represents it. Timesteps of the reduced
+    database are the ones of the blocks, in order.
+    """
+
+    database: DataBase
+    blocks: List[TimeBlock]
+    timesteps: np.ndarray
+
+    def build_problems(
+        self, network: Network, scenarios: int, **kwargs: Any
+    ) -> List[OptimizationProblem]:
+        """
+        Builds the problem of each block, other arguments are given to build_problem.
+        """
+        return [
+            build_problem(network, self.database, block, scenarios, **kwargs)
+            for block in self.blocks
+        ]
+
+    def objective_value(self, problems: Sequence[OptimizationProblem]) -> float:
+        """
+        Estimate of the objective value over the full horizon,
+        from the solved problems of the blocks.
+        """
+        return sum(problem.objective_value() for problem in problems)
+
+    def expand(self, arrays: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Values over the full horizon, from the (scenarios, timesteps) arrays
+        of the blocks. Values which do not depend on time are repeated over
+        the timesteps of their block.
+        """
+        reduced = np.concatenate(
+            [
+                np.broadcast_to(array, (array.shape[0], len(block.timesteps)))
+                for array, block in zip(arrays, self.blocks)
+            ],
+            axis=1,
+        )
+        return reduced[:, self.timesteps]
+
+    def output_values(self, problems: Sequence[OptimizationProblem]) -> OutputValues:
+        """
+        Output values over the full horizon, from the solved problems of the
+        blocks. Variables which do not depend on time keep their values when
+        they are the same in all blocks.
+        """
+        block_outputs = [OutputValues(problem) for problem in problems]
+        output = OutputValues()
+        for component_id, variable_name, _ in block_outputs[0].variable_arrays():
+            arrays = [
+                block_output.component(component_id).var(variable_name).array
+                for block_output in block_outputs
+            ]
+            if all(
+                array.shape[1] == 1 and np.array_equal(array, arrays[0])
+                for array in arrays
+            ):
+                values = arrays[0]
+            else:
+                values = self.expand(arrays)
+            output.component(component_id).var(variable_name).value = values.tolist()
+        return output
+
+
+def aggregate_timesteps(
+    network: Network,
+    database: DataBase,
+    timesteps: Sequence[int],
+    scenarios: int,
+    duration: int,
+    rules: Optional[Mapping[str, AggregationRule]] = None,
+) -> ReducedHorizon:
+    """
+    Reduces the horizon to one block whose timesteps each aggregate
+    duration consecutive timesteps.
+
+    Time-dependent data is aggregated with the rule of its parameter name,
+    the mean by default. Operational objective contributions are weighted
+    by the duration.
+    """
+    return _reduce(network, database, timesteps, scenarios, duration, rules)
+
+
+def select_representative_periods(
+    network: Network,
+    database: DataBase,
+    timesteps: Sequence[int],
+    scenarios: int,
+    period_length: int,
+    count: int,
+    duration: int = 1,
+    rules: Optional[Mapping[str, AggregationRule]] = None,
+) -> ReducedHorizon:
+    """
+    Reduces the horizon to count representative periods of period_length
+    timesteps, one block for each of them.
+
+    Periods are clustered by k-medoids over their time-dependent data (after
+    aggregation of timesteps when duration is not 1): representatives are
+    actual periods of the horizon. Operational objective contributions are
+    weighted by the number of periods each representative stands for.
+    """
+    if count < 1:
+        raise ValueError("At least one representative period is needed")
+    return _reduce(
+        network, database, timesteps, scenarios, duration, rules, period_length, count
+    )
+
+
+def _reduce(
+    network: Network,
+    database: DataBase,
+    timesteps: Sequence[int],
+    scenarios: int,
+    duration: int,
+    rules: Optional[Mapping[str, AggregationRule]],
+    period_length: Optional[int] = None,
+    count: Optional[int] = None,
+) -> ReducedHorizon:
+    horizon = np.asarray(timesteps)
+    period_length = len(horizon) if period_length is None else period_length
+    if duration < 1 or period_length % duration or len(horizon) % period_length:
+        raise ValueError(
+            f"The horizon of {len(horizon)} timesteps cannot be divided in periods "
+            f"of {period_length} timesteps, of timesteps of duration {duration}"
+        )
+    rules = rules or {}
+    profiles: Dict[ParameterKey, np.ndarray] = {}
+    constants: Dict[ParameterKey, AbstractDataStructure] = {}
+    for component in network.all_components:
+        for parameter in component.model.parameters.values():
+            key = (component.id, parameter.name)
+            data = database.get_data(*key)
+            rule = rules.get(parameter.name, AggregationRule.MEAN)
+            if not parameter.structure.time:
+                constants[key] = data
+            elif isinstance(data, ConstantData):
+                factor = duration if rule == AggregationRule.SUM else 1
+                constants[key] = ConstantData(data.value * factor)
+            else:
+                profile = _profile(
+                    data, horizon, scenarios if parameter.structure.scenario else 1
+                )
+                profiles[key] = _aggregated(profile, duration, rule)
+
+    steps = period_length // duration
+    periods = len(horizon) // period_length
+    if count is None or count >= periods:
+        medoids, clusters = np.arange(periods), np.arange(periods)
+    else:
+        medoids, clusters = _medoids(_features(profiles, periods, steps), count)
+    weights = np.bincount(clusters, minlength=len(medoids)) * duration
+
+    reduced = DataBase()
+    for key, data in constants.items():
+        reduced.add_data(*key, data)
+    kept = (medoids[:, None] * steps + np.arange(steps)).ravel()
+    for key, profile in profiles.items():
+        reduced.add_data(*key, _series(profile[:, kept], profile.shape[0] > 1))
+    blocks = [
+        TimeBlock(
+            index + 1,
+            list(range(index * steps, (index + 1) * steps)),
+            float(weights[index]),
+        )
+        for index in range(len(medoids))
+    ]
+    positions = np.arange(len(horizon))
+    reduced_timesteps = (
+        clusters[positions // period_length] * steps
+        + (positions % period_length) // duration
+    )
+    return ReducedHorizon(reduced, blocks, reduced_timesteps)
+
+
+def _profile(
+    data: AbstractDataStructure, horizon: np.ndarray, scenarios: int
+) -> np.ndarray:
+    """
+    Values of time-dependent data over the horizon, as a (scenarios, timesteps) array.
+    """
+    if isinstance(data, TreeData):
+        raise ValueError("Time reduction of decision tree data is not supported")
+    if isinstance(data, TimeScenarioSeriesData):
+        columns = np.array(
+            [
+                data.scenarization.get_scenario_for_year(s) if data.scenarization else s
+                for s in range(scenarios)
+            ]
+        )
+        values = data.time_scenario_series.to_numpy(dtype=float)
+        return values[np.ix_(horizon, columns)].T
+    if isinstance(data, TimeSeriesData):
+        return np.array([[data.get_value(t, None) for t in horizon.tolist()]])
+    return np.array(
+        [[data.get_value(t, s) for t in horizon.tolist()] for s in range(scenarios)]
+    )
+
+
+def _aggregated(
+    profile: np.ndarray, duration: int, rule: AggregationRule
+) -> np.ndarray:
+    groups = profile.reshape(profile.shape[0], -1, duration)
+    if rule == AggregationRule.SUM:
+        return groups.sum(axis=2)
+    if rule == AggregationRule.MIN:
+        return groups.min(axis=2)
+    if rule == AggregationRule.MAX:
+        return groups.max(axis=2)
+    return groups.mean(axis=2)
+
+
+def _series(profile: np.ndarray, scenario_dependent: bool) -> AbstractDataStructure:
+    if not scenario_dependent:
+        return TimeSeriesData(
+            {TimeIndex(t): float(value) for t, value in enumerate(profile[0])}
+        )
+    # pandas is costly to import, it is only imported when it is needed
+    import pandas as pd
+
+    return TimeScenarioSeriesData(pd.DataFrame(profile.T))
+
+
+def _features(
+    profiles: Mapping[ParameterKey, np.ndarray], periods: int, steps: int
+) -> np.ndarray:
+    """
+    Time-dependent data of each period, each profile scaled by its largest value.
+    """
+    features = [np.zeros((periods, 0))]
+    for profile in profiles.values():
+        scale = np.abs(profile).max()
+        if scale > 0:
+            by_period = profile.reshape(profile.shape[0], periods, steps) / scale
+            features.append(by_period.transpose(1, 0, 2).reshape(periods, -1))
+    return np.concatenate(features, axis=1)
+
+
+def _medoids(features: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Medoids of count clusters of the rows of features, and the cluster of
+    each row. Medoids are initialized greedily (first phase of PAM), then
+    each cluster takes the member closest to the others, until it is stable.
+    Fewer medoids are returned when the rows have fewer distinct values.
+    """
+    # Computed row by row, so that equal rows have a zero distance
+    distances = np.array([np.linalg.norm(features - row, axis=1) for row in features])
+    selected = [int(np.argmin(distances.sum(axis=1)))]
+    while len(selected) < count:
+        nearest = distances[:, selected].min(axis=1)
+        gains = np.maximum(nearest[:, None] - distances, 0).sum(axis=0)
+        if gains.max() <= 0:
+            break
+        selected.append(int(np.argmax(gains)))
+
+    medoids = np.array(selected)
+    clusters = np.argmin(distances[:, medoids], axis=1)
+    for _ in range(len(features)):
+        updated = medoids.copy()
+        for cluster in range(len(medoids)):
+            members = np.flatnonzero(clusters == cluster)
+            within = distances[np.ix_(members, members)].sum(axis=1)
+            updated[cluster] = members[np.argmin(within)]
+        if np.array_equal(updated, medoids):
+            break
+        medoids = updated
+        clusters = np.argmin(distances[:, medoids], axis=1)
+    return medoids, clusters
@@ -12,12 +12,14 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Mapping, Optional
-
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, Mapping, Optional
 
 from andromede.study.network import Network
 
+if TYPE_CHECKING:
+    # pandas is costly to import, it is only imported when loading time series
+    import pandas as pd
+
 
 @dataclass(frozen=True)
 class TimeScenarioIndex:
@@ -134,7 +136,9 @@ class ScenarioSeriesData(AbstractDataStructure):
 
 def load_ts_from_txt(
     timeseries_name: Optional[str], path_to_file: Optional[Path]
-) -> pd.DataFrame:
+) -> "pd.DataFrame":
+    import pandas as pd
+
     if path_to_file is not None and timeseries_name is not None:
         timeseries_with_extension = timeseries_name + ".txt"
         ts_path = path_to_file / timeseries_with_extension
@@ -147,7 +151,7 @@ def load_ts_from_txt(
         raise Exception(f"An error has arrived when processing '{ts_path}'")
 
 
-def dataframe_to_time_series(ts_dataframe: pd.DataFrame) -> Dict[TimeIndex, float]:
+def dataframe_to_time_series(ts_dataframe: "pd.DataFrame") -> Dict[TimeIndex, float]:
     if ts_dataframe.shape[1] != 1:
         raise ValueError(
             f"Could not convert input data to time series data. Expect data series with exactly one column, got shape {ts_dataframe.shape}"
@@ -160,7 +164,7 @@ def dataframe_to_time_series(ts_dataframe: pd.DataFrame) -> Dict[TimeIndex, floa
 
 
 def dataframe_to_scenario_series(
-    ts_dataframe: pd.DataFrame,
+    ts_dataframe: "pd.DataFrame",
 ) -> Dict[ScenarioIndex, float]:
     if ts_dataframe.shape[0] != 1:
         raise ValueError(
@@ -183,7 +187,7 @@ class TimeScenarioSeriesData(AbstractDataStructure):
     can be defined by referencing one of those timeseries by its ID.
     """
 
-    time_scenario_series: pd.DataFrame
+    time_scenario_series: "pd.DataFrame"
     scenarization: Optional[Scenarization] = None
 
     def get_value(
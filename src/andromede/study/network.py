@@ -15,8 +15,8 @@ The network module defines the data model for an instance of network,
 including nodes, links, and components (model instantations).
 """
 import itertools
-from dataclasses import dataclass, field, replace
-from typing import Any, Dict, Iterable, List, cast
+from dataclasses import InitVar, dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
 
 from andromede.model import PortField, PortType
 from andromede.model.model import Model
@@ -63,48 +63,88 @@ class PortRef:
     port_id: str
 
 
-@dataclass()
-class PortsConnection:
-    port1: PortRef
-    port2: PortRef
-    master_port: Dict[PortField, PortRef] = field(init=False, default_factory=dict)
-
-    def __post_init__(self) -> None:
-        self.__validate_ports()
+# Port compatibility only depends on the models and ports involved, it is
+# computed once for each combination connected in the same network or system.
+# Models are not hashable, entries are identified by the identity of models,
+# which are kept alive by the memo so that their identity cannot be reused.
+PortDefinitionsMemo = Dict[
+    Tuple[int, str, int, str], Tuple[Model, Model, Dict[PortField, bool]]
+]
 
-    def __validate_ports(self) -> None:
-        model1 = self.port1.component.model
-        model2 = self.port2.component.model
-        port_1 = model1.ports.get(self.port1.port_id)
-        port_2 = model2.ports.get(self.port2.port_id)
 
-        if port_1 is None or port_2 is None:
-            raise ValueError(f"Missing port: {port_1} or {port_2} ")
-        if port_1.port_type != port_2.port_type:
+def _port_field_definition_sides(
+    model1: Model,
+    port_id1: str,
+    model2: Model,
+    port_id2: str,
+    memo: Optional[PortDefinitionsMemo] = None,
+) -> Dict[PortField, bool]:
+    """
+    Checks that the 2 ports can be connected, and returns for each field
+    of their port type whether it is defined by the first port (True),
+    or by the second one (False).
+    """
+    key = (id(model1), port_id1, id(model2), port_id2)
+    if memo is not None and key in memo:
+        return memo[key][2]
+
+    port_1 = model1.ports.get(port_id1)
+    port_2 = model2.ports.get(port_id2)
+
+    if port_1 is None or port_2 is None:
+        raise ValueError(f"Missing port: {port_1} or {port_2} ")
+    if port_1.port_type != port_2.port_type:
+        raise ValueError(
+            f"Incompatible portTypes {port_1.port_type} != {port_2.port_type}"
+        )
+
+    definitions = {}
+    for field_name in [f.name for f in port_1.port_type.fields]:
+        def1: bool = (
+            PortFieldId(port_name=port_1.port_name, field_name=field_name)
+            in model1.port_fields_definitions
+        )
+        def2: bool = (
+            PortFieldId(port_name=port_2.port_name, field_name=field_name)
+            in model2.port_fields_definitions
+        )
+        if not def1 and not def2:
             raise ValueError(
-                f"Incompatible portTypes {port_1.port_type} != {port_2.port_type}"
+                f"No definition for port field {field_name} on {port_1.port_name}."
             )
-
-        for field_name in [f.name for f in port_1.port_type.fields]:
-            def1: bool = (
-                PortFieldId(port_name=port_1.port_name, field_name=field_name)
-                in model1.port_fields_definitions
-            )
-            def2: bool = (
-                PortFieldId(port_name=port_2.port_name, field_name=field_name)
-                in model2.port_fields_definitions
+        if def1 and def2:
+            raise ValueError(
+                f"Port field {field_name} on {port_1.port_name} has 2 definitions."
             )
-            if not def1 and not def2:
-                raise ValueError(
-                    f"No definition for port field {field_name} on {port_1.port_name}."
-                )
-            if def1 and def2:
-                raise ValueError(
-                    f"Port field {field_name} on {port_1.port_name} has 2 definitions."
-                )
-
-            self.master_port[PortField(name=field_name)] = (
-                self.port1 if def1 else self.port2
+        definitions[PortField(name=field_name)] = def1
+
+    if memo is not None:
+        memo[key] = (model1, model2, definitions)
+    return definitions
+
+
+@dataclass()
+class PortsConnection:
+    port1: PortRef
+    port2: PortRef
+    master_port: Dict[PortField, PortRef] = field(init=False, default_factory=dict)
+    # Port definitions already computed for other connections
+    memo: InitVar[Optional[PortDefinitionsMemo]] = None
+
+    def __post_init__(self, memo: Optional[PortDefinitionsMemo]) -> None:
+        self.__validate_ports(memo)
+
+    def __validate_ports(self, memo: Optional[PortDefinitionsMemo]) -> None:
+        definitions = _port_field_definition_sides(
+            self.port1.component.model,
+            self.port1.port_id,
+            self.port2.component.model,
+            self.port2.port_id,
+            memo,
+        )
+        for port_field, defined_by_port1 in definitions.items():
+            self.master_port[port_field] = (
+                self.port1 if defined_by_port1 else self.port2
             )
 
     def get_port_type(self) -> PortType:
@@ -129,6 +169,13 @@ class Network:
     _nodes: Dict[str, Node] = field(init=False, default_factory=dict)
     _components: Dict[str, Component] = field(init=False, default_factory=dict)
     _connections: List[PortsConnection] = field(init=False, default_factory=list)
+    # Connections of each port, indexed by component ID then port ID
+    _port_connections: Dict[str, Dict[str, List[PortsConnection]]] = field(
+        init=False, default_factory=dict
+    )
+    _port_definitions: PortDefinitionsMemo = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
 
     def _check_node_exists(self, node_id: str) -> None:
         if node_id not in self._nodes:
@@ -145,6 +192,12 @@ class Network:
         res = self._components.get(component_id, None)
         return res if res else self._nodes[component_id]
 
+    def has_component(self, component_id: str) -> bool:
+        """
+        Whether a component or a node has this ID.
+        """
+        return component_id in self._components or component_id in self._nodes
+
     @property
     def components(self) -> Iterable[Component]:
         return self._components.values()
@@ -167,8 +220,44 @@ class Network:
         return itertools.chain(self.nodes, self.components)
 
     def connect(self, port1: PortRef, port2: PortRef) -> None:
-        ports_connection = PortsConnection(port1, port2)
-        self._connections.append(ports_connection)
+        ports_connection = PortsConnection(port1, port2, self._port_definitions)
+        self._add_connection(ports_connection)
+
+    def _add_connection(self, connection: PortsConnection) -> None:
+        self._connections.append(connection)
+        for port in [connection.port1, connection.port2]:
+            component_ports = self._port_connections.setdefault(port.component.id, {})
+            component_ports.setdefault(port.port_id, []).append(connection)
+
+    def remove_component(self, component_id: str) -> List[PortsConnection]:
+        """
+        Removes the component (possibly a node) and its connections,
+        returns the removed connections.
+        """
+        if self._components.pop(component_id, None) is None:
+            del self._nodes[component_id]
+        removed = [
+            connection
+            for connections in self._port_connections.pop(component_id, {}).values()
+            for connection in connections
+        ]
+        # Connections are compared by identity, as components compare their models
+        removed_ids = {id(connection) for connection in removed}
+        for connection in removed:
+            for port in [connection.port1, connection.port2]:
+                port_connections = self._port_connections.get(port.component.id, {})
+                if port.port_id in port_connections:
+                    port_connections[port.port_id] = [
+                        c
+                        for c in port_connections[port.port_id]
+                        if id(c) not in removed_ids
+                    ]
+        self._connections = [
+            connection
+            for connection in self._connections
+            if id(connection) not in removed_ids
+        ]
+        return removed
 
     @property
     def connections(self) -> Iterable[PortsConnection]:
@@ -177,6 +266,15 @@ class Network:
     def get_connection(self, idx: int) -> PortsConnection:
         return self._connections[idx]
 
+    def get_port_connections(
+        self, component_id: str
+    ) -> Dict[str, List[PortsConnection]]:
+        """
+        Connections of the ports of a component, indexed by port ID,
+        in the order in which they were added to the network.
+        """
+        return self._port_connections.get(component_id, {})
+
     def is_empty(self) -> bool:
         return (not self._nodes) and (not self._components) and (not self._connections)
 
@@ -190,6 +288,6 @@ class Network:
             replica.add_component(component.replicate())
 
         for connection in self.connections:
-            replica._connections.append(connection.replicate())
+            replica._add_connection(connection.replicate())
 
         return replica
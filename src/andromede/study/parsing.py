@@ -14,21 +14,129 @@ import argparse
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, TextIO, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TextIO, Union
 
-import pandas as pd
+import yaml
 from pydantic import Field
-from yaml import safe_load
+from yaml.composer import Composer
+from yaml.events import (
+    DocumentStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+)
 
-from andromede.utils import ModifiedBaseModel
+from andromede.input_model import ModifiedBaseModel
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def parse_yaml_components(input_study: TextIO) -> "InputSystem":
-    tree = safe_load(input_study)
-    return InputSystem.model_validate(tree["system"])
 
+# The loader based on libyaml is much faster, but may not be available
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _SafeLoader  # type: ignore
+
+
+class _ComponentsLoader(_SafeLoader, Composer):
+    """
+    Safe YAML loader, which also gives access to the composition
+    of individual nodes, in order to load a document piece by piece.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self.anchors: Dict[Any, Any] = {}
+
+    def load_node(self) -> Any:
+        """
+        Composes and constructs the next node of the stream.
+        """
+        return self.construct_document(self.compose_node(None, None))  # type: ignore
+
+
+def _expect_mapping_start(loader: _ComponentsLoader) -> None:
+    if not loader.check_event(MappingStartEvent):
+        raise KeyError("system")
+    loader.get_event()
+
+
+def _load_system(
+    input_study: TextIO, item_loaders: Dict[str, Callable[[Any], Any]]
+) -> Dict[str, Any]:
+    """
+    Loads the "system" section of a components file.
+
+    Items of the lists named in item_loaders are converted one at a time,
+    as soon as they are read, so that the YAML tree of the whole file
+    is never held in memory.
+    """
+    loader = _ComponentsLoader(input_study)
+    try:
+        loader.get_event()  # Stream start
+        if loader.check_event(DocumentStartEvent):
+            loader.get_event()
+        _expect_mapping_start(loader)
+        while not loader.check_event(MappingEndEvent):
+            key = loader.load_node()
+            if key != "system":
+                loader.load_node()
+                continue
+            _expect_mapping_start(loader)
+            system: Dict[str, Any] = {}
+            while not loader.check_event(MappingEndEvent):
+                section = loader.load_node()
+                item_loader = item_loaders.get(section)
+                if item_loader is not None and loader.check_event(SequenceStartEvent):
+                    loader.get_event()
+                    items = []
+                    while not loader.check_event(SequenceEndEvent):
+                        items.append(item_loader(loader.load_node()))
+                    loader.get_event()
+                    system[section] = items
+                else:
+                    system[section] = loader.load_node()
+            return system
+        raise KeyError("system")
+    finally:
+        loader.dispose()
+
+
+def parse_yaml_components(input_study: TextIO, trusted: bool = False) -> "InputSystem":
+    """
+    Parses a components file.
+
+    Components are read and converted one by one, which keeps memory usage low
+    on very large files. If the input is trusted, for example when it has been
+    generated by one of the converters, per-field validation is skipped.
+    """
+    if trusted:
+        system = _load_system(
+            input_study,
+            {
+                "nodes": _construct_component,
+                "components": _construct_component,
+                "connections": _construct_connection,
+            },
+        )
+        return InputSystem.model_construct(**system)
+
+    system = _load_system(
+        input_study,
+        {
+            "nodes": InputComponent.model_validate,
+            "components": InputComponent.model_validate,
+            "connections": InputPortConnections.model_validate,
+        },
+    )
+    return InputSystem.model_validate(system)
+
+
+def parse_scenario_builder(file: Path) -> "pd.DataFrame":
+    import pandas as pd
 
-def parse_scenario_builder(file: Path) -> pd.DataFrame:
     sb = pd.read_csv(file, names=("name", "year", "scenario"))
     sb.rename(columns={0: "name", 1: "year", 2: "scenario"})
     return sb
@@ -56,6 +164,27 @@ class InputComponent(ModifiedBaseModel):
     parameters: Optional[List[InputComponentParameter]] = None
 
 
+def _construct_parameter(values: Dict[str, Any]) -> InputComponentParameter:
+    value = values.get("value")
+    if isinstance(value, int) and not isinstance(value, bool):
+        values["value"] = float(value)
+    return InputComponentParameter.model_construct(**values)
+
+
+def _construct_component(values: Dict[str, Any]) -> InputComponent:
+    """
+    Builds a component without validation, for trusted inputs.
+    """
+    parameters = values.get("parameters")
+    if parameters is not None:
+        values["parameters"] = [_construct_parameter(p) for p in parameters]
+    return InputComponent.model_construct(**values)
+
+
+def _construct_connection(values: Dict[str, Any]) -> InputPortConnections:
+    return InputPortConnections.model_construct(**values)
+
+
 class InputSystem(ModifiedBaseModel):
     model_libraries: Optional[str] = None  # Parsed but unused for now
     nodes: List[InputComponent] = Field(default_factory=list)
@@ -63,6 +192,48 @@ class InputSystem(ModifiedBaseModel):
     connections: List[InputPortConnections] = Field(default_factory=list)
 
 
+def parse_yaml_sweep(input_sweep: TextIO) -> "InputSweep":
+    """
+    Parses a sweep file: the "sweep" section of a YAML document.
+    """
+    tree = yaml.load(input_sweep, Loader=_SafeLoader)
+    if not isinstance(tree, dict) or "sweep" not in tree:
+        raise KeyError("sweep")
+    return InputSweep.model_validate(tree["sweep"] or {})
+
+
+class InputSweepOverride(ModifiedBaseModel):
+    component: str
+    parameter: str
+    time_dependent: bool = False
+    scenario_dependent: bool = False
+    value: Union[float, str]
+
+
+class InputSweepAxis(ModifiedBaseModel):
+    component: str
+    parameter: str
+    time_dependent: bool = False
+    scenario_dependent: bool = False
+    values: List[Union[float, str]]
+
+
+class InputSweepOutput(ModifiedBaseModel):
+    component: str
+    variable: str
+
+
+class InputSweep(ModifiedBaseModel):
+    """
+    Variants of a sweep: all combinations of the values of the grid axes,
+    followed by the listed variants.
+    """
+
+    grid: List[InputSweepAxis] = Field(default_factory=list)
+    variants: List[List[InputSweepOverride]] = Field(default_factory=list)
+    outputs: List[InputSweepOutput] = Field(default_factory=list)
+
+
 @dataclass(frozen=True)
 class ParsedArguments:
     models_path: List[Path]
@@ -70,6 +241,22 @@ class ParsedArguments:
     timeseries_path: Path
     duration: int
     nb_scenarios: int
+    lib_cache_dir: Optional[Path] = None
+    output_dir: Optional[Path] = None
+    with_duals: bool = False
+    solver: str = "SCIP"
+    threads: Optional[int] = None
+    time_limit: Optional[float] = None
+    presolve: Optional[bool] = None
+    lp_algorithm: Optional[str] = None
+    mip_gap: Optional[float] = None
+    solver_parameters: str = ""
+    sweep_path: Optional[Path] = None
+    build_presolve: bool = False
+    aggregate_variables: bool = False
+
+
+DEFAULT_LIB_CACHE_DIR = Path.home() / ".cache" / "andromede" / "libraries"
 
 
 def parse_cli() -> ParsedArguments:
@@ -92,6 +279,70 @@ def parse_cli() -> ParsedArguments:
     parser.add_argument(
         "--scenario", type=int, help="number of scenario of the simulation", default=1
     )
+    parser.add_argument(
+        "--lib-cache-dir",
+        type=Path,
+        help="directory where resolved model libraries are cached",
+        default=DEFAULT_LIB_CACHE_DIR,
+    )
+    parser.add_argument(
+        "--no-lib-cache",
+        action="store_true",
+        help="always parse model libraries, without using the cache",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        help="directory where results are written, as Parquet files",
+    )
+    parser.add_argument(
+        "--with-duals",
+        action="store_true",
+        help="also write dual values of constraints to the output directory",
+    )
+    parser.add_argument(
+        "--solver",
+        help="solver ID: an OR-Tools solver (SCIP, GLOP ...) or SCIPY_HIGHS",
+        default="SCIP",
+    )
+    parser.add_argument("--threads", type=int, help="number of solver threads")
+    parser.add_argument(
+        "--time-limit", type=float, help="time limit of the solve, in seconds"
+    )
+    parser.add_argument(
+        "--presolve",
+        action=argparse.BooleanOptionalAction,
+        help="enable or disable the presolve of the solver",
+    )
+    parser.add_argument(
+        "--build-presolve",
+        action="store_true",
+        help="presolve the built problem before loading it in the solver",
+    )
+    parser.add_argument(
+        "--aggregate-variables",
+        action="store_true",
+        help="also eliminate variables defined by another variable in the presolve",
+    )
+    parser.add_argument(
+        "--lp-algorithm",
+        choices=["PRIMAL", "DUAL", "BARRIER"],
+        help="algorithm of the solver for LP problems",
+    )
+    parser.add_argument(
+        "--mip-gap", type=float, help="relative gap at which MIP solves stop"
+    )
+    parser.add_argument(
+        "--solver-parameters",
+        default="",
+        help="solver-specific parameters, in the format of the solver",
+    )
+
+    parser.add_argument(
+        "--sweep",
+        type=Path,
+        help="sweep file, *.yml: solves the study for each variant of its parameters",
+    )
 
     args = parser.parse_args()
 
@@ -117,5 +368,22 @@ def parse_cli() -> ParsedArguments:
         model_paths = args.models
 
     return ParsedArguments(
-        model_paths, components_path, timeseries_dir, args.duration, args.scenario
+        model_paths,
+        components_path,
+        timeseries_dir,
+        args.duration,
+        args.scenario,
+        None if args.no_lib_cache else args.lib_cache_dir,
+        args.output_dir,
+        args.with_duals,
+        args.solver,
+        args.threads,
+        args.time_limit,
+        args.presolve,
+        args.lp_algorithm,
+        args.mip_gap,
+        args.solver_parameters,
+        args.sweep,
+        args.build_presolve,
+        args.aggregate_variables,
     )
@@ -9,11 +9,10 @@
 # SPDX-License-Identifier: MPL-2.0
 #
 # This file is part of the Antares project.
+import itertools
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Union
-
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
 
 from andromede.model import Model
 from andromede.model.library import Library
@@ -36,7 +35,17 @@ from andromede.study.data import (
     dataframe_to_time_series,
     load_ts_from_txt,
 )
-from andromede.study.parsing import InputComponent, InputPortConnections, InputSystem
+from andromede.study.network import PortDefinitionsMemo
+from andromede.study.parsing import (
+    InputComponent,
+    InputPortConnections,
+    InputSweep,
+    InputSweepAxis,
+    InputSystem,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass(frozen=True)
@@ -67,11 +76,14 @@ def resolve_system(input_system: InputSystem, libraries: dict[str, Library]) ->
         _resolve_component(libraries, m) for m in input_system.components
     ]
     nodes = [_resolve_component(libraries, n) for n in input_system.nodes]
-    all_components: List[Component] = components_list + nodes
-    connections = []
-    for cnx in input_system.connections:
-        resolved_cnx = _resolve_connections(cnx, all_components)
-        connections.append(resolved_cnx)
+    components_by_id = {
+        component.id: component for component in components_list + nodes
+    }
+    port_definitions: PortDefinitionsMemo = {}
+    connections = [
+        _resolve_connections(cnx, components_by_id, port_definitions)
+        for cnx in input_system.connections
+    ]
 
     return system(components_list, nodes, connections)
 
@@ -90,27 +102,21 @@ def _resolve_component(
 
 def _resolve_connections(
     connection: InputPortConnections,
-    all_components: List[Component],
+    components_by_id: Dict[str, Component],
+    port_definitions: PortDefinitionsMemo,
 ) -> PortsConnection:
     cnx_component1 = connection.component1
     cnx_component2 = connection.component2
     port1 = connection.port1
     port2 = connection.port2
 
-    component_1 = _get_component_by_id(all_components, cnx_component1)
-    component_2 = _get_component_by_id(all_components, cnx_component2)
+    component_1 = components_by_id.get(cnx_component1)
+    component_2 = components_by_id.get(cnx_component2)
     assert component_1 is not None and component_2 is not None
     port_ref_1 = PortRef(component_1, port1)
     port_ref_2 = PortRef(component_2, port2)
 
-    return PortsConnection(port_ref_1, port_ref_2)
-
-
-def _get_component_by_id(
-    all_components: List[Component], component_id: str
-) -> Optional[Component]:
-    components_dict = {component.id: component for component in all_components}
-    return components_dict.get(component_id)
+    return PortsConnection(port_ref_1, port_ref_2, port_definitions)
 
 
 def consistency_check(
@@ -196,7 +202,7 @@ def _build_data(
 
 
 def _resolve_scenarization(
-    scenario_builder_data: pd.DataFrame,
+    scenario_builder_data: "pd.DataFrame",
 ) -> Dict[str, Scenarization]:
     output: Dict[str, Scenarization] = {}
     for i, row in scenario_builder_data.iterrows():
@@ -209,7 +215,7 @@ def _resolve_scenarization(
 
 def build_scenarized_data_base(
     input_comp: InputSystem,
-    scenario_builder_data: pd.DataFrame,
+    scenario_builder_data: "pd.DataFrame",
     timeseries_dir: Optional[Path],
 ) -> DataBase:
     database = DataBase()
@@ -234,3 +240,43 @@ def build_scenarized_data_base(
             database.add_data(comp.id, param.id, param_value)
 
     return database
+
+
+def build_sweep_variants(
+    input_sweep: InputSweep, timeseries_dir: Optional[Path]
+) -> List[Dict[Tuple[str, str], AbstractDataStructure]]:
+    """
+    Overrides of each variant of the sweep, by component ID and parameter name.
+    """
+    axes = [
+        [
+            ((axis.component, axis.parameter), value)
+            for value in _axis_values(axis, timeseries_dir)
+        ]
+        for axis in input_sweep.grid
+    ]
+    variants = (
+        [dict(combination) for combination in itertools.product(*axes)] if axes else []
+    )
+    for input_variant in input_sweep.variants:
+        variants.append(
+            {
+                (override.component, override.parameter): _build_data(
+                    override.time_dependent,
+                    override.scenario_dependent,
+                    override.value,
+                    timeseries_dir,
+                )
+                for override in input_variant
+            }
+        )
+    return variants
+
+
+def _axis_values(
+    axis: InputSweepAxis, timeseries_dir: Optional[Path]
+) -> List[AbstractDataStructure]:
+    return [
+        _build_data(axis.time_dependent, axis.scenario_dependent, value, timeseries_dir)
+        for value in axis.values
+    ]
@@ -10,15 +10,29 @@
 #
 # This file is part of the Antares project.
 import cProfile
+import io
 import math
+import os
+import subprocess
+import sys
+import time
 from pstats import SortKey
-from typing import cast
+from typing import Callable, Dict, List, Optional, Tuple, cast
 
 import pandas as pd
+import yaml
 
+from andromede.expression.equality import expressions_equal
 from andromede.expression.expression import ExpressionNode, literal, param, var
 from andromede.expression.indexing_structure import IndexingStructure
+from andromede.expression.parsing.fast_parse import fast_parse_expression
+from andromede.expression.parsing.parse_expression import (
+    AntaresParseException,
+    ModelIdentifiers,
+    parse_expression_with_antlr,
+)
 from andromede.model import float_parameter, float_variable, model
+from andromede.model.library import library
 from andromede.simulation import TimeBlock, build_problem
 from andromede.study import (
     ConstantData,
@@ -29,12 +43,21 @@ from andromede.study import (
     create_component,
 )
 from andromede.study.data import TimeScenarioSeriesData
+from andromede.study.parsing import (
+    InputComponent,
+    InputPortConnections,
+    InputSystem,
+    parse_yaml_components,
+)
+from andromede.study.resolve_components import resolve_system
 from tests.e2e.functional.libs.standard import (
+    BALANCE_PORT_TYPE,
     DEMAND_MODEL,
     GENERATOR_MODEL,
     GENERATOR_MODEL_WITH_STORAGE,
     NODE_BALANCE_MODEL,
 )
+from tests.unittests.expressions.parsing.utils import expression_corpus
 
 
 def generate_scalar_matrix_data(
@@ -283,3 +306,180 @@ def test_basic_balance_on_whole_year_with_large_sum() -> None:
 
     assert status == problem.solver.OPTIMAL
     assert problem.solver.Objective().Value() == 30 * 100 * horizon
+
+
+def _parsing_throughput(
+    parser: Callable[[str, ModelIdentifiers], Optional[ExpressionNode]],
+    corpus: List[Tuple[str, ModelIdentifiers]],
+    passes: int,
+) -> float:
+    start = time.perf_counter()
+    for _ in range(passes):
+        for expression, identifiers in corpus:
+            parser(expression, identifiers)
+    return passes * len(corpus) / (time.perf_counter() - start)
+
+
+def test_expression_parsing_throughput() -> None:
+    """
+    Compares the throughput of the ANTLR parser and of the fast parser,
+    on all the valid expressions of the libraries of the repository,
+    which both parsers must parse to the same trees.
+    """
+    corpus = []
+    expected = []
+    for expression, identifiers in expression_corpus():
+        try:
+            expected.append(parse_expression_with_antlr(expression, identifiers))
+        except AntaresParseException:
+            # Some libraries are invalid on purpose, to test error cases
+            continue
+        corpus.append((expression, identifiers))
+    passes = 5
+
+    antlr_throughput = _parsing_throughput(parse_expression_with_antlr, corpus, passes)
+    fast_throughput = _parsing_throughput(fast_parse_expression, corpus, passes)
+    print(
+        f"Parsing throughput (expressions/s): ANTLR {antlr_throughput:.0f}, "
+        f"fast parser {fast_throughput:.0f}"
+    )
+    for (expression, identifiers), tree in zip(corpus, expected):
+        parsed = fast_parse_expression(expression, identifiers)
+        assert parsed is not None and expressions_equal(parsed, tree), expression
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """
+    Imports the module in a new interpreter, and returns the cumulative
+    import time, in microseconds, of each module it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time() -> None:
+    """
+    Heavy dependencies must not be imported at startup of the simulator
+    or of processes which only build and solve problems.
+    """
+    for module, lazy_dependencies in [
+        ("andromede.main.main", ["pandas", "antlr4", "andromede.model.parsing"]),
+        ("andromede.simulation", ["pandas", "antlr4", "pydantic", "scipy"]),
+    ]:
+        times = _import_times(module)
+        print(f"Import time of {module}: {times[module] / 1000:.0f} ms")
+
+        for dependency in lazy_dependencies:
+            assert dependency not in times, f"{module} imports {dependency}"
+
+
+def _generate_components_file(components_count: int) -> str:
+    lines = ["system:", "  nodes:", "    - id: N", "      model: node", "  components:"]
+    for i in range(components_count):
+        lines += [
+            f"    - id: G{i}",
+            "      model: generator",
+            "      parameters:",
+            "        - id: cost",
+            f"          value: {i}",
+            "        - id: p_max",
+            "          time-dependent: true",
+            "          scenario-dependent: true",
+            f"          value: p_max_{i}",
+        ]
+    lines.append("  connections:")
+    for i in range(components_count):
+        lines += [
+            f"    - component1: G{i}",
+            "      port1: balance_port",
+            "      component2: N",
+            "      port2: balance_port",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def test_components_file_loading() -> None:
+    """
+    Compares full loading with the pure Python YAML loader
+    and streamed loading of a large components file.
+    """
+    components_count = 2000
+    content = _generate_components_file(components_count)
+
+    start = time.perf_counter()
+    tree = yaml.load(io.StringIO(content), Loader=yaml.SafeLoader)
+    expected = InputSystem.model_validate(tree["system"])
+    full_duration = time.perf_counter() - start
+
+    durations = {}
+    for trusted in [False, True]:
+        start = time.perf_counter()
+        input_system = parse_yaml_components(io.StringIO(content), trusted)
+        durations[trusted] = time.perf_counter() - start
+        assert input_system == expected
+
+    print(
+        f"Loading of {components_count} components: full {full_duration:.2f} s, "
+        f"streamed {durations[False]:.2f} s, trusted {durations[True]:.2f} s"
+    )
+
+
+def _star_input_system(connections_count: int, nodes_count: int) -> InputSystem:
+    """
+    Generators, each connected to one of the nodes.
+    """
+    return InputSystem.model_construct(
+        nodes=[
+            InputComponent.model_construct(id=f"N{i}", model="std.NODE_BALANCE_MODEL")
+            for i in range(nodes_count)
+        ],
+        components=[
+            InputComponent.model_construct(id=f"G{i}", model="std.GEN")
+            for i in range(connections_count)
+        ],
+        connections=[
+            InputPortConnections.model_construct(
+                component1=f"G{i}",
+                port1="balance_port",
+                component2=f"N{i % nodes_count}",
+                port2="balance_port",
+            )
+            for i in range(connections_count)
+        ],
+    )
+
+
+def test_system_resolution_scales_linearly() -> None:
+    """
+    System resolution time, which grows linearly with the number of connections.
+
+    Sizes are kept moderate for the test suite, the same holds up to
+    1 million connections (about 15 s).
+    """
+    libraries = {
+        "std": library(
+            "std", [BALANCE_PORT_TYPE], [GENERATOR_MODEL, NODE_BALANCE_MODEL]
+        )
+    }
+
+    for connections_count in [1_000, 10_000, 100_000]:
+        input_system = _star_input_system(connections_count, nodes_count=100)
+        start = time.perf_counter()
+        resolved = resolve_system(input_system, libraries)
+        duration = time.perf_counter() - start
+        assert len(resolved.connections) == connections_count
+
+        print(f"Resolution of {connections_count} connections: {duration:.2f} s")
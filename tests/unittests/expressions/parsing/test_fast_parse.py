@@ -0,0 +1,80 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import pytest
+
+from andromede.expression.equality import expressions_equal
+from andromede.expression.parsing.fast_parse import fast_parse_expression
+from andromede.expression.parsing.parse_expression import (
+    AntaresParseException,
+    ModelIdentifiers,
+    parse_expression_with_antlr,
+)
+from tests.unittests.expressions.parsing.utils import expression_corpus
+
+
+def test_fast_parser_matches_antlr_on_all_libraries() -> None:
+    corpus = expression_corpus()
+    assert len(corpus) > 100
+
+    for expression, identifiers in corpus:
+        parsed = fast_parse_expression(expression, identifiers)
+        try:
+            expected = parse_expression_with_antlr(expression, identifiers)
+        except AntaresParseException:
+            # Some libraries are invalid on purpose, to test error cases
+            assert parsed is None, expression
+            continue
+        assert parsed is not None, f"Not handled by fast parser: {expression}"
+        assert expressions_equal(parsed, expected), expression
+
+
+@pytest.mark.parametrize(
+    "expression_str",
+    [
+        "-x * p + 2 / p - -x",
+        "x[t-2*d+1] + x[t-1+d*2] + x[t-2-d+1] + x[t - (d + 1) * 2 / p]",
+        "x[t+0] + x[t] + x[t+p] + x[-1] + x[p - 1]",
+        "sum(t - d + 1 .. t, x) <= sum(t..t+2, x * p)",
+        "expec(sum(p * x)) + sum_connections(port.f) - port.f",
+        "p * (x + 1.5) >= -(2 * x - p) / 3",
+        "x = p = x",
+    ],
+)
+def test_fast_parser_matches_antlr(expression_str: str) -> None:
+    identifiers = ModelIdentifiers(variables={"x"}, parameters={"p", "d"})
+    parsed = fast_parse_expression(expression_str, identifiers)
+    assert parsed is not None
+    assert expressions_equal(
+        parsed, parse_expression_with_antlr(expression_str, identifiers)
+    )
+
+
+@pytest.mark.parametrize(
+    "expression_str",
+    [
+        "1**3",
+        "1 6",
+        "x[t+1-t]",
+        "x[2*t]",
+        "x[t 4]",
+        "t + 1",
+        "y + 1",
+        "sqrt(x)",
+        "(x)[t-1]",
+        "x < p",
+        "",
+    ],
+)
+def test_fast_parser_gives_up_on_unsupported_input(expression_str: str) -> None:
+    identifiers = ModelIdentifiers(variables={"x"}, parameters={"p"})
+    assert fast_parse_expression(expression_str, identifiers) is None
@@ -0,0 +1,66 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+from pathlib import Path
+from typing import List, Tuple
+
+import yaml
+
+from andromede.expression.parsing.parse_expression import ModelIdentifiers
+from andromede.model.parsing import InputLibrary, parse_yaml_library
+
+ROOT_DIR = Path(__file__).parents[4]
+
+
+def _input_libraries() -> List[Tuple[Path, InputLibrary]]:
+    libraries = []
+    for directory in [ROOT_DIR / "src", ROOT_DIR / "tests"]:
+        for path in sorted(directory.rglob("*.yml")):
+            with path.open() as f:
+                try:
+                    content = yaml.safe_load(f)
+                except yaml.YAMLError:
+                    continue
+            if not isinstance(content, dict) or "library" not in content:
+                continue
+            with path.open() as f:
+                try:
+                    libraries.append((path, parse_yaml_library(f)))
+                except ValueError:
+                    # Invalid libraries used to test error cases
+                    continue
+    return libraries
+
+
+def expression_corpus() -> List[Tuple[str, ModelIdentifiers]]:
+    """
+    All expressions of all the libraries of the repository.
+    """
+    corpus = []
+    for _, library in _input_libraries():
+        for model in library.models:
+            identifiers = ModelIdentifiers(
+                variables={v.id for v in model.variables},
+                parameters={p.id for p in model.parameters},
+            )
+            expressions = [model.objective]
+            for constraint in model.constraints + model.binding_constraints:
+                expressions += [
+                    constraint.expression,
+                    constraint.lower_bound,
+                    constraint.upper_bound,
+                ]
+            for variable in model.variables:
+                expressions += [variable.lower_bound, variable.upper_bound]
+            for definition in model.port_field_definitions:
+                expressions.append(definition.definition)
+            corpus.extend((e, identifiers) for e in expressions if e)
+    return corpus
@@ -15,12 +15,13 @@ from typing import Dict
 
 import pytest
 
-from andromede.expression import ExpressionNode, LiteralNode
+from andromede.expression import ExpressionNode, LiteralNode, literal
 from andromede.expression.equality import expressions_equal
 from andromede.expression.expression import (
     CurrentScenarioIndex,
     NoScenarioIndex,
     NoTimeIndex,
+    OneScenarioIndex,
     ProblemParameterNode,
     ProblemVariableNode,
     TimeShift,
@@ -141,3 +142,23 @@ def test_time_scenario_independent_var_has_no_time_or_scenario_index():
         expr, ProblemDimensions(2, 1), evaluate_literal, structure_provider
     )
     assert expanded == X_at(0) + const() + X_at(1) + const()
+
+
+def test_expectation_with_scenario_weights() -> None:
+    def x_of(scenario: int) -> ProblemVariableNode:
+        return problem_var("c", "x", TimeShift(0), OneScenarioIndex(scenario))
+
+    uniform = expand_operators(
+        X.expec(), ProblemDimensions(1, 2), evaluate_literal, AllTimeScenarioDependent()
+    )
+    weighted = expand_operators(
+        X.expec(),
+        ProblemDimensions(1, 2, [0.25, 0.75]),
+        evaluate_literal,
+        AllTimeScenarioDependent(),
+    )
+
+    assert expressions_equal(uniform, (x_of(0) + x_of(1)) / 2)
+    assert expressions_equal(
+        weighted, literal(0.25) * x_of(0) + literal(0.75) * x_of(1)
+    )
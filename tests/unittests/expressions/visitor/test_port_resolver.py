@@ -46,3 +46,17 @@ def test_port_field_resolution_sum() -> None:
         resolve_port(expression_2, "com_id", ports_expressions),
         var("flow1") + var("flow2"),
     )
+
+
+def test_port_field_sum_is_built_once() -> None:
+    key = PortFieldKey("com_id", PortFieldId(field_name="field", port_name="port"))
+    ports_expressions = {key: [var("flow1"), var("flow2")]}
+    ports_sums: Dict[PortFieldKey, ExpressionNode] = {}
+
+    expression = port_field("port", "field").sum_connections()
+    first = resolve_port(expression, "com_id", ports_expressions, ports_sums)
+    second = resolve_port(expression, "com_id", ports_expressions, ports_sums)
+
+    assert expressions_equal(first, var("flow1") + var("flow2"))
+    assert ports_sums == {key: first}
+    assert second is first
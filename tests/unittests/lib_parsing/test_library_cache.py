@@ -0,0 +1,121 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import shutil
+from pathlib import Path
+
+import pytest
+
+import andromede.model.library_cache
+import andromede.model.resolve_library
+from andromede.expression.parsing.parse_expression import (
+    ModelIdentifiers,
+    parse_expression,
+)
+from andromede.main.main import input_libs
+from andromede.model.library_cache import LibraryCache, library_cache_key
+
+
+@pytest.fixture
+def lib_files(libs_dir: Path, tmp_path: Path) -> list[Path]:
+    files = []
+    for name in ["basic_lib.yml", "demand.yml", "production.yml"]:
+        shutil.copy(libs_dir / name, tmp_path / name)
+        files.append(tmp_path / name)
+    return files
+
+
+def test_cached_libraries_are_equal_to_resolved_ones(
+    lib_files: list[Path], tmp_path: Path
+) -> None:
+    cache_dir = tmp_path / "cache"
+
+    resolved = input_libs(lib_files)
+    first = input_libs(lib_files, cache_dir)
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+    second = input_libs(lib_files, cache_dir)
+    assert second is not first
+    assert second.keys() == resolved.keys()
+    for lib_id, lib in resolved.items():
+        cached_lib = second[lib_id]
+        assert cached_lib.port_types == lib.port_types
+        assert cached_lib.models.keys() == lib.models.keys()
+        for model_id, model in lib.models.items():
+            cached_model = cached_lib.models[model_id]
+            assert cached_model.constraints == model.constraints
+            assert cached_model.variables == model.variables
+            assert cached_model.parameters == model.parameters
+
+
+def test_cache_hit_skips_library_resolution(
+    lib_files: list[Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_dir = tmp_path / "cache"
+    input_libs(lib_files, cache_dir)
+
+    def fail(*args, **kwargs):  # type: ignore
+        raise AssertionError("Library should have been loaded from cache")
+
+    monkeypatch.setattr(andromede.model.resolve_library, "resolve_library", fail)
+    assert len(input_libs(lib_files, cache_dir)) == 3
+
+
+def test_cache_key_depends_on_file_content(lib_files: list[Path]) -> None:
+    key = library_cache_key(lib_files)
+    assert library_cache_key(lib_files) == key
+    assert library_cache_key(list(reversed(lib_files))) != key
+
+    with lib_files[0].open("a") as f:
+        f.write("\n# modified\n")
+    assert library_cache_key(lib_files) != key
+
+
+def test_cache_key_depends_on_model_sources(
+    lib_files: list[Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    key = library_cache_key(lib_files)
+
+    # Entries written by another version of the model classes are not used
+    monkeypatch.setattr(
+        andromede.model.library_cache, "_sources_hash", lambda: "other sources"
+    )
+    assert library_cache_key(lib_files) != key
+
+
+def test_corrupted_cache_entry_is_ignored(
+    lib_files: list[Path], tmp_path: Path
+) -> None:
+    cache_dir = tmp_path / "cache"
+    cache = LibraryCache(cache_dir)
+    key = library_cache_key(lib_files)
+    cache_dir.mkdir()
+    (cache_dir / f"{key}.pickle").write_bytes(b"not a pickle")
+
+    assert cache.load(key) is None
+    assert len(input_libs(lib_files, cache_dir)) == 3
+    assert cache.load(key) is not None
+
+
+def test_same_expression_is_parsed_once() -> None:
+    first = parse_expression(
+        "p * x + y", ModelIdentifiers(variables={"x", "y"}, parameters={"p", "q"})
+    )
+    # Other identifiers do not change the parsed tree
+    second = parse_expression(
+        "p * x + y", ModelIdentifiers(variables={"x", "y", "z"}, parameters={"p"})
+    )
+    assert second is first
+
+    other = parse_expression(
+        "p * x + y", ModelIdentifiers(variables={"x", "y", "p"}, parameters=set())
+    )
+    assert other is not first
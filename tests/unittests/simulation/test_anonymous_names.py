@@ -0,0 +1,66 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+
+from andromede.simulation import OutputValues, TimeBlock, build_problem
+from andromede.simulation.optimization import OptimizationProblem
+from tests.unittests.simulation.utils import balance_study
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
+
+
+def _problem(anonymous_names: bool) -> OptimizationProblem:
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G1": GENERATOR_MODEL, "G2": GENERATOR_MODEL},
+        {
+            ("D", "demand"): [[100.0, 50.0], [80.0, 40.0], [60.0, 30.0]],
+            ("G1", "p_max"): 70.0,
+            ("G1", "cost"): 30.0,
+            ("G2", "p_max"): 70.0,
+            ("G2", "cost"): 10.0,
+        },
+    )
+
+    return build_problem(
+        network,
+        database,
+        TimeBlock(1, [0, 1, 2]),
+        2,
+        solver_id="GLOP",
+        anonymous_names=anonymous_names,
+    )
+
+
+def test_names_are_generated_for_anonymous_problems() -> None:
+    named = _problem(anonymous_names=False)
+    anonymous = _problem(anonymous_names=True)
+
+    # No names are given to the solver
+    solver_names = {variable.name() for variable in anonymous.solver.variables()}
+    assert solver_names.isdisjoint(named.variable_names())
+
+    assert anonymous.variable_names() == named.variable_names()
+    assert anonymous.constraint_names() == named.constraint_names()
+    assert "G1_generation_t2_s1" in anonymous.variable_names()
+    assert "N_Balance_t0_s1" in anonymous.constraint_names()
+    assert list(anonymous.solver_variables()) == list(named.solver_variables())
+    assert anonymous.export_as_lp() == named.export_as_lp()
+    assert "G2_generation_t1_s0" in anonymous.export_as_mps()
+
+
+def test_anonymous_problems_have_the_same_solution() -> None:
+    named = _problem(anonymous_names=False)
+    anonymous = _problem(anonymous_names=True)
+    for problem in [named, anonymous]:
+        assert problem.solver.Solve() == problem.solver.OPTIMAL
+
+    assert OutputValues(anonymous) == OutputValues(named)
+    assert anonymous.duals().keys() == named.duals().keys()
@@ -0,0 +1,155 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import math
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import pytest
+
+from andromede.simulation import TimeBlock, build_problem
+from andromede.simulation.backend import (
+    ORToolsBackend,
+    SolverBackend,
+    SparseRows,
+    SparseRowsBuilder,
+)
+from andromede.simulation.matrix_backend import MatrixBackend
+from andromede.simulation.optimization import OptimizationProblem
+from tests.unittests.simulation.utils import (
+    THERMAL_CLUSTER_DATA,
+    BackendFactory,
+    backend_factories,
+    balance_study,
+    proto_content,
+)
+from tests.unittests.system.libs.standard import (
+    DEMAND_MODEL,
+    GENERATOR_MODEL,
+    THERMAL_CLUSTER_MODEL_HD,
+)
+
+LP_BACKENDS = backend_factories("GLOP", with_matrix=False)
+MIP_BACKENDS = backend_factories("SCIP", with_matrix=False)
+
+
+def test_rows_builder() -> None:
+    rows = SparseRowsBuilder()
+    rows.add_row(1, math.inf, [0, 2], [1.0, -1.0], "a")
+    rows.add_row(-math.inf, 3, [], [], "b")
+    rows.add_row(0, 0, [1], [2.0], "c")
+    block = rows.build()
+
+    assert block.size == 3
+    np.testing.assert_array_equal(block.starts, [0, 2, 2, 3])
+    np.testing.assert_array_equal(block.indices, [0, 2, 1])
+    np.testing.assert_array_equal(block.coefficients, [1, -1, 2])
+    assert block.names == ["a", "b", "c"]
+
+    anonymous = SparseRowsBuilder(named=False)
+    anonymous.add_row(0, 1, [0], [1.0])
+    assert anonymous.build().names is None
+
+
+@pytest.mark.parametrize("factory", LP_BACKENDS)
+def test_lp_solution_and_sensitivities(factory: BackendFactory) -> None:
+    # min x + 2y - z + 4, x + y >= 1, x - z in [-5, 5], 0 <= x, y <= 10, z <= 3
+    backend = factory()
+    assert (
+        backend.add_variables(np.array([0.0, 0.0]), np.array([10.0, 10.0]), False) == 0
+    )
+    assert backend.add_variable(-math.inf, 3, False, "z") == 2
+    rows = SparseRows(
+        starts=np.array([0, 2, 5]),
+        indices=np.array([0, 1, 0, 2, 0]),
+        coefficients=np.array([1, 1, 0.5, -1, 0.5]),
+        lower_bounds=np.array([1, -5.0]),
+        upper_bounds=np.array([math.inf, 5]),
+    )
+    assert backend.add_constraints(rows) == 0
+    assert backend.num_constraints() == 2
+    backend.add_objective(np.array([0, 1, 1]), np.array([1.0, 1.0, 1.0]), 1)
+    backend.add_objective(np.array([2]), np.array([-1.0]), 3)
+    np.testing.assert_array_equal(backend.objective_coefficients(), [1, 2, -1])
+
+    assert backend.solve() == lp.Solver.OPTIMAL
+    assert backend.objective_value() == pytest.approx(1 - 3 + 4)
+    np.testing.assert_allclose(backend.variable_values(), [1, 0, 3], atol=1e-9)
+    np.testing.assert_allclose(backend.dual_values(), [1, 0], atol=1e-9)  # type: ignore
+    np.testing.assert_allclose(
+        backend.reduced_costs(), [0, 1, -1], atol=1e-9  # type: ignore
+    )
+
+
+@pytest.mark.parametrize("factory", MIP_BACKENDS)
+def test_mip_solution(factory: BackendFactory) -> None:
+    # max x + y, x + 2y <= 3.5, 2x + y <= 3.5
+    backend = factory()
+    backend.add_variables(np.array([0.0, 0.0]), np.array([10.0, 10.0]), True)
+    backend.add_constraint(-math.inf, 3.5, [0, 1], [1, 2])
+    backend.add_constraint(-math.inf, 3.5, [0, 1], [2, 1])
+    backend.add_objective(np.array([0, 1]), np.array([-1.0, -1.0]), 0)
+
+    assert backend.solve() == lp.Solver.OPTIMAL
+    assert backend.objective_value() == pytest.approx(-2)
+    np.testing.assert_allclose(backend.variable_values(), [1, 1], atol=1e-9)
+    assert backend.dual_values() is None
+
+
+def _build(backend: SolverBackend, anonymous_names: bool) -> OptimizationProblem:
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G": GENERATOR_MODEL, "T": THERMAL_CLUSTER_MODEL_HD},
+        {
+            ("D", "demand"): 150,
+            ("G", "p_max"): 100,
+            ("G", "cost"): 30,
+            **THERMAL_CLUSTER_DATA,
+        },
+    )
+    return build_problem(
+        network,
+        database,
+        TimeBlock(1, [0, 1, 2]),
+        2,
+        anonymous_names=anonymous_names,
+        backend=backend,
+    )
+
+
+@pytest.mark.parametrize("anonymous_names", [False, True])
+# Compared with the OR-Tools backend
+@pytest.mark.parametrize("factory", backend_factories("SCIP")[1:])
+def test_backends_build_the_same_problem(
+    factory: BackendFactory, anonymous_names: bool
+) -> None:
+    reference = _build(ORToolsBackend(lp.Solver.CreateSolver("SCIP")), anonymous_names)
+    problem = _build(factory(), anonymous_names)
+
+    assert proto_content(problem.export_as_proto()) == proto_content(
+        reference.export_as_proto()
+    )
+    assert problem.variable_names() == reference.variable_names()
+    assert problem.constraint_names() == reference.constraint_names()
+    assert list(problem.solver_variables()) == list(reference.solver_variables())
+
+    # Matrix backends can only be solved through scipy
+    if type(problem.backend) is not MatrixBackend:
+        assert problem.solve() == reference.solve() == lp.Solver.OPTIMAL
+        assert problem.objective_value() == pytest.approx(reference.objective_value())
+
+
+def test_matrix_backend_cannot_solve() -> None:
+    backend = MatrixBackend()
+    backend.add_variable(0, 1, False)
+    with pytest.raises(ValueError, match="not held by a solver"):
+        backend.solve()
+    with pytest.raises(ValueError, match="not held by a solver"):
+        backend.variable_values()
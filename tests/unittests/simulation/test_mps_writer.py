@@ -0,0 +1,121 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import gzip
+import io
+from pathlib import Path
+
+import ortools.linear_solver.pywraplp as lp
+import pytest
+from ortools.linear_solver import linear_solver_pb2
+from ortools.linear_solver.python import model_builder as mb
+
+from andromede.simulation import TimeBlock, build_problem
+from andromede.simulation.mps_writer import write_mps, write_mps_files
+from tests.unittests.simulation.utils import balance_study, proto_content
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
+
+
+def _model() -> linear_solver_pb2.MPModelProto:
+    """
+    A model with all kinds of bounds, constraints and variables.
+    """
+    solver = lp.Solver.CreateSolver("SCIP")
+    inf = solver.infinity()
+    x = solver.NumVar(-inf, inf, "free")
+    y = solver.NumVar(1, 5, "bounded")
+    z = solver.IntVar(0, inf, "integer")
+    w = solver.IntVar(-3, -1, "negative_integer")
+    u = solver.NumVar(2, 2, "fixed")
+    v = solver.NumVar(-inf, 4, "upper_bounded")
+    solver.NumVar(0, 1, "unused")
+
+    equality = solver.Constraint(1, 1, "equality")
+    equality.SetCoefficient(x, 1)
+    equality.SetCoefficient(z, 2.5)
+    lower = solver.Constraint(-inf, 3, "less_than")
+    lower.SetCoefficient(y, -1)
+    lower.SetCoefficient(w, 1e-7)
+    ranged = solver.Constraint(-2, 8, "ranged")
+    ranged.SetCoefficient(u, 3)
+    ranged.SetCoefficient(v, 1)
+    ranged.SetCoefficient(x, 1)
+    greater = solver.Constraint(0, inf, "greater_than")
+    greater.SetCoefficient(z, 1)
+
+    objective = solver.Objective()
+    objective.SetCoefficient(y, 2)
+    objective.SetCoefficient(v, -1)
+    objective.SetOffset(7)
+    objective.SetMaximization()
+
+    model = linear_solver_pb2.MPModelProto()
+    solver.ExportModelToProto(model)
+    model.name = "test"
+    return model
+
+
+def _read_mps(content: str) -> linear_solver_pb2.MPModelProto:
+    model = mb.Model()
+    assert model.import_from_mps_string(content)
+    return model.export_to_proto()
+
+
+def test_written_mps_is_read_back_identically() -> None:
+    model = _model()
+    file = io.StringIO()
+    write_mps(model, file)
+
+    assert proto_content(_read_mps(file.getvalue())) == proto_content(model)
+
+
+def test_problem_mps_is_equivalent_to_solver_export() -> None:
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G": GENERATOR_MODEL},
+        {("D", "demand"): 100, ("G", "p_max"): 200, ("G", "cost"): 30},
+    )
+    problem = build_problem(network, database, TimeBlock(1, [0, 1, 2]), 2)
+
+    file = io.StringIO()
+    write_mps(problem.export_as_proto(), file)
+
+    # Spaces in names are replaced, like in the solver export
+    assert "G_Max_generation_t2_s1" in file.getvalue()
+    written = _read_mps(file.getvalue())
+    exported = _read_mps(problem.export_as_mps())
+    assert proto_content(written) == proto_content(exported)
+
+
+def test_unsupported_models_are_rejected() -> None:
+    model = _model()
+    model.general_constraint.add()
+    with pytest.raises(ValueError, match="general constraints"):
+        write_mps(model, io.StringIO())
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_mps_files_are_written_compressed(tmp_path: Path, workers: int) -> None:
+    models = []
+    for index in range(3):
+        model = _model()
+        model.name = f"problem_{index}"
+        models.append(model)
+
+    write_mps_files(
+        ((model, tmp_path / f"{model.name}.mps.gz") for model in models),
+        compress=True,
+        workers=workers,
+    )
+
+    for model in models:
+        with gzip.open(tmp_path / f"{model.name}.mps.gz", "rt") as file:
+            assert proto_content(_read_mps(file.read())) == proto_content(model)
@@ -0,0 +1,263 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+from typing import List, Tuple
+
+import ortools.linear_solver.pywraplp as lp
+import pytest
+
+from andromede.simulation import OutputValues, TimeBlock, build_problem
+from andromede.simulation.backend import ORToolsBackend, SolverBackend
+from andromede.simulation.matrix_backend import MatrixBackend
+from andromede.simulation.optimization import OptimizationProblem
+from andromede.study import (
+    Component,
+    ConstantData,
+    DataBase,
+    Network,
+    Node,
+    PortRef,
+    create_component,
+)
+from tests.unittests.simulation.utils import (
+    BackendFactory,
+    backend_factories,
+    create_database,
+    proto_content,
+)
+from tests.unittests.system.libs.standard import (
+    DEMAND_MODEL,
+    GENERATOR_MODEL,
+    LINK_MODEL,
+    NODE_BALANCE_MODEL,
+    NODE_WITH_SPILL_AND_ENS,
+    SHORT_TERM_STORAGE_SIMPLE,
+)
+
+Connections = List[Tuple[PortRef, PortRef]]
+
+BACKENDS = backend_factories("GLOP")
+
+
+def _database() -> DataBase:
+    return create_database(
+        {
+            ("N1", "spillage_cost"): 1,
+            ("N1", "ens_cost"): 1000,
+            ("N2", "spillage_cost"): 1,
+            ("N2", "ens_cost"): 1000,
+            ("D1", "demand"): [[50.0, 80.0], [120.0, 90.0], [70.0, 20.0]],
+            ("D2", "demand"): [[100.0, 40.0], [30.0, 110.0], [60.0, 150.0]],
+            ("G1", "p_max"): 200,
+            ("G1", "cost"): 10,
+            ("G2", "p_max"): 100,
+            ("G2", "cost"): 50,
+            ("G3", "p_max"): 80,
+            ("G3", "cost"): 20,
+            ("L", "f_max"): 60,
+            ("S", "p_max_injection"): 30,
+            ("S", "p_max_withdrawal"): 30,
+            ("S", "level_min"): 0,
+            ("S", "level_max"): 100,
+            ("S", "inflows"): 0,
+            ("S", "efficiency"): 0.8,
+        }
+    )
+
+
+def _base_network() -> Network:
+    network = Network("test")
+    nodes = {}
+    for node_id in ["N1", "N2"]:
+        nodes[node_id] = Node(model=NODE_WITH_SPILL_AND_ENS, id=node_id)
+        network.add_node(nodes[node_id])
+    for component_id, model, node_id in [
+        ("D1", DEMAND_MODEL, "N1"),
+        ("G1", GENERATOR_MODEL, "N1"),
+        ("D2", DEMAND_MODEL, "N2"),
+        ("G2", GENERATOR_MODEL, "N2"),
+    ]:
+        component = create_component(model=model, id=component_id)
+        network.add_component(component)
+        network.connect(
+            PortRef(component, "balance_port"),
+            PortRef(nodes[node_id], "balance_port"),
+        )
+    return network
+
+
+def _candidate(network: Network, candidate_id: str) -> Tuple[Component, Connections]:
+    n1 = network.get_component("N1")
+    n2 = network.get_component("N2")
+    if candidate_id == "L":
+        link = create_component(model=LINK_MODEL, id="L")
+        return link, [
+            (PortRef(link, "balance_port_from"), PortRef(n1, "balance_port")),
+            (PortRef(n2, "balance_port"), PortRef(link, "balance_port_to")),
+        ]
+    model = SHORT_TERM_STORAGE_SIMPLE if candidate_id == "S" else GENERATOR_MODEL
+    component = create_component(model=model, id=candidate_id)
+    return component, [
+        (PortRef(component, "balance_port"), PortRef(n2, "balance_port"))
+    ]
+
+
+def _network(candidate_ids: List[str]) -> Network:
+    network = _base_network()
+    for candidate_id in candidate_ids:
+        component, connections = _candidate(network, candidate_id)
+        network.add_component(component)
+        for port1, port2 in connections:
+            network.connect(port1, port2)
+    return network
+
+
+def _build(
+    network: Network, backend: SolverBackend = ORToolsBackend(None)
+) -> OptimizationProblem:
+    if isinstance(backend, ORToolsBackend) and backend._solver is None:
+        backend = ORToolsBackend(lp.Solver.CreateSolver("GLOP"))
+    return build_problem(
+        network, _database(), TimeBlock(1, [0, 1, 2]), 2, backend=backend
+    )
+
+
+@pytest.mark.parametrize("factory", BACKENDS)
+@pytest.mark.parametrize("candidate_id", ["L", "S", "G3"])
+def test_added_component_is_built_in_place(
+    factory: BackendFactory, candidate_id: str
+) -> None:
+    problem = _build(_base_network(), factory())
+    component, connections = _candidate(problem.context.network, candidate_id)
+
+    problem.add_component(component, connections)
+    reference = _build(_network([candidate_id]))
+
+    assert proto_content(problem.export_as_proto()) == proto_content(
+        reference.export_as_proto()
+    )
+    if type(problem.backend) is not MatrixBackend:
+        assert problem.solve() == reference.solve() == lp.Solver.OPTIMAL
+        assert problem.objective_value() == pytest.approx(reference.objective_value())
+
+
+@pytest.mark.parametrize("factory", BACKENDS[:3])
+@pytest.mark.parametrize("component_id", ["L", "S", "G2", "D1"])
+def test_removed_component_is_deactivated(
+    factory: BackendFactory, component_id: str
+) -> None:
+    problem = _build(_network(["L", "S"]), factory())
+
+    problem.remove_component(component_id)
+    network = _network(["L", "S"])
+    network.remove_component(component_id)
+    reference = _build(network)
+
+    assert not problem.context.network.has_component(component_id)
+    assert problem.solve() == reference.solve() == lp.Solver.OPTIMAL
+    assert problem.objective_value() == pytest.approx(reference.objective_value())
+    # Solutions may differ, when the problem has several optimal solutions
+    outputs = OutputValues(problem)
+    assert component_id not in {c for c, _, _ in outputs.variable_arrays()}
+    assert outputs.component("G1").is_close(
+        OutputValues(reference).component("G1"), abs_tol=1e-6
+    )
+
+
+def test_candidates_are_screened_with_one_problem() -> None:
+    problem = _build(_base_network())
+    assert problem.solve() == lp.Solver.OPTIMAL
+    base_objective = problem.objective_value()
+
+    for candidate_id in ["L", "S", "G3"]:
+        component, connections = _candidate(problem.context.network, candidate_id)
+        problem.add_component(component, connections)
+        assert problem.solve() == lp.Solver.OPTIMAL
+        reference = _build(_network([candidate_id]))
+        reference.solve()
+        assert problem.objective_value() == pytest.approx(reference.objective_value())
+        assert problem.objective_value() < base_objective
+
+        problem.remove_component(candidate_id)
+
+    assert problem.solve() == lp.Solver.OPTIMAL
+    assert problem.objective_value() == pytest.approx(base_objective)
+    # Removed components are deactivated, not deleted
+    assert proto_content(problem.export_as_proto()) != proto_content(
+        _build(_base_network()).export_as_proto()
+    )
+
+
+def test_parameters_of_edited_problems_are_updated() -> None:
+    problem = _build(_base_network())
+    link, connections = _candidate(problem.context.network, "L")
+    problem.add_component(link, connections)
+    problem.remove_component("G2")
+
+    updates = {
+        ("L", "f_max"): ConstantData(20),
+        ("D2", "demand"): ConstantData(80),
+        ("G2", "cost"): ConstantData(1),
+    }
+    with pytest.raises(KeyError):
+        problem.update_parameters(updates)
+    del updates[("G2", "cost")]
+    problem.update_parameters(updates)
+
+    network = _network(["L"])
+    network.remove_component("G2")
+    database = _database()
+    for (component_id, parameter_name), data in updates.items():
+        database.add_data(component_id, parameter_name, data)
+    reference = build_problem(
+        network, database, TimeBlock(1, [0, 1, 2]), 2, solver_id="GLOP"
+    )
+    assert problem.solve() == reference.solve() == lp.Solver.OPTIMAL
+    assert problem.objective_value() == pytest.approx(reference.objective_value())
+
+
+def test_invalid_edits() -> None:
+    problem = _build(_base_network())
+    network = problem.context.network
+    g1 = network.get_component("G1")
+
+    with pytest.raises(ValueError, match="already in the network"):
+        problem.add_component(g1)
+    g3 = create_component(model=GENERATOR_MODEL, id="G3")
+    with pytest.raises(ValueError, match="does not involve"):
+        problem.add_component(
+            g3,
+            [(PortRef(g1, "balance_port"), PortRef(network.get_node("N1"), "port"))],
+        )
+    with pytest.raises(KeyError):
+        problem.remove_component("unknown")
+
+
+def test_edits_changing_the_indexing_of_rows_are_rejected() -> None:
+    database = _database()
+    network = _base_network()
+    empty_node = Node(model=NODE_BALANCE_MODEL, id="N3")
+    network.add_node(empty_node)
+    problem = build_problem(
+        network, database, TimeBlock(1, [0, 1, 2]), 2, solver_id="GLOP"
+    )
+    content = proto_content(problem.export_as_proto())
+
+    g3 = create_component(model=GENERATOR_MODEL, id="G3")
+    with pytest.raises(ValueError, match="indexed differently"):
+        problem.add_component(
+            g3, [(PortRef(g3, "balance_port"), PortRef(empty_node, "balance_port"))]
+        )
+
+    assert not network.has_component("G3")
+    assert network.get_port_connections("N3") == {"balance_port": []}
+    assert proto_content(problem.export_as_proto()) == content
+    assert problem.solve() == lp.Solver.OPTIMAL
@@ -12,41 +12,42 @@
 
 from unittest.mock import Mock
 
-import ortools.linear_solver.pywraplp as lp
-
-from andromede.simulation import OutputValues
-from andromede.simulation.optimization import (
-    OptimizationContext,
-    OptimizationProblem,
-    TimestepComponentVariableKey,
+import numpy as np
+import pandas as pd
+import pytest
+
+from andromede.simulation import (
+    OutputValues,
+    OutputValuesDiff,
+    TimeBlock,
+    build_problem,
 )
+from andromede.simulation.backend import SolverBackend
+from andromede.simulation.optimization import OptimizationContext, OptimizationProblem
+from andromede.simulation.registry import IndexLayout, IndexRegistry
+from andromede.study import TimeScenarioSeriesData
+from tests.unittests.simulation.utils import balance_study
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
 
 
 def test_component_and_flow_output_object() -> None:
-    mock_variable_component = Mock(spec=lp.Variable)
     mock_problem = Mock(spec=OptimizationProblem)
     opt_context = Mock(spec=OptimizationContext)
 
-    mock_variable_component.solution_value.side_effect = lambda: 1.0
-
-    opt_context.get_all_component_variables.return_value = {
-        TimestepComponentVariableKey(
-            component_id="component_id_test",
-            variable_name="component_var_name",
-            block_timestep=0,
-            scenario=0,
-        ): mock_variable_component,
-        TimestepComponentVariableKey(
-            component_id="component_id_test",
-            variable_name="component_approx_var_name",
-            block_timestep=0,
-            scenario=0,
-        ): mock_variable_component,
-    }
+    registry = IndexRegistry()
+    for offset, variable_name in enumerate(
+        ["component_var_name", "component_approx_var_name"]
+    ):
+        registry.register(
+            "component_id_test", variable_name, IndexLayout(offset, 1, 1, True, True)
+        )
+    opt_context.variable_registry = registry
 
     opt_context.block_length.return_value = 1
 
     mock_problem.context = opt_context
+    mock_problem.backend = Mock(spec=SolverBackend)
+    mock_problem.backend.variable_values.return_value = np.ones(2)
     output = OutputValues(mock_problem)
 
     test_output = OutputValues()
@@ -102,3 +103,126 @@ def test_component_and_flow_output_object() -> None:
     assert output == test_output, f"Output differs from expected: {output}"
 
     print(output)
+
+
+def test_variable_values_are_stored_as_arrays() -> None:
+    output = OutputValues()
+    variable = output.component("component").var("var")
+
+    variable.value = 1.0
+    assert variable.array.shape == (1, 1)
+    assert variable.value == 1.0
+
+    variable.value = [1.0, 2.0]
+    assert variable.array.shape == (2, 1)
+    assert variable.value == [1.0, 2.0]
+
+    variable.value = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    assert variable.array.shape == (2, 3)
+    assert variable.value == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    assert variable.array[1, 0] == 4.0
+
+    with pytest.raises(ValueError):
+        variable.array[0, 0] = 0.0
+
+
+def test_variables_with_values_not_set_are_equal() -> None:
+    variables = [OutputValues.Variable("var") for _ in range(2)]
+    for variable in variables:
+        variable._set(2, 1, 5.0)
+
+    assert variables[0] == variables[1]
+    assert variables[0].is_close(variables[1])
+    variables[1]._set(0, 0, 1.0)
+    assert variables[0] != variables[1]
+
+
+def test_solution_is_extracted_in_bulk() -> None:
+    horizon = 3
+    scenarios = 2
+    demand_data = pd.DataFrame(
+        [[100.0, 50.0], [80.0, 40.0], [60.0, 30.0]],
+        index=range(horizon),
+        columns=range(scenarios),
+    )
+
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G1": GENERATOR_MODEL, "G2": GENERATOR_MODEL},
+        {
+            ("D", "demand"): TimeScenarioSeriesData(demand_data),
+            ("G1", "p_max"): 70.0,
+            ("G1", "cost"): 30.0,
+            ("G2", "p_max"): 70.0,
+            ("G2", "cost"): 10.0,
+        },
+    )
+
+    problem = build_problem(
+        network, database, TimeBlock(1, list(range(horizon))), scenarios
+    )
+    assert problem.solver.Solve() == problem.solver.OPTIMAL
+
+    output = OutputValues(problem)
+    expected = np.array([[70.0, 70.0, 60.0], [50.0, 40.0, 30.0]])
+    np.testing.assert_array_equal(
+        output.component("G2").var("generation").array, expected
+    )
+    assert output.component("G1").var("generation").value == [
+        [30.0, 10.0, 0.0],
+        [0.0, 0.0, 0.0],
+    ]
+
+    for key, variable in problem.context.get_all_component_variables().items():
+        array = output.component(key.component_id).var(key.variable_name).array
+        assert array[key.scenario, key.block_timestep] == variable.solution_value()
+
+
+def test_diff_reports_where_values_differ() -> None:
+    expected = OutputValues()
+    expected.component("G").var("generation").value = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    expected.component("G").var("cost").value = 10.0
+    expected.component("G").var("status").value = [1.0, 0.0]
+    expected.component("D").var("unsupplied").value = 0.0
+
+    actual = OutputValues()
+    actual.component("G").var("generation").value = [[1.0, 2.5, 3.0], [4.0, 5.0, 2.0]]
+    actual.component("G").var("cost").value = 10.0 + 1e-12
+    actual.component("G").var("status").value = [1.0, 0.0, 1.0]
+    actual.component("S").var("level").value = 0.0
+
+    diff = actual.diff(expected)
+    assert not diff.is_close
+    assert diff.only_in_lhs == ["S"]
+    assert diff.only_in_rhs == ["D"]
+
+    # Incomparable shapes come first, as their error is infinite
+    status, generation = diff.variables
+    assert (generation.component_id, generation.variable_name) == ("G", "generation")
+    assert generation.mismatch_count == 2
+    assert generation.max_abs_error == pytest.approx(4.0)
+    assert generation.max_rel_error == pytest.approx(4.0 / 6.0)
+    assert generation.worst_index == (1, 2)
+
+    assert status.variable_name == "status"
+    assert status.lhs_shape == (3, 1) and status.rhs_shape == (2, 1)
+    assert status.worst_index is None
+    assert diff.max_abs_error == np.inf
+
+    assert "G.generation: 2 values differ" in str(diff)
+
+
+def test_diff_is_consistent_with_is_close() -> None:
+    lhs = OutputValues()
+    lhs.component("G").var("generation").value = [[1.0, 2.0], [3.0, float("nan")]]
+    rhs = OutputValues()
+    rhs.component("G").var("generation").value = [[1.0, 2.0], [3.0 + 1e-6, 4.0]]
+
+    diff = lhs.diff(rhs, abs_tol=1e-3)
+    assert diff.is_close == lhs.is_close(rhs, abs_tol=1e-3) == False
+    assert diff.variables[0].worst_index == (1, 1)
+    assert diff.variables[0].mismatch_count == 1
+
+    rhs.component("G").var("generation").ignore = True
+    assert lhs.diff(rhs) == OutputValuesDiff()
+    assert lhs.diff(rhs).is_close and lhs.is_close(rhs)
+    assert str(lhs.diff(rhs)) == "No differences"
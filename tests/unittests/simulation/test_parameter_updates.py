@@ -0,0 +1,140 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+from typing import Mapping, Optional, Tuple
+
+import ortools.linear_solver.pywraplp as lp
+import pandas as pd
+import pytest
+
+from andromede.simulation import TimeBlock, build_problem
+from andromede.simulation.backend import ORToolsBackend, SolverBackend
+from andromede.simulation.matrix_backend import MatrixBackend
+from andromede.simulation.optimization import OptimizationProblem
+from andromede.study import ConstantData, DataBase, TimeScenarioSeriesData
+from andromede.study.data import AbstractDataStructure
+from tests.unittests.simulation.utils import (
+    THERMAL_CLUSTER_DATA,
+    BackendFactory,
+    backend_factories,
+    balance_network,
+    create_database,
+    proto_content,
+)
+from tests.unittests.system.libs.standard import (
+    DEMAND_MODEL,
+    GENERATOR_MODEL,
+    THERMAL_CLUSTER_MODEL_HD,
+)
+
+Updates = Mapping[Tuple[str, str], AbstractDataStructure]
+
+BACKENDS = backend_factories("SCIP")
+
+MODELS = {"D": DEMAND_MODEL, "G": GENERATOR_MODEL, "T": THERMAL_CLUSTER_MODEL_HD}
+
+
+def _database(updates: Optional[Updates] = None) -> DataBase:
+    return create_database(
+        {
+            ("D", "demand"): [[150.0, 120.0], [180.0, 90.0], [60.0, 200.0]],
+            ("G", "p_max"): 100,
+            ("G", "cost"): 30,
+            **THERMAL_CLUSTER_DATA,
+            **(updates or {}),
+        }
+    )
+
+
+def _build(backend: SolverBackend, database: DataBase) -> OptimizationProblem:
+    return build_problem(
+        balance_network(MODELS), database, TimeBlock(1, [0, 1, 2]), 2, backend=backend
+    )
+
+
+@pytest.mark.parametrize("factory", BACKENDS)
+@pytest.mark.parametrize(
+    "updates",
+    [
+        pytest.param({("G", "cost"): ConstantData(45)}, id="objective"),
+        pytest.param(
+            {
+                ("D", "demand"): TimeScenarioSeriesData(
+                    pd.DataFrame([[100.0, 50.0], [190.0, 80.0], [70.0, 210.0]])
+                )
+            },
+            id="right-hand side",
+        ),
+        pytest.param({("T", "p_max"): ConstantData(80)}, id="coefficients"),
+        pytest.param({("T", "p_min"): ConstantData(0)}, id="removed coefficients"),
+        pytest.param(
+            {("T", "nb_units_max"): ConstantData(3), ("G", "p_max"): ConstantData(50)},
+            id="bounds",
+        ),
+    ],
+)
+def test_updated_problem_is_the_rebuilt_problem(
+    factory: BackendFactory, updates: Updates
+) -> None:
+    problem = _build(factory(), _database())
+    problem.update_parameters(updates)
+    reference = _build(
+        ORToolsBackend(lp.Solver.CreateSolver("SCIP")), _database(updates)
+    )
+
+    assert proto_content(problem.export_as_proto()) == proto_content(
+        reference.export_as_proto()
+    )
+
+    if type(problem.backend) is not MatrixBackend:
+        assert problem.solve() == reference.solve() == lp.Solver.OPTIMAL
+        assert problem.objective_value() == pytest.approx(reference.objective_value())
+
+
+@pytest.mark.parametrize("factory", BACKENDS)
+def test_successive_updates(factory: BackendFactory) -> None:
+    problem = _build(factory(), _database())
+    initial = proto_content(problem.export_as_proto())
+
+    for p_min, cost in [(0, 25), (20, 40), (10, 20)]:
+        problem.update_parameters(
+            {("T", "p_min"): ConstantData(p_min), ("T", "cost"): ConstantData(cost)}
+        )
+
+    assert proto_content(problem.export_as_proto()) == initial
+
+
+def test_parameters_of_time_operators_cannot_be_updated() -> None:
+    database = _database()
+    problem = _build(ORToolsBackend(lp.Solver.CreateSolver("SCIP")), database)
+
+    assert problem.context.structural_parameters == {
+        ("T", "d_min_up"),
+        ("T", "d_min_down"),
+    }
+    with pytest.raises(ValueError, match="structure"):
+        problem.update_parameters(
+            {("T", "d_min_up"): ConstantData(3), ("T", "cost"): ConstantData(10)}
+        )
+    assert database.get_data("T", "cost") == ConstantData(20)
+
+
+def test_data_must_meet_parameter_requirements() -> None:
+    problem = _build(ORToolsBackend(lp.Solver.CreateSolver("SCIP")), _database())
+
+    with pytest.raises(ValueError, match="Requirement not met"):
+        problem.update_parameters(
+            {
+                ("G", "cost"): TimeScenarioSeriesData(
+                    pd.DataFrame([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+                )
+            }
+        )
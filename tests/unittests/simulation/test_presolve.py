@@ -0,0 +1,293 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import math
+from typing import Callable
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import pytest
+
+from andromede.simulation import OutputValues, TimeBlock, build_problem
+from andromede.simulation.backend import (
+    ORToolsBackend,
+    SolverBackend,
+    SparseRows,
+    SparseRowsBuilder,
+)
+from andromede.simulation.optimization import OptimizationProblem
+from andromede.simulation.presolve import PresolveBackend, presolve
+from andromede.simulation.scipy_backend import ScipyHighsBackend
+from andromede.simulation.solver_config import SolverConfig
+from andromede.study import DataBase, Network
+from tests.unittests.simulation.utils import THERMAL_CLUSTER_DATA, balance_study
+from tests.unittests.system.libs.standard import (
+    DEMAND_MODEL,
+    GENERATOR_MODEL,
+    THERMAL_CLUSTER_MODEL_HD,
+)
+
+INF = math.inf
+
+
+def _build(backend: SolverBackend) -> OptimizationProblem:
+    network, database = balance_study(
+        {
+            "D": DEMAND_MODEL,
+            "G": GENERATOR_MODEL,
+            "U": GENERATOR_MODEL,
+            "T": THERMAL_CLUSTER_MODEL_HD,
+        },
+        {
+            ("D", "demand"): [[150.0, 120.0], [180.0, 90.0], [60.0, 200.0]],
+            ("G", "p_max"): 100,
+            ("G", "cost"): 30,
+            # Generation of U is fixed to zero
+            ("U", "p_max"): 0,
+            ("U", "cost"): 30,
+            **THERMAL_CLUSTER_DATA,
+        },
+    )
+    return build_problem(network, database, TimeBlock(1, [0, 1, 2]), 2, backend=backend)
+
+
+def _rows(*rows: tuple) -> SparseRows:
+    builder = SparseRowsBuilder(named=False)
+    for lower_bound, upper_bound, indices, coefficients in rows:
+        builder.add_row(lower_bound, upper_bound, indices, coefficients)
+    return builder.build()
+
+
+@pytest.mark.parametrize(
+    "create_backend",
+    [
+        pytest.param(lambda: ORToolsBackend(lp.Solver.CreateSolver("GLOP")), id="lp"),
+        pytest.param(lambda: ORToolsBackend(lp.Solver.CreateSolver("SCIP")), id="mip"),
+        pytest.param(ScipyHighsBackend, id="scipy_highs"),
+    ],
+)
+@pytest.mark.parametrize("aggregate", [False, True])
+def test_presolved_problem_has_the_solution_of_the_problem(
+    create_backend: Callable[[], SolverBackend], aggregate: bool
+) -> None:
+    reference = _build(create_backend())
+    problem = _build(PresolveBackend(create_backend, aggregate))
+
+    assert problem.solve() == reference.solve() == lp.Solver.OPTIMAL
+    assert problem.objective_value() == pytest.approx(reference.objective_value())
+    assert OutputValues(problem).is_close(OutputValues(reference), abs_tol=1e-6)
+
+    presolved = problem.backend.presolved  # type: ignore
+    assert len(presolved.rows) < problem.backend.num_constraints()
+    assert len(presolved.columns) < problem.backend.num_variables()
+
+    duals, reference_duals = problem.duals(), reference.duals()
+    assert duals.keys() == reference_duals.keys()
+    for key, values in reference_duals.items():
+        np.testing.assert_allclose(duals[key], values, atol=1e-6)
+    reduced_costs = problem.reduced_costs()
+    for key, values in reference.reduced_costs().items():
+        np.testing.assert_allclose(reduced_costs[key], values, atol=1e-6)
+
+
+def test_reductions() -> None:
+    presolved = presolve(
+        np.array([0.0, 0.0, 2.0, -INF]),
+        np.array([10.0, 10.0, 2.0, INF]),
+        np.array([False, True, False, False]),
+        np.array([1.0, 1.0, 3.0, 1.0]),
+        _rows(
+            # Empty once column 2 is substituted
+            (-INF, 4.0, [2], [2.0]),
+            # Singleton rows, the tightest bound is kept
+            (1.0, INF, [0], [2.0]),
+            (-INF, 5.0, [0, 0], [1.0, 0.5]),
+            (-INF, 7.5, [1], [1.0]),
+            # Duplicate rows, up to a factor
+            (-INF, 20.0, [0, 1, 3], [1.0, 2.0, 1.0]),
+            (-20.0, 40.0, [0, 1, 3, 2], [-2.0, -4.0, -2.0, 0.0]),
+            # Without bounds
+            (-INF, INF, [0, 3], [1.0, 1.0]),
+        ),
+    )
+
+    assert presolved.feasible
+    np.testing.assert_array_equal(presolved.columns, [0, 1, 3])
+    np.testing.assert_array_equal(presolved.rows, [4])
+    np.testing.assert_array_equal(presolved.lower_bounds, [0.5, 0.0, -INF])
+    # Bounds of integer columns are rounded
+    np.testing.assert_array_equal(presolved.upper_bounds, [10 / 3, 7.0, INF])
+    np.testing.assert_array_equal(presolved.objective, [1.0, 1.0, 1.0])
+    assert presolved.offset == 6.0
+    constraints = presolved.constraints
+    np.testing.assert_array_equal(constraints.starts, [0, 3])
+    np.testing.assert_array_equal(constraints.indices, [0, 1, 2])
+    np.testing.assert_array_equal(constraints.coefficients, [1.0, 2.0, 1.0])
+    np.testing.assert_array_equal(constraints.lower_bounds, [-20.0])
+    np.testing.assert_array_equal(constraints.upper_bounds, [10.0])
+    np.testing.assert_array_equal(
+        presolved.variable_values(np.array([1.0, 2.0, 3.0])), [1.0, 2.0, 2.0, 3.0]
+    )
+
+
+def _aggregation_problem() -> tuple:
+    return (
+        np.array([0.0, -INF, 0.0, 0.0, 0.0]),
+        np.array([10.0, INF, 5.0, 4.0, 6.0]),
+        np.array([False, False, False, True, True]),
+        np.array([1.0, 1.0, 1.0, 2.0, 0.0]),
+        _rows(
+            # Column 1 is eliminated, it has fewer bounds: x1 = 2 * x0 + 1
+            (1.0, 1.0, [1, 0], [1.0, -2.0]),
+            (-INF, 8.0, [1, 2], [1.0, 1.0]),
+            # Integer columns: x3 = 3 - x4, whose bounds become 0 <= x4 <= 3
+            (3.0, 3.0, [3, 4], [1.0, 1.0]),
+            # Not an equality row
+            (2.0, 5.0, [0, 4], [1.0, 2.0]),
+        ),
+    )
+
+
+def test_aggregation() -> None:
+    presolved = presolve(*_aggregation_problem(), aggregate=True)
+
+    assert presolved.feasible
+    np.testing.assert_array_equal(presolved.columns, [0, 2, 4])
+    np.testing.assert_array_equal(presolved.rows, [1, 3])
+    np.testing.assert_array_equal(presolved.upper_bounds, [10.0, 5.0, 3.0])
+    np.testing.assert_array_equal(presolved.objective, [3.0, 1.0, -2.0])
+    assert presolved.offset == 7.0
+    constraints = presolved.constraints
+    np.testing.assert_array_equal(constraints.starts, [0, 2, 4])
+    np.testing.assert_array_equal(constraints.indices, [0, 1, 0, 2])
+    np.testing.assert_array_equal(constraints.coefficients, [2.0, 1.0, 1.0, 2.0])
+    np.testing.assert_array_equal(constraints.upper_bounds, [7.0, 5.0])
+    np.testing.assert_array_equal(
+        presolved.variable_values(np.array([1.0, 2.0, 1.0])),
+        [1.0, 3.0, 2.0, 2.0, 1.0],
+    )
+    # Without aggregation, the rows are kept
+    assert len(presolve(*_aggregation_problem(), aggregate=False).rows) == 4
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        pytest.param(_rows((1.0, INF, [0, 1], [1.0, 1.0])), id="empty row"),
+        pytest.param(_rows((-INF, -1.0, [0, 2], [1.0, 1.0])), id="bounds"),
+        pytest.param(
+            _rows((-INF, 1.0, [0, 2], [1.0, 1.0]), (2.0, INF, [0, 2], [1.0, 1.0])),
+            id="duplicate rows",
+        ),
+    ],
+)
+def test_infeasible_problems(rows: SparseRows) -> None:
+    backend = PresolveBackend(lambda: ORToolsBackend(lp.Solver.CreateSolver("GLOP")))
+    backend.add_variables(np.array([0.0, 0.0, 0.0]), np.array([0.0, 0.0, 5.0]), False)
+    backend.add_constraints(rows)
+
+    assert backend.solve() == lp.Solver.INFEASIBLE
+    assert math.isnan(backend.objective_value())
+    assert backend.dual_values() is None
+
+
+@pytest.mark.parametrize("aggregate", [False, True])
+def test_postsolved_duals_are_optimal(aggregate: bool) -> None:
+    # Dual values are not unique: they are checked with strong duality
+    rng = np.random.default_rng(3)
+    columns = 12
+    lower_bounds = rng.integers(-5, 0, columns).astype(float)
+    upper_bounds = lower_bounds + rng.integers(0, 10, columns)
+    objective = rng.normal(size=columns)
+    rows = []
+    # Columns defined by another column, feasible at the lower bounds
+    for column in range(4):
+        scale = float(rng.choice([-2.0, 1.0, 3.0]))
+        constant = scale * lower_bounds[column] - lower_bounds[column + 4]
+        rows.append((constant, constant, [column, column + 4], [scale, -1.0]))
+        upper_bounds[column + 4] = INF
+    for _ in range(20):
+        indices = rng.choice(columns, size=rng.integers(1, 4), replace=False)
+        coefficients = rng.integers(1, 4, len(indices)) * rng.choice([-1.0, 1.0])
+        activity = float(coefficients @ lower_bounds[indices])
+        rows.append(
+            (activity - 10, activity + rng.integers(1, 10), indices, coefficients)
+        )
+        if rng.random() < 0.3:
+            scale = float(rng.choice([-2.0, 3.0]))
+            bounds = sorted([scale * rows[-1][0], scale * (activity + 5)])
+            rows.append((*bounds, indices, scale * coefficients))
+
+    backend = PresolveBackend(
+        lambda: ORToolsBackend(lp.Solver.CreateSolver("GLOP")), aggregate
+    )
+    backend.add_variables(lower_bounds, upper_bounds, False)
+    backend.add_constraints(_rows(*rows))
+    backend.add_objective(np.arange(columns), objective, 0.0)
+
+    assert backend.solve() == lp.Solver.OPTIMAL
+    duals = backend.dual_values()
+    reduced_costs = backend.reduced_costs()
+    assert duals is not None and reduced_costs is not None
+    constraints = backend.constraint_rows()
+    dual_objective = sum(
+        dual * (lower if dual > 0 else upper)
+        for dual, lower, upper in zip(
+            duals, constraints.lower_bounds, constraints.upper_bounds
+        )
+        if dual != 0
+    ) + sum(
+        cost * (lower if cost > 0 else upper)
+        for cost, lower, upper in zip(reduced_costs, lower_bounds, upper_bounds)
+        if abs(cost) > 1e-12
+    )
+    assert dual_objective == pytest.approx(backend.objective_value())
+    if aggregate:
+        assert len(backend.presolved.columns) <= columns - 4
+
+
+def test_removed_components_are_presolved() -> None:
+    problem = _build(
+        PresolveBackend(lambda: ORToolsBackend(lp.Solver.CreateSolver("GLOP")))
+    )
+    problem.solve()
+    presolved = problem.backend.presolved  # type: ignore
+
+    problem.remove_component("G")
+
+    assert problem.solve() == lp.Solver.OPTIMAL
+    assert len(problem.backend.presolved.columns) < len(presolved.columns)  # type: ignore
+    reference = _build(ORToolsBackend(lp.Solver.CreateSolver("GLOP")))
+    reference.remove_component("G")
+    reference.solve()
+    assert problem.objective_value() == pytest.approx(reference.objective_value())
+
+
+def test_configuration_is_checked_by_the_solved_backend() -> None:
+    problem = _build(
+        PresolveBackend(lambda: ORToolsBackend(lp.Solver.CreateSolver("SCIP")))
+    )
+    problem.backend.configure(SolverConfig(solver_parameters="unknown/parameter = 1"))
+
+    with pytest.raises(ValueError, match="Invalid parameters"):
+        problem.solve()
+
+
+def test_build_presolve_creates_its_backend() -> None:
+    with pytest.raises(ValueError, match="PresolveBackend"):
+        build_problem(
+            Network("test"),
+            DataBase(),
+            TimeBlock(1, [0]),
+            1,
+            backend=ScipyHighsBackend(),
+            build_presolve=True,
+        )
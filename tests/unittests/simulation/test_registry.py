@@ -0,0 +1,81 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import pytest
+
+from andromede.simulation import TimeBlock, build_problem
+from andromede.simulation.registry import IndexLayout, IndexRegistry
+from tests.unittests.simulation.utils import balance_study
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
+
+
+def test_index_layout_arithmetic() -> None:
+    layout = IndexLayout(10, 3, 2, True, True)
+    assert layout.size == 6
+    assert layout.index(0, 0) == 10
+    assert layout.index(0, 1) == 11
+    assert layout.index(2, 1) == 15
+    assert [index for _, _, index in layout.indices()] == list(range(10, 16))
+
+    with pytest.raises(KeyError):
+        layout.index(3, 0)
+    with pytest.raises(KeyError):
+        layout.index(0, 2)
+
+
+def test_index_layout_of_non_indexed_dimensions() -> None:
+    time_only = IndexLayout(4, 3, 1, True, False)
+    assert time_only.index(2, None) == 6
+    assert list(time_only.indices()) == [(0, None, 4), (1, None, 5), (2, None, 6)]
+
+    constant = IndexLayout(7, 1, 1, False, False)
+    assert constant.index(None, None) == 7
+    assert list(constant.indices()) == [(None, None, 7)]
+
+
+def test_registry_lookup() -> None:
+    registry = IndexRegistry()
+    registry.register("G", "generation", IndexLayout(0, 2, 2, True, True))
+    registry.register("G", "investment", IndexLayout(4, 1, 1, False, False))
+
+    assert len(registry) == 2
+    assert registry.index("G", "generation", 1, 0) == 2
+    assert registry.index("G", "investment", None, None) == 4
+    with pytest.raises(KeyError):
+        registry.index("G", "unknown", None, None)
+
+
+def test_component_variables_are_resolved_by_index() -> None:
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G": GENERATOR_MODEL},
+        {("D", "demand"): 100, ("G", "p_max"): 200, ("G", "cost"): 30},
+    )
+
+    problem = build_problem(network, database, TimeBlock(1, [0, 1, 2]), 2)
+    context = problem.context
+
+    variables = context.get_all_component_variables()
+    assert len(variables) == problem.solver.NumVariables() == 6
+    for key, variable in variables.items():
+        assert variable.name() == f"G_generation_t{key.block_timestep}_s{key.scenario}"
+        resolved = context.get_component_variable(
+            key.block_timestep, key.scenario, key.component_id, key.variable_name
+        )
+        assert resolved.index() == variable.index()
+
+    # Timesteps are cyclic inside the block
+    assert context.get_component_variable(4, 1, "G", "generation").name() == (
+        "G_generation_t1_s1"
+    )
+
+    constraints = context.get_all_component_constraints()
+    assert len(constraints) == problem.solver.NumConstraints()
@@ -0,0 +1,118 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+from andromede.simulation import OutputValues, TimeBlock, build_problem
+from andromede.simulation.optimization import OptimizationProblem
+from andromede.simulation.result_writer import (
+    ResultWriter,
+    read_duals,
+    read_variable_arrays,
+    read_variables,
+)
+from tests.unittests.simulation.utils import balance_study
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
+
+
+def _solved_problem(demand: float, block: TimeBlock) -> OptimizationProblem:
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G1": GENERATOR_MODEL, "G2": GENERATOR_MODEL},
+        {
+            ("D", "demand"): demand,
+            ("G1", "p_max"): 70.0,
+            ("G1", "cost"): 30.0,
+            ("G2", "p_max"): 70.0,
+            ("G2", "cost"): 10.0,
+        },
+    )
+
+    problem = build_problem(network, database, block, 2, solver_id="GLOP")
+    assert problem.solver.Solve() == problem.solver.OPTIMAL
+    return problem
+
+
+def test_results_are_written_and_read_back_per_block(tmp_path: Path) -> None:
+    writer = ResultWriter(tmp_path, with_duals=True)
+    demands = {1: 50.0, 2: 100.0}
+    outputs = {}
+    for block_id, demand in demands.items():
+        block = TimeBlock(block_id, [0, 1, 2])
+        problem = _solved_problem(demand, block)
+        writer.write_block(block_id, problem)
+        outputs[block_id] = OutputValues(problem)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["block=1", "block=2"]
+
+    variables = read_variables(tmp_path)
+    assert isinstance(variables, pl.LazyFrame)
+    g1 = (
+        variables.filter(pl.col("component") == "G1", pl.col("block") == 2)
+        .sort("scenario", "timestep")
+        .collect()
+    )
+    assert g1["variable"].to_list() == ["generation"] * 6
+    np.testing.assert_array_equal(
+        g1["value"].to_numpy().reshape(2, 3),
+        outputs[2].component("G1").var("generation").array,
+    )
+
+    total_rows = variables.select(pl.len()).collect().item()
+    assert total_rows == 2 * 2 * (2 * 3)
+
+    duals = read_duals(tmp_path).filter(pl.col("block") == 2).collect()
+    balance_duals = duals.filter(
+        pl.col("component") == "N", pl.col("constraint") == "Balance"
+    )
+    assert len(balance_duals) == 6
+    # The most expensive generator is marginal, costs are weighted by 1/2 scenarios
+    assert balance_duals["value"].abs().to_list() == pytest.approx([15.0] * 6)
+
+
+def test_writing_a_block_again_replaces_its_results(tmp_path: Path) -> None:
+    writer = ResultWriter(tmp_path)
+
+    output = OutputValues()
+    output.component("G").var("generation").value = [[1.0, 2.0]]
+    writer.write_output_values(1, output)
+    output.component("G").var("generation").value = [[3.0, 4.0]]
+    writer.write_output_values(1, output)
+
+    values = read_variables(tmp_path).collect()
+    assert values["value"].to_list() == [3.0, 4.0]
+    assert list(tmp_path.glob("*/.*")) == []
+
+
+def test_variable_arrays_are_read_back_for_hints(tmp_path: Path) -> None:
+    problem = _solved_problem(100.0, TimeBlock(1, [0, 1, 2]))
+    ResultWriter(tmp_path).write_block(1, problem)
+
+    arrays = {
+        (component_id, variable_name): array
+        for component_id, variable_name, array in read_variable_arrays(tmp_path, 1)
+    }
+    expected = {
+        (component_id, variable_name): array
+        for component_id, variable_name, array in OutputValues(
+            problem
+        ).variable_arrays()
+    }
+    assert arrays.keys() == expected.keys()
+    for key, array in arrays.items():
+        np.testing.assert_array_equal(array, expected[key])
+
+    hinted = _solved_problem(100.0, TimeBlock(2, [0, 1, 2]))
+    hinted.set_hint(read_variable_arrays(tmp_path, 1))
+    assert len(hinted.export_as_proto().solution_hint.var_index) == 2 * 2 * 3
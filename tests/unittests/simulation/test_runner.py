@@ -0,0 +1,115 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from andromede.simulation import CommandRunner, RunStatus, run_commands
+
+_FAKE_BINARY = """\
+import pathlib
+import sys
+import time
+
+options = sys.argv[1]
+pathlib.Path("cwd.txt").write_text(str(pathlib.Path.cwd()))
+print("reading", options)
+print("some warning", file=sys.stderr)
+time.sleep(float(pathlib.Path(options).read_text()))
+sys.exit(int(sys.argv[2]) if len(sys.argv) > 2 else 0)
+"""
+
+
+@pytest.fixture
+def fake_binary(tmp_path: Path) -> Path:
+    path = tmp_path / "bin" / "fake_benders"
+    path.parent.mkdir()
+    path.write_text(f"#!{sys.executable}\n{_FAKE_BINARY}")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+def _emplacement(tmp_path: Path, name: str, sleep: float = 0.0) -> Path:
+    emplacement = tmp_path / name
+    emplacement.mkdir()
+    (emplacement / "options.json").write_text(str(sleep))
+    return emplacement
+
+
+def test_command_runs_in_its_emplacement_with_captured_logs(
+    tmp_path: Path, fake_binary: Path
+) -> None:
+    emplacement = _emplacement(tmp_path, "study")
+    cwd = Path.cwd()
+
+    result = CommandRunner(fake_binary, ["options.json"], emplacement).execute()
+
+    assert result.succeeded
+    assert result.return_code == 0
+    assert Path.cwd() == cwd
+    assert (emplacement / "cwd.txt").read_text() == str(emplacement)
+    assert result.stdout_path.read_text() == "reading options.json\n"
+    assert result.stderr_path.read_text() == "some warning\n"
+
+
+def test_failures_and_timeouts_are_reported(tmp_path: Path, fake_binary: Path) -> None:
+    failing = CommandRunner(
+        fake_binary, ["options.json", "3"], _emplacement(tmp_path, "failing")
+    )
+    assert failing.execute().status == RunStatus.FAILED
+    assert failing.run() == 3
+
+    slow = CommandRunner(
+        fake_binary,
+        ["options.json"],
+        _emplacement(tmp_path, "slow", sleep=30),
+        timeout=0.5,
+    )
+    start = time.monotonic()
+    result = slow.execute()
+    assert time.monotonic() - start < 10
+    assert result.status == RunStatus.TIMED_OUT
+    assert result.return_code is None
+
+    missing = CommandRunner(tmp_path / "missing", [], tmp_path).execute()
+    assert missing.status == RunStatus.NOT_FOUND
+
+
+def test_commands_run_concurrently_in_a_bounded_pool(
+    tmp_path: Path, fake_binary: Path
+) -> None:
+    runners = [
+        CommandRunner(
+            fake_binary,
+            ["options.json", str(i % 2)],
+            _emplacement(tmp_path, f"study_{i}", sleep=1.0),
+        )
+        for i in range(4)
+    ]
+
+    start = time.monotonic()
+    results = run_commands(runners, max_jobs=4)
+    elapsed = time.monotonic() - start
+
+    assert [r.status for r in results] == [RunStatus.SUCCESS, RunStatus.FAILED] * 2
+    assert [r.emplacement.name for r in results] == [f"study_{i}" for i in range(4)]
+    # Sequential runs would take at least 4 seconds
+    assert elapsed < 3.5
+    for i in range(4):
+        cwd_file = tmp_path / f"study_{i}" / "cwd.txt"
+        assert cwd_file.read_text() == str(tmp_path / f"study_{i}")
+
+    with pytest.raises(ValueError, match="positive"):
+        run_commands(runners, max_jobs=0)
@@ -0,0 +1,101 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+from typing import List, Tuple
+
+import ortools.linear_solver.pywraplp as lp
+import pytest
+
+from andromede.simulation import TimeBlock, build_problem, select_scenarios
+from andromede.study import ConstantData, DataBase, Network
+from tests.unittests.simulation.utils import balance_study
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
+
+BLOCK = TimeBlock(1, [0, 1, 2])
+
+
+def _study(demand: List[List[float]]) -> Tuple[Network, DataBase]:
+    return balance_study(
+        {"D": DEMAND_MODEL, "G": GENERATOR_MODEL, "U": GENERATOR_MODEL},
+        {
+            ("D", "demand"): demand,
+            ("G", "p_max"): 100,
+            ("G", "cost"): 30,
+            # U is used when the demand is above the capacity of G
+            ("U", "p_max"): 1000,
+            ("U", "cost"): 60,
+        },
+    )
+
+
+def _objective(
+    network: Network, database: DataBase, scenarios: int, **kwargs: List[float]
+) -> float:
+    problem = build_problem(
+        network, database, BLOCK, scenarios, solver_id="GLOP", **kwargs
+    )
+    assert problem.solve() == lp.Solver.OPTIMAL
+    return problem.objective_value()
+
+
+def test_scenario_weights() -> None:
+    network, database = _study([[50.0, 150.0], [80.0, 120.0], [20.0, 200.0]])
+    costs = [
+        _objective(network, database, 2, scenario_weights=[1.0, 0.0]),
+        _objective(network, database, 2, scenario_weights=[0.0, 1.0]),
+    ]
+
+    assert costs == pytest.approx([150 * 30, 300 * 30 + 170 * 60])
+    assert _objective(
+        network, database, 2, scenario_weights=[0.25, 0.75]
+    ) == pytest.approx(0.25 * costs[0] + 0.75 * costs[1])
+    assert _objective(network, database, 2) == pytest.approx(sum(costs) / 2)
+    for weights in [[1.0], [0.5, 0.6], [1.5, -0.5]]:
+        with pytest.raises(ValueError, match="Scenario weights"):
+            _objective(network, database, 2, scenario_weights=weights)
+
+
+def test_selected_scenarios_represent_the_study() -> None:
+    a, b, c = [50.0, 80.0, 20.0], [150.0, 120.0, 200.0], [60.0, 90.0, 30.0]
+    columns = [a, b, a, c, b, a]
+    network, database = _study([list(row) for row in zip(*columns)])
+
+    reduced = select_scenarios(network, database, BLOCK.timesteps, 6, 3)
+
+    assert sorted(zip(reduced.scenarios, reduced.weights)) == pytest.approx(
+        [(0, 0.5), (1, 1 / 3), (3, 1 / 6)]
+    )
+    reduced_database = reduced.database(network, database)
+    demand = reduced_database.get_data("D", "demand")
+    for k, scenario in enumerate(reduced.scenarios):
+        assert [demand.get_value(t, k) for t in range(3)] == columns[scenario]
+    assert reduced_database.get_data("G", "cost") == ConstantData(30)
+    # Scenarios which are not selected are equal to a selected one
+    assert _objective(
+        network, reduced_database, 3, scenario_weights=reduced.weights
+    ) == pytest.approx(_objective(network, database, 6))
+
+
+def test_scenario_selection() -> None:
+    # Scenarios 1 and 2 are close, scenario 3 is far
+    columns = [[100.0, 100.0], [110.0, 100.0], [112.0, 100.0], [300.0, 300.0]]
+    network, database = _study([list(row) for row in zip(*columns)])
+
+    reduced = select_scenarios(network, database, [0, 1], 4, 2)
+    assert sorted(reduced.scenarios) == [1, 3]
+    # Probabilities of scenarios change the selection
+    reduced = select_scenarios(
+        network, database, [0, 1], 4, 1, probabilities=[0.1, 0.1, 0.1, 0.7]
+    )
+    assert reduced.scenarios == [3] and reduced.weights == pytest.approx([1.0])
+
+    with pytest.raises(ValueError):
+        select_scenarios(network, database, [0, 1], 4, 5)
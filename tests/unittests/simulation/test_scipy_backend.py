@@ -0,0 +1,72 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import math
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import pytest
+
+from andromede.simulation import OutputValues, TimeBlock, build_problem
+from andromede.simulation.backend import SCIPY_HIGHS
+from andromede.simulation.optimization import OptimizationProblem
+from andromede.simulation.scipy_backend import ScipyHighsBackend
+from tests.unittests.simulation.utils import balance_study, proto_content
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
+
+
+def _problem(solver_id: str) -> OptimizationProblem:
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G1": GENERATOR_MODEL, "G2": GENERATOR_MODEL},
+        {
+            ("D", "demand"): [[50.0, 90.0], [100.0, 120.0], [60.0, 20.0]],
+            ("G1", "p_max"): 70.0,
+            ("G1", "cost"): 30.0,
+            ("G2", "p_max"): 70.0,
+            ("G2", "cost"): 10.0,
+        },
+    )
+    return build_problem(
+        network, database, TimeBlock(1, [0, 1, 2]), 2, solver_id=solver_id
+    )
+
+
+def test_highs_problem_has_the_same_solution_as_or_tools() -> None:
+    problem = _problem(SCIPY_HIGHS)
+    reference = _problem("GLOP")
+
+    assert isinstance(problem.backend, ScipyHighsBackend)
+    with pytest.raises(ValueError, match="OR-Tools"):
+        problem.solver
+
+    assert proto_content(problem.export_as_proto()) == proto_content(
+        reference.export_as_proto()
+    )
+
+    assert problem.solve() == lp.Solver.OPTIMAL
+    assert reference.solve() == lp.Solver.OPTIMAL
+    assert problem.objective_value() == pytest.approx(reference.objective_value())
+    assert OutputValues(problem).is_close(OutputValues(reference), abs_tol=1e-9)
+
+    duals, reference_duals = problem.duals(), reference.duals()
+    assert duals.keys() == reference_duals.keys()
+    for key, array in duals.items():
+        np.testing.assert_allclose(array, reference_duals[key], atol=1e-9)
+
+
+def test_infeasible_problem() -> None:
+    backend = ScipyHighsBackend()
+    x = backend.add_variable(0, 1, False, "x")
+    backend.add_constraint(2, math.inf, [x], [1], "c")
+
+    assert backend.solve() == lp.Solver.INFEASIBLE
+    assert math.isnan(backend.objective_value())
+    assert backend.dual_values() is None
@@ -0,0 +1,138 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import numpy as np
+import pytest
+
+from andromede.simulation import OutputValues, TimeBlock, build_problem
+from andromede.simulation.optimization import (
+    OptimizationProblem,
+    TimestepComponentConstraintKey,
+)
+from andromede.simulation.registry import IndexLayout, IndexRegistry
+from andromede.simulation.solution import gather_arrays, scatter_arrays
+from tests.unittests.simulation.utils import balance_study
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
+
+
+def _problem(solver_id: str) -> OptimizationProblem:
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G1": GENERATOR_MODEL, "G2": GENERATOR_MODEL},
+        {
+            ("D", "demand"): [[100.0, 50.0], [80.0, 40.0], [60.0, 30.0]],
+            ("G1", "p_max"): 70.0,
+            ("G1", "cost"): 30.0,
+            ("G2", "p_max"): 70.0,
+            ("G2", "cost"): 10.0,
+        },
+    )
+
+    return build_problem(
+        network, database, TimeBlock(1, [0, 1, 2]), 2, solver_id=solver_id
+    )
+
+
+def test_constraints_are_registered_per_component_constraint() -> None:
+    problem = _problem("GLOP")
+    constraints = problem.context.get_all_component_constraints()
+
+    assert len(constraints) == problem.solver.NumConstraints()
+    balance = constraints[TimestepComponentConstraintKey("N", "Balance", 2, 1)]
+    assert balance.name() == "N_Balance_t2_s1"
+    assert {(key.component_id, key.constraint_name) for key in constraints} == {
+        ("N", "Balance"),
+        ("G1", "Max generation"),
+        ("G2", "Max generation"),
+    }
+
+
+def test_duals_and_reduced_costs_are_extracted_in_bulk() -> None:
+    problem = _problem("GLOP")
+    assert problem.solver.Solve() == problem.solver.OPTIMAL
+
+    duals = problem.duals()
+    # Marginal costs, weighted by the probability 1/2 of each scenario
+    np.testing.assert_allclose(
+        np.abs(duals["N", "Balance"]), [[15.0, 15.0, 5.0], [5.0, 5.0, 5.0]]
+    )
+    for key, constraint in problem.context.get_all_component_constraints().items():
+        array = duals[key.component_id, key.constraint_name]
+        assert array[key.scenario, key.block_timestep] == pytest.approx(
+            constraint.dual_value()
+        )
+
+    reduced_costs = problem.reduced_costs()
+    assert reduced_costs.keys() == {("G1", "generation"), ("G2", "generation")}
+    for key, variable in problem.context.get_all_component_variables().items():
+        array = reduced_costs[key.component_id, key.variable_name]
+        assert array[key.scenario, key.block_timestep] == pytest.approx(
+            variable.reduced_cost()
+        )
+
+
+def test_no_duals_without_dual_solution() -> None:
+    problem = _problem("SCIP")
+    assert problem.solver.Solve() == problem.solver.OPTIMAL
+
+    assert problem.duals() == {}
+    assert problem.reduced_costs() == {}
+
+
+def test_scattered_arrays_are_gathered_back() -> None:
+    registry = IndexRegistry()
+    registry.register("G", "p", IndexLayout(2, 3, 2, True, True))
+    registry.register("G", "n", IndexLayout(8, 1, 2, False, True))
+    p = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    n = np.array([[7.0], [np.nan]])
+
+    indices, values = scatter_arrays(
+        registry, [("G", "p", p), ("G", "n", n), ("unknown", "p", p)]
+    )
+
+    solution = np.full(10, np.nan)
+    solution[indices] = values
+    arrays = gather_arrays(registry, solution)
+    np.testing.assert_array_equal(arrays["G", "p"], p)
+    np.testing.assert_array_equal(arrays["G", "n"], n)
+    assert len(indices) == 7
+
+
+def test_only_common_timesteps_and_scenarios_are_scattered() -> None:
+    registry = IndexRegistry()
+    registry.register("G", "p", IndexLayout(0, 3, 2, True, True))
+
+    # Previous block with more timesteps and a single scenario
+    indices, values = scatter_arrays(
+        registry, [("G", "p", np.array([[1.0, 2.0, 3.0, 4.0]]))]
+    )
+
+    assert indices.tolist() == [0, 2, 4]
+    assert values.tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize("solver_id", ["SCIP", "SCIPY_HIGHS"])
+def test_previous_solution_is_given_as_hint(solver_id: str) -> None:
+    previous = _problem("SCIP")
+    assert previous.solve() == previous.solver.OPTIMAL
+
+    problem = _problem(solver_id)
+    problem.set_hint(OutputValues(previous).variable_arrays())
+
+    hint = problem.export_as_proto().solution_hint
+    solution = previous.backend.variable_values()
+    assert sorted(hint.var_index) == list(range(len(solution)))
+    np.testing.assert_array_equal(
+        np.array(hint.var_value)[np.argsort(hint.var_index)], solution
+    )
+
+    assert problem.solve() == previous.solver.OPTIMAL
+    assert problem.objective_value() == pytest.approx(previous.objective_value())
@@ -0,0 +1,139 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import pytest
+
+from andromede.simulation import (
+    LpAlgorithm,
+    SolverConfig,
+    TimeBlock,
+    build_problem,
+    solve_problems,
+)
+from andromede.simulation.backend import ORToolsBackend
+from andromede.simulation.optimization import OptimizationProblem
+from andromede.simulation.scipy_backend import ScipyHighsBackend
+from andromede.simulation.solver_config import split_cores
+from tests.unittests.simulation.utils import (
+    BackendFactory,
+    backend_factories,
+    balance_study,
+)
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
+
+
+def _problem(demand: float, solver_config: SolverConfig) -> OptimizationProblem:
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G": GENERATOR_MODEL},
+        {("D", "demand"): demand, ("G", "p_max"): 100.0, ("G", "cost"): 30.0},
+    )
+    return build_problem(
+        network,
+        database,
+        TimeBlock(1, [0, 1]),
+        1,
+        solver_id="GLOP",
+        solver_config=solver_config,
+    )
+
+
+@pytest.mark.parametrize(
+    "solves, cores, expected",
+    [(1, 8, (1, 8)), (3, 8, (3, 2)), (8, 8, (8, 1)), (20, 8, (8, 1)), (2, 1, (1, 1))],
+)
+def test_cores_are_split_between_solves_and_threads(
+    solves: int, cores: int, expected: tuple
+) -> None:
+    assert split_cores(solves, cores) == expected
+
+
+def test_threads_set_in_the_configuration_are_kept() -> None:
+    jobs, config = SolverConfig(threads=3).for_concurrent_solves(10, cores=8)
+    assert (jobs, config.threads) == (2, 3)
+
+    jobs, config = SolverConfig(time_limit=10).for_concurrent_solves(2, cores=8)
+    assert (jobs, config) == (2, SolverConfig(threads=4, time_limit=10))
+
+
+def test_invalid_configurations() -> None:
+    with pytest.raises(ValueError, match="threads"):
+        SolverConfig(threads=0)
+    with pytest.raises(ValueError, match="Time limit"):
+        SolverConfig(time_limit=-1)
+    with pytest.raises(ValueError, match="solves"):
+        split_cores(0, 4)
+
+
+def test_invalid_solver_parameters_are_rejected() -> None:
+    backend = ORToolsBackend(lp.Solver.CreateSolver("SCIP"))
+    backend.configure(SolverConfig(solver_parameters="limits/gap = 0.01"))
+    with pytest.raises(ValueError, match="Invalid parameters"):
+        backend.configure(SolverConfig(solver_parameters="unknown/parameter = 1"))
+
+    with pytest.raises(ValueError, match="solver-specific"):
+        ScipyHighsBackend().configure(SolverConfig(solver_parameters="presolve=off"))
+    with pytest.raises(ValueError, match="not available"):
+        ScipyHighsBackend().configure(SolverConfig(lp_algorithm=LpAlgorithm.PRIMAL))
+
+
+@pytest.mark.parametrize(
+    "backend_factory", backend_factories("GLOP", with_matrix=False)
+)
+@pytest.mark.parametrize(
+    "config",
+    [
+        SolverConfig(),
+        SolverConfig(threads=2, time_limit=60, presolve=False),
+        SolverConfig(lp_algorithm=LpAlgorithm.DUAL, verbose=False),
+        SolverConfig(lp_algorithm=LpAlgorithm.BARRIER),
+    ],
+)
+def test_configured_backends_solve_lp_problems(
+    backend_factory: BackendFactory, config: SolverConfig
+) -> None:
+    backend = backend_factory()
+    backend.configure(config)
+    assert backend.solver_config == config
+
+    x = backend.add_variable(0, 10, False, "x")
+    y = backend.add_variable(0, 10, False, "y")
+    backend.add_constraint(4, 4, [x, y], [1, 1], "c")
+    backend.add_objective(np.array([x, y]), np.array([1.0, 2.0]), 0)
+
+    assert backend.solve() == lp.Solver.OPTIMAL
+    assert backend.objective_value() == pytest.approx(4)
+
+
+def test_problems_are_solved_concurrently() -> None:
+    problems = [_problem(demand, SolverConfig()) for demand in [50, 100, 150]]
+
+    statuses = solve_problems(
+        problems, solver_config=SolverConfig(time_limit=60), cores=2
+    )
+
+    assert statuses == [lp.Solver.OPTIMAL, lp.Solver.OPTIMAL, lp.Solver.INFEASIBLE]
+    assert [p.objective_value() for p in problems[:2]] == pytest.approx([3000, 6000])
+    assert all(
+        p.backend.solver_config == SolverConfig(threads=1, time_limit=60)
+        for p in problems
+    )
+    assert solve_problems([]) == []
+
+
+def test_build_problem_configures_the_backend() -> None:
+    config = SolverConfig(time_limit=60, presolve=True)
+    problem = _problem(50, config)
+
+    assert problem.backend.solver_config == config
+    assert problem.solve() == lp.Solver.OPTIMAL
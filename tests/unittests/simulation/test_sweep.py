@@ -0,0 +1,162 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import io
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import pytest
+from polars.testing import assert_frame_equal
+
+from andromede.simulation import OutputValues, TimeBlock, build_problem
+from andromede.simulation.sweep import SweepStudy, parameter_grid, run_sweep
+from andromede.study import ConstantData
+from andromede.study.data import AbstractDataStructure
+from andromede.study.parsing import parse_yaml_sweep
+from andromede.study.resolve_components import build_sweep_variants
+from tests.unittests.simulation.utils import THERMAL_CLUSTER_DATA, balance_study
+from tests.unittests.system.libs.standard import (
+    DEMAND_MODEL,
+    GENERATOR_MODEL,
+    THERMAL_CLUSTER_MODEL_HD,
+)
+
+Overrides = Dict[Tuple[str, str], AbstractDataStructure]
+
+
+def _study() -> SweepStudy:
+    network, database = balance_study(
+        {"D": DEMAND_MODEL, "G": GENERATOR_MODEL, "T": THERMAL_CLUSTER_MODEL_HD},
+        {
+            ("D", "demand"): [[150.0, 120.0], [180.0, 90.0], [60.0, 200.0]],
+            ("G", "p_max"): 100,
+            ("G", "cost"): 30,
+            **THERMAL_CLUSTER_DATA,
+            ("T", "p_min"): 40,
+            ("T", "d_min_up"): 1,
+        },
+    )
+    return SweepStudy(network, database, TimeBlock(1, [0, 1, 2]), 2)
+
+
+VARIANTS: List[Overrides] = [
+    {("G", "cost"): ConstantData(10)},
+    {("T", "p_min"): ConstantData(0), ("T", "cost"): ConstantData(40)},
+    {},
+    {("T", "d_min_up"): ConstantData(3), ("G", "p_max"): ConstantData(60)},
+    {("G", "p_max"): ConstantData(0), ("T", "nb_units_max"): ConstantData(1)},
+]
+
+
+def test_parameter_grid() -> None:
+    grid = parameter_grid(
+        {
+            ("G", "cost"): [ConstantData(10), ConstantData(20)],
+            ("T", "p_min"): [ConstantData(0), ConstantData(5), ConstantData(10)],
+        }
+    )
+
+    assert len(grid) == 6
+    assert grid[1] == {("G", "cost"): ConstantData(10), ("T", "p_min"): ConstantData(5)}
+    assert parameter_grid({}) == [{}]
+
+
+def test_variants_are_solved_from_the_base_study() -> None:
+    study = _study()
+    results = run_sweep(study, VARIANTS, outputs=[("G", "generation")], cores=1)
+
+    assert results.columns == [
+        "variant",
+        "status",
+        "objective",
+        "scenario",
+        "timestep",
+        "G.generation",
+    ]
+    assert results.height == len(VARIANTS) * 2 * 3
+    for variant, overrides in enumerate(VARIANTS):
+        database = _study().database
+        for (component_id, parameter_name), data in overrides.items():
+            database.add_data(component_id, parameter_name, data)
+        reference = build_problem(study.network, database, study.block, 2)
+        status = reference.solve()
+
+        rows = results.filter(variant=variant)
+        assert rows["status"][0] == status
+        if status != lp.Solver.OPTIMAL:
+            assert math.isnan(rows["objective"][0])
+            assert rows["G.generation"].is_nan().all()
+            continue
+        assert rows["objective"][0] == pytest.approx(reference.objective_value())
+        np.testing.assert_allclose(
+            rows["G.generation"].to_numpy().reshape(2, 3),
+            OutputValues(reference).component("G").var("generation").array,
+            atol=1e-6,
+        )
+
+    assert results.filter(variant=4)["status"][0] == lp.Solver.INFEASIBLE
+    # The database of the study is left unchanged
+    assert study.database.get_data("G", "cost") == ConstantData(30)
+    assert study.database.get_data("T", "d_min_up") == ConstantData(1)
+
+
+def test_variants_are_distributed_over_processes() -> None:
+    expected = run_sweep(_study(), VARIANTS, cores=1)
+
+    results = run_sweep(_study(), VARIANTS, cores=2)
+
+    assert results.columns == ["variant", "status", "objective"]
+    assert_frame_equal(results, expected, check_exact=False)
+    assert run_sweep(_study(), []).height == 0
+
+
+def test_sweep_file() -> None:
+    input_sweep = parse_yaml_sweep(
+        io.StringIO(
+            """
+sweep:
+  grid:
+    - component: G
+      parameter: cost
+      values: [10, 20]
+    - component: T
+      parameter: p_min
+      values: [0, 40]
+  variants:
+    - - component: G
+        parameter: p_max
+        value: 60
+      - component: T
+        parameter: cost
+        value: 25
+  outputs:
+    - component: G
+      variable: generation
+"""
+        )
+    )
+
+    variants = build_sweep_variants(input_sweep, None)
+
+    assert variants == parameter_grid(
+        {
+            ("G", "cost"): [ConstantData(10), ConstantData(20)],
+            ("T", "p_min"): [ConstantData(0), ConstantData(40)],
+        }
+    ) + [{("G", "p_max"): ConstantData(60), ("T", "cost"): ConstantData(25)}]
+    assert [(o.component, o.variable) for o in input_sweep.outputs] == [
+        ("G", "generation")
+    ]
+
+    with pytest.raises(KeyError):
+        parse_yaml_sweep(io.StringIO("variants: []"))
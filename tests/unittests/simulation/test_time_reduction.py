@@ -0,0 +1,142 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+from typing import List, Tuple
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import pytest
+
+from andromede.simulation import (
+    AggregationRule,
+    OutputValues,
+    TimeBlock,
+    aggregate_timesteps,
+    build_problem,
+    select_representative_periods,
+)
+from andromede.simulation.optimization import OptimizationProblem
+from andromede.study import ConstantData, DataBase, Network
+from tests.unittests.simulation.utils import balance_study
+from tests.unittests.system.libs.standard import DEMAND_MODEL, GENERATOR_MODEL
+
+HOURS = 12
+
+
+def _study(demand: List[List[float]]) -> Tuple[Network, DataBase]:
+    return balance_study(
+        {"D": DEMAND_MODEL, "G": GENERATOR_MODEL, "U": GENERATOR_MODEL},
+        {
+            ("D", "demand"): demand,
+            ("G", "p_max"): 100,
+            ("G", "cost"): 30,
+            # U is used when the demand is above the capacity of G
+            ("U", "p_max"): 1000,
+            ("U", "cost"): 60,
+        },
+    )
+
+
+def _solved_reference(network: Network, database: DataBase) -> OptimizationProblem:
+    reference = build_problem(
+        network, database, TimeBlock(1, list(range(HOURS))), 2, solver_id="GLOP"
+    )
+    assert reference.solve() == lp.Solver.OPTIMAL
+    return reference
+
+
+def test_aggregated_timesteps() -> None:
+    rng = np.random.default_rng(0)
+    # Below the capacity of G: the cost is linear in the demand
+    demand = rng.integers(0, 100, (HOURS, 2)).astype(float)
+    network, database = _study(demand.tolist())
+
+    horizon = aggregate_timesteps(network, database, range(HOURS), 2, 3)
+    problems = horizon.build_problems(network, 2, solver_id="GLOP")
+
+    assert [(b.timesteps, b.weight) for b in horizon.blocks] == [([0, 1, 2, 3], 3.0)]
+    assert all(problem.solve() == lp.Solver.OPTIMAL for problem in problems)
+    reference = _solved_reference(network, database)
+    assert horizon.objective_value(problems) == pytest.approx(
+        reference.objective_value()
+    )
+    # Each timestep takes the value of its aggregated timestep
+    generation = horizon.output_values(problems).component("G").var("generation")
+    means = demand.T.reshape(2, 4, 3).mean(axis=2)
+    np.testing.assert_allclose(generation.array, np.repeat(means, 3, axis=1))
+
+
+def test_aggregation_rules() -> None:
+    demand = np.arange(2 * HOURS, dtype=float).reshape(HOURS, 2)
+    network, database = _study(demand.tolist())
+
+    for rule, expected in [
+        (AggregationRule.MEAN, [1.0, 5.0]),
+        (AggregationRule.SUM, [2.0, 10.0]),
+        (AggregationRule.MIN, [0.0, 4.0]),
+        (AggregationRule.MAX, [2.0, 6.0]),
+    ]:
+        horizon = aggregate_timesteps(
+            network, database, range(HOURS), 2, 2, {"demand": rule, "cost": rule}
+        )
+        data = horizon.database.get_data("D", "demand")
+        assert [data.get_value(t, 0) for t in range(2)] == expected
+        # Parameters which do not depend on time are left unchanged
+        assert horizon.database.get_data("G", "cost") == ConstantData(30)
+
+    with pytest.raises(ValueError, match="cannot be divided"):
+        aggregate_timesteps(network, database, range(HOURS), 2, 5)
+
+
+def test_representative_periods() -> None:
+    # Periods of 4 hours, the first and the last ones are the same
+    period = [[150.0, 80.0], [90.0, 120.0], [60.0, 200.0], [110.0, 100.0]]
+    other = [[40.0, 30.0], [130.0, 50.0], [70.0, 90.0], [100.0, 300.0]]
+    network, database = _study(period + other + period)
+
+    horizon = select_representative_periods(
+        network, database, range(HOURS), 2, period_length=4, count=2
+    )
+    problems = horizon.build_problems(network, 2, solver_id="GLOP")
+
+    assert [(b.timesteps, b.weight) for b in horizon.blocks] == [
+        ([0, 1, 2, 3], 2.0),
+        ([4, 5, 6, 7], 1.0),
+    ]
+    np.testing.assert_array_equal(
+        horizon.timesteps, [0, 1, 2, 3, 4, 5, 6, 7] + [0, 1, 2, 3]
+    )
+    assert all(problem.solve() == lp.Solver.OPTIMAL for problem in problems)
+    # Represented periods are exactly their representative
+    reference = _solved_reference(network, database)
+    assert horizon.objective_value(problems) == pytest.approx(
+        reference.objective_value()
+    )
+    assert horizon.output_values(problems).is_close(
+        OutputValues(reference), abs_tol=1e-6
+    )
+
+    # Only 4 of the 6 periods of 2 hours are distinct
+    horizon = select_representative_periods(
+        network, database, range(HOURS), 2, period_length=2, count=5
+    )
+    assert sorted(b.weight for b in horizon.blocks) == [1.0, 1.0, 2.0, 2.0]
+    # Timesteps of representative periods may also be aggregated
+    horizon = select_representative_periods(
+        network, database, range(HOURS), 2, period_length=4, count=2, duration=2
+    )
+    assert [(b.timesteps, b.weight) for b in horizon.blocks] == [
+        ([0, 1], 4.0),
+        ([2, 3], 2.0),
+    ]
+    np.testing.assert_array_equal(
+        horizon.timesteps, [0, 0, 1, 1, 2, 2, 3, 3, 0, 0, 1, 1]
+    )
@@ -0,0 +1,135 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+from typing import Any, Callable, Dict, List, Mapping, Tuple, Union
+
+import ortools.linear_solver.pywraplp as lp
+import pandas as pd
+import pytest
+from ortools.linear_solver import linear_solver_pb2
+
+from andromede.model import Model
+from andromede.simulation.backend import ORToolsBackend, SolverBackend
+from andromede.simulation.matrix_backend import MatrixBackend
+from andromede.simulation.model_builder_backend import ModelBuilderBackend
+from andromede.simulation.scipy_backend import ScipyHighsBackend
+from andromede.study import (
+    ConstantData,
+    DataBase,
+    Network,
+    Node,
+    PortRef,
+    TimeScenarioSeriesData,
+    create_component,
+)
+from andromede.study.data import AbstractDataStructure
+from tests.unittests.system.libs.standard import NODE_BALANCE_MODEL
+
+BackendFactory = Callable[[], SolverBackend]
+ParameterData = Union[float, List[List[float]], AbstractDataStructure]
+
+# Data of a thermal cluster T of THERMAL_CLUSTER_MODEL_HD
+THERMAL_CLUSTER_DATA: Dict[Tuple[str, str], ParameterData] = {
+    ("T", "p_max"): 100,
+    ("T", "p_min"): 10,
+    ("T", "cost"): 20,
+    ("T", "d_min_up"): 2,
+    ("T", "d_min_down"): 1,
+    ("T", "nb_units_max"): 2,
+    ("T", "nb_failures"): 0,
+}
+
+
+def backend_factories(solver_name: str, with_matrix: bool = True) -> List[Any]:
+    """
+    Test parameters creating each backend: OR-Tools backends with the named
+    solver ("GLOP" or "SCIP"), HiGHS through scipy and, unless with_matrix
+    is False, the matrix backend which cannot solve problems.
+    """
+    factories = [
+        pytest.param(
+            lambda: ORToolsBackend(lp.Solver.CreateSolver(solver_name)), id="pywraplp"
+        ),
+        pytest.param(
+            lambda: ModelBuilderBackend(solver_name.lower()), id="model_builder"
+        ),
+        pytest.param(ScipyHighsBackend, id="scipy_highs"),
+    ]
+    if with_matrix:
+        factories.append(pytest.param(MatrixBackend, id="matrix"))
+    return factories
+
+
+def create_database(data: Mapping[Tuple[str, str], ParameterData]) -> DataBase:
+    """
+    Database of the data of each (component ID, parameter name): numbers are
+    constant data, lists are series indexed by timestep then scenario.
+    """
+    database = DataBase()
+    for (component_id, parameter_name), value in data.items():
+        if isinstance(value, list):
+            value = TimeScenarioSeriesData(pd.DataFrame(value))
+        elif not isinstance(value, AbstractDataStructure):
+            value = ConstantData(value)
+        database.add_data(component_id, parameter_name, value)
+    return database
+
+
+def balance_network(models: Mapping[str, Model]) -> Network:
+    """
+    Network of components with the given models by ID, all connected
+    to the balance node N.
+    """
+    node = Node(model=NODE_BALANCE_MODEL, id="N")
+    network = Network("test")
+    network.add_node(node)
+    for component_id, model in models.items():
+        component = create_component(model=model, id=component_id)
+        network.add_component(component)
+        network.connect(
+            PortRef(component, "balance_port"), PortRef(node, "balance_port")
+        )
+    return network
+
+
+def balance_study(
+    models: Mapping[str, Model], data: Mapping[Tuple[str, str], ParameterData]
+) -> Tuple[Network, DataBase]:
+    return balance_network(models), create_database(data)
+
+
+def proto_content(model: linear_solver_pb2.MPModelProto) -> Tuple[Any, ...]:
+    """
+    Content of the model, regardless of which fields are explicitly set.
+    """
+    return (
+        model.maximize,
+        model.objective_offset,
+        [
+            (
+                v.name,
+                v.lower_bound,
+                v.upper_bound,
+                v.is_integer,
+                v.objective_coefficient,
+            )
+            for v in model.variable
+        ],
+        [
+            (
+                c.name,
+                c.lower_bound,
+                c.upper_bound,
+                sorted(zip(c.var_index, c.coefficient)),
+            )
+            for c in model.constraint
+        ],
+    )
@@ -17,7 +17,7 @@ import pytest
 from andromede.model.library import Library
 from andromede.model.parsing import parse_yaml_library
 from andromede.model.resolve_library import resolve_library
-from andromede.study.network import Network, Node
+from andromede.study.network import Network, Node, PortRef, create_component
 
 
 @pytest.fixture(scope="session")
@@ -59,3 +59,27 @@ def test_network(lib_dict: dict[str, Library]) -> None:
     assert network.get_component("N1") == Node(model=node_model, id="N1")
     with pytest.raises(KeyError):
         network.get_component("unknown")
+
+
+def test_port_connections_index(lib_dict: dict[str, Library]) -> None:
+    models = lib_dict["basic"].models
+    network = Network("test")
+    node = Node(model=models["node"], id="N")
+    network.add_node(node)
+    generators = [create_component(models["production"], f"G{i}") for i in range(3)]
+    for generator in generators:
+        network.add_component(generator)
+        network.connect(
+            PortRef(generator, "balance_port"), PortRef(node, "balance_port")
+        )
+
+    node_connections = network.get_port_connections("N")
+    assert list(node_connections.keys()) == ["balance_port"]
+    assert node_connections["balance_port"] == list(network.connections)
+    assert network.get_port_connections("G1") == {
+        "balance_port": [network.get_connection(1)]
+    }
+    assert network.get_port_connections("unknown") == {}
+
+    replica = network.replicate()
+    assert replica.get_port_connections("N") == node_connections
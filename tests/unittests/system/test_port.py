@@ -14,9 +14,9 @@ import pytest
 
 from andromede.expression import literal
 from andromede.expression.expression import port_field
-from andromede.model import Constraint, ModelPort, PortType, model
+from andromede.model import Constraint, ModelPort, PortField, PortType, model
 from andromede.study import Node, PortRef, PortsConnection, create_component
-from tests.unittests.system.libs.standard import DEMAND_MODEL
+from tests.unittests.system.libs.standard import DEMAND_MODEL, NODE_BALANCE_MODEL
 
 
 def test_port_type_compatibility_ko() -> None:
@@ -43,3 +43,23 @@ def test_port_type_compatibility_ko() -> None:
 
     with pytest.raises(ValueError):
         PortsConnection(port_1, port_2)
+
+
+def test_master_ports_of_connections_between_same_models() -> None:
+    node = Node(id="N", model=NODE_BALANCE_MODEL)
+    demands = [create_component(model=DEMAND_MODEL, id=f"D{i}") for i in range(3)]
+
+    for demand in demands:
+        connection = PortsConnection(
+            PortRef(demand, "balance_port"), PortRef(node, "balance_port")
+        )
+        assert connection.master_port == {
+            PortField("flow"): PortRef(demand, "balance_port")
+        }
+
+        reversed_connection = PortsConnection(
+            PortRef(node, "balance_port"), PortRef(demand, "balance_port")
+        )
+        assert reversed_connection.master_port == {
+            PortField("flow"): PortRef(demand, "balance_port")
+        }
@@ -1,6 +1,11 @@
+import io
+import re
 from pathlib import Path
+from typing import List
 
 import pytest
+import yaml
+from pydantic import ValidationError
 
 from andromede.model.parsing import InputLibrary, parse_yaml_library
 from andromede.model.resolve_library import resolve_library
@@ -57,3 +62,56 @@ def test_consistency_check_ko(
         match=r"Error: Component G has invalid model ID: generator",
     ):
         consistency_check(result_comp.components, result_lib["basic"].models)
+
+
+def _system_files() -> List[Path]:
+    tests_dir = Path(__file__).parents[2]
+    return sorted(
+        path
+        for path in tests_dir.rglob("*.yml")
+        if re.search("^system:", path.read_text(), re.MULTILINE)
+    )
+
+
+@pytest.mark.parametrize("system_file", _system_files(), ids=lambda p: p.name)
+def test_streaming_parsing_is_equal_to_full_parsing(system_file: Path) -> None:
+    with system_file.open() as file:
+        expected = InputSystem.model_validate(yaml.safe_load(file)["system"])
+
+    with system_file.open() as file:
+        assert parse_yaml_components(file) == expected
+
+    with system_file.open() as file:
+        assert parse_yaml_components(file, trusted=True) == expected
+
+
+def test_parsing_components_with_aliases() -> None:
+    study = """
+system:
+  components:
+    - id: G1
+      model: generator
+      parameters: &params
+        - id: cost
+          value: 10
+    - id: G2
+      model: generator
+      parameters: *params
+"""
+    for trusted in [False, True]:
+        input_system = parse_yaml_components(io.StringIO(study), trusted)
+        assert [c.id for c in input_system.components] == ["G1", "G2"]
+        assert input_system.components[1].parameters == (
+            input_system.components[0].parameters
+        )
+        assert input_system.components[1].parameters[0].value == 10.0  # type: ignore
+
+
+def test_parsing_invalid_components_fails() -> None:
+    with pytest.raises(KeyError, match="system"):
+        parse_yaml_components(io.StringIO("components: []"))
+
+    with pytest.raises(ValidationError, match="unknown"):
+        parse_yaml_components(
+            io.StringIO("system:\n  components:\n    - id: G\n      unknown: 1\n")
+        )